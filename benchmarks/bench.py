@@ -0,0 +1,214 @@
+"""
+Benchmarks for the simulation hot paths.
+
+Records wall time, right-hand-side evaluations and peak traced memory per case
+and compares them with a JSON baseline:
+
+    python benchmarks/bench.py                 # compare with benchmarks/baseline.json
+    python benchmarks/bench.py --update        # record a new baseline
+    python benchmarks/bench.py -k forward      # only cases whose name contains "forward"
+
+Exits with status 1 when a case regresses beyond its tolerance.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+
+from src.models.biomolecular_layer import BiomolecularLayer
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Allowed relative increase per metric; RHS counts are deterministic, timings are not
+TOLERANCES = {"wall_time": 0.5, "rhs_evals": 0.05, "peak_memory": 0.25}
+
+# Absolute increases below these are treated as noise (seconds, bytes)
+NOISE_FLOORS = {"wall_time": 0.005, "peak_memory": 64 * 1024}
+
+@contextlib.contextmanager
+def count_rhs():
+    """
+    Counts right-hand-side calls of the perceptron and layer models while active.
+    A vectorized batch call counts once, however many samples it evaluates.
+    """
+    counter = {"rhs_evals": 0}
+    patched = [
+        (BiomolecularPerceptron, "equations", BiomolecularPerceptron.__dict__["equations"]),
+        (BiomolecularLayer, "equations", BiomolecularLayer.__dict__["equations"]),
+        (BiomolecularLayer, "batch_equations", BiomolecularLayer.__dict__["batch_equations"]),
+    ]
+
+    def counting(function):
+        def wrapper(*args, **kwargs):
+            counter["rhs_evals"] += 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    for cls, name, original in patched:
+        if isinstance(original, staticmethod):
+            setattr(cls, name, staticmethod(counting(original.__func__)))
+        else:
+            setattr(cls, name, counting(original))
+    try:
+        yield counter
+    finally:
+        for cls, name, original in patched:
+            setattr(cls, name, original)
+
+def architecture_network(layer_sizes):
+    # Same networks as test_different_architectures
+    return BiomolecularNeuralNetwork(layers=[
+        [BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0) for _ in range(size)]
+        for size in layer_sizes
+    ])
+
+def biosensor_network():
+    # Same network as tests/test_biosensor.py
+    return BiomolecularNeuralNetwork(layers=[
+        [BiomolecularPerceptron(u=15, v=3, gamma=1.0, phi=0.3, threshold=1.8) for _ in range(3)],
+        [BiomolecularPerceptron(u=12, v=3, gamma=1.0, phi=0.3, threshold=0.5)],
+    ])
+
+def cases():
+    """
+    Benchmark name mapped to a zero-argument callable.
+    """
+    perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0)
+    biosensor = biosensor_network()
+    panel = np.random.default_rng(0).uniform(0, 6, size=(10000, 2))
+
+    benchmarks = {
+        "perceptron_solve_nonstiff": lambda: perceptron.solve(z1_0=1.0),
+        "perceptron_solve_stiff_rk45": lambda: perceptron.solve(z1_0=1e3),
+        "perceptron_solve_stiff_auto": lambda: perceptron.solve(z1_0=1e6, method="auto"),
+        "perceptron_solve_steady": lambda: perceptron.solve(z1_0=1.0, t_span=(0, 50), mode="steady"),
+    }
+    for layer_sizes in ([1, 1], [2, 1], [3, 2, 1], [4, 3, 2, 1]):
+        network = architecture_network(layer_sizes)
+        name = "forward_" + "x".join(map(str, layer_sizes))
+        benchmarks[name] = lambda network=network: network.forward([1.0, 1.0])
+    benchmarks["forward_biosensor"] = lambda: biosensor.forward([5.0, 0.0])
+    benchmarks["forward_biosensor_fused"] = lambda: biosensor.forward([5.0, 0.0], mode="fused")
+    benchmarks["classify_biosensor_batch_10k"] = lambda: biosensor.classify_biosensor_batch(panel)
+    return benchmarks
+
+def measure(function, repeat=3):
+    """
+    Best wall time over repeat runs, RHS evaluations of one run, and peak
+    memory traced by tracemalloc in a separate run.
+    """
+    with count_rhs() as counter:
+        function()
+
+    wall_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        wall_time = min(wall_time, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"wall_time": wall_time, "rhs_evals": counter["rhs_evals"], "peak_memory": peak_memory}
+
+def compare(results, baseline, tolerances=None, noise_floors=None):
+    """
+    Regressions of results relative to baseline.
+    :param results: Case name mapped to a dict of metrics
+    :param baseline: Same layout, e.g. the "cases" entry of a baseline file
+    :param tolerances: Metric name mapped to the allowed relative increase
+    :param noise_floors: Metric name mapped to the absolute increase below which it never regresses
+    :return: List of human-readable regression messages, empty if none
+    """
+    tolerances = {**TOLERANCES, **(tolerances or {})}
+    noise_floors = {**NOISE_FLOORS, **(noise_floors or {})}
+    regressions = []
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+        for metric, tolerance in tolerances.items():
+            if metric not in metrics or metric not in baseline[name]:
+                continue
+            current, reference = metrics[metric], baseline[name][metric]
+            if current <= reference * (1 + tolerance):
+                continue
+            if current - reference < noise_floors.get(metric, 0):
+                continue
+            change = (current / reference - 1) * 100 if reference else float("inf")
+            regressions.append(f"{name}: {metric} {reference:.4g} -> {current:.4g} "
+                               f"(+{change:.0f}%, tolerance {tolerance:.0%})")
+    return regressions
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulation hot paths")
+    parser.add_argument("-k", dest="keyword", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--time-tolerance", type=float, default=TOLERANCES["wall_time"],
+                        help="Allowed relative wall-time increase")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, function in cases().items():
+        if args.keyword not in name:
+            continue
+        results[name] = measure(function, repeat=args.repeat)
+        metrics = results[name]
+        print(f"{name:32s} {metrics['wall_time'] * 1e3:10.2f} ms {metrics['rhs_evals']:8d} rhs "
+              f"{metrics['peak_memory'] / 1024:10.1f} KiB")
+
+    report = {"environment": environment(), "cases": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update:
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)["cases"]
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": environment(), "cases": {**previous, **results}}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline["cases"], tolerances={"wall_time": args.time_tolerance})
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
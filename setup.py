@@ -10,4 +10,7 @@ setup(
         "scipy>=1.11.0",
         "matplotlib>=3.8.0",
     ],
+    entry_points={
+        "console_scripts": ["dbnn=models.cli:main"],
+    },
 )
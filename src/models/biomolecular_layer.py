@@ -0,0 +1,209 @@
+import numpy as np
+
+from .integrators import integrate
+from .steady_state import settled, steady_state, warn_unsettled
+
+# Above this many fast time constants per t_span explicit schemes are stability-bound
+STIFF_LIMIT = 500
+
+# Solvers that make use of a user-supplied Jacobian
+IMPLICIT_METHODS = ("LSODA", "BDF", "Radau")
+
+# Fast time constants per t_span above which method="auto" switches to LSODA
+AUTO_STIFF_LIMIT = 100
+
+def stiffness(u, v, gamma, phi, z1_0=0, z2_0=0, t_span=(0, 10)):
+    """
+    Estimates how stiff the titration system is over t_span.
+
+    The Jacobian has eigenvalues -phi and -(phi + gamma * (z1 + z2)), so the
+    fast rate is evaluated at the initial condition and at the equilibrium.
+    :return: Fast rate times the length of t_span, broadcast over the inputs
+    """
+    u, v, gamma, phi = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (u, v, gamma, phi)))
+    total = np.abs(np.asarray(z1_0, dtype=float)) + np.abs(np.asarray(z2_0, dtype=float))
+    if np.all(phi > 0):
+        total = np.maximum(total, np.sum(steady_state(u, v, gamma, phi), axis=0))
+    return (phi + np.abs(gamma) * total) * (t_span[1] - t_span[0])
+
+class BiomolecularLayer:
+    def __init__(self, u, v, gamma, phi, threshold=0):
+        """
+        A layer of biomolecular perceptrons stored as parameter arrays.
+        :param u: Production rates of species Z1, one per perceptron
+        :param v: Production rates of species Z2, one per perceptron
+        :param gamma: Titration rates (sequestration strength)
+        :param phi: Decay rates
+        :param threshold: Activation thresholds
+        """
+        u, v, gamma, phi, threshold = (np.array(p) for p in np.broadcast_arrays(
+            *(np.asarray(p, dtype=float) for p in (u, v, gamma, phi, threshold))
+        ))
+        self.u = u
+        self.v = v
+        self.gamma = gamma
+        self.phi = phi
+        self.threshold = threshold
+
+    @classmethod
+    def from_perceptrons(cls, perceptrons):
+        """
+        Packs the parameters of a list of BiomolecularPerceptron objects into a layer.
+        :param perceptrons: List of BiomolecularPerceptron objects
+        """
+        return cls(
+            u=[p.u for p in perceptrons],
+            v=[p.v for p in perceptrons],
+            gamma=[p.gamma for p in perceptrons],
+            phi=[p.phi for p in perceptrons],
+            threshold=[p.threshold for p in perceptrons],
+        )
+
+    def __len__(self):
+        return self.u.shape[-1]
+
+    def equations(self, t, z):
+        """
+        Right-hand side of the stacked system.
+        :param z: Flat state [z1 of every perceptron, z2 of every perceptron]
+        """
+        z1, z2 = z.reshape(2, -1)
+        titration = self.gamma * z1 * z2
+        dz1_dt = self.u - titration - self.phi * z1
+        dz2_dt = self.v - titration - self.phi * z2
+        return np.concatenate([dz1_dt, dz2_dt])
+
+    def jacobian(self, t, z):
+        """
+        Sparse Jacobian of equations: every perceptron contributes one 2x2
+        block, laid out as four diagonal blocks of the flat state.
+        """
+        from scipy import sparse
+
+        z1, z2 = z.reshape(2, -1)
+        return sparse.bmat([
+            [sparse.diags(-self.gamma * z2 - self.phi), sparse.diags(-self.gamma * z1)],
+            [sparse.diags(-self.gamma * z2), sparse.diags(-self.gamma * z1 - self.phi)],
+        ], format="csc")
+
+    def select_method(self, z1_0=0, z2_0=0, t_span=(0, 10)):
+        """
+        Picks a solver for the stacked system from its stiffest perceptron.
+        :return: "LSODA" if any perceptron is stiff over t_span, "RK45" otherwise
+        """
+        ratio = stiffness(self.u, self.v, self.gamma, self.phi, z1_0, z2_0, t_span)
+        return "LSODA" if np.max(ratio) > AUTO_STIFF_LIMIT else "RK45"
+
+    def steady_state(self):
+        """
+        Analytic equilibrium of every perceptron in the layer.
+        :return: Arrays (z1, z2), one value per perceptron
+        """
+        return steady_state(self.u, self.v, self.gamma, self.phi)
+
+    def settled(self, z1_0=0, z2_0=0, t_span=(0, 10)):
+        """
+        Boolean mask of perceptrons whose transient has settled by the end of t_span.
+        """
+        return settled(self.u, self.v, self.gamma, self.phi, z1_0, z2_0, t_span)
+
+    def solve(self, z1_0=0, z2_0=0, t_span=(0, 10), t_eval=None, mode="ode", method="RK45"):
+        """
+        Solves the ODEs of every perceptron in the layer with a single solver call.
+        :param z1_0: Initial condition for Z1 (scalar or one value per perceptron)
+        :param z2_0: Initial condition for Z2 (scalar or one value per perceptron)
+        :param t_span: Time span (start, end)
+        :param t_eval: Optional list of times to evaluate the solution
+        :param mode: "ode" integrates the system, "steady" returns the analytic
+            equilibrium as a single point at t_span[1]
+        :param method: Any solve_ivp method, or "auto" to choose one from the
+            stiffest perceptron. Implicit methods get the analytic Jacobian.
+        :return: Times and solution of shape (2, n_perceptrons, len(t))
+        """
+        if mode == "steady":
+            z = np.array(self.steady_state())[:, :, np.newaxis]
+            warn_unsettled(self.settled(z1_0, z2_0, t_span), t_span)
+            return np.array([t_span[1]], dtype=float), z
+        if mode != "ode":
+            raise ValueError(f"Unknown solve mode: {mode!r}")
+
+        if t_eval is None:
+            t_eval = np.linspace(t_span[0], t_span[1], 100)
+
+        n = len(self)
+        z0 = np.concatenate([
+            np.broadcast_to(np.asarray(z1_0, dtype=float), (n,)),
+            np.broadcast_to(np.asarray(z2_0, dtype=float), (n,)),
+        ])
+        if method == "auto":
+            method = self.select_method(z1_0, z2_0, t_span)
+        options = {}
+        if method == "LSODA":
+            # LSODA only accepts dense Jacobians
+            options["jac"] = lambda t, z: self.jacobian(t, z).toarray()
+        elif method in IMPLICIT_METHODS:
+            options["jac"] = self.jacobian
+        from scipy.integrate import solve_ivp
+
+        sol = solve_ivp(self.equations, t_span, z0, t_eval=t_eval, method=method, **options)
+        return sol.t, sol.y.reshape(2, n, -1)
+
+    @staticmethod
+    def batch_equations(t, z, u, v, gamma, phi):
+        """
+        Right-hand side for a batch of layer states.
+        :param z: States of shape (N, n_perceptrons, 2)
+        :param u, v, gamma, phi: Parameters of shape (N, n_perceptrons)
+        """
+        z1, z2 = z[..., 0], z[..., 1]
+        titration = gamma * z1 * z2
+        return np.stack([u - titration - phi * z1, v - titration - phi * z2], axis=-1)
+
+    @staticmethod
+    def batch_jacobian(t, z, u, v, gamma, phi):
+        """
+        Per-perceptron 2x2 Jacobian blocks for a batch of layer states.
+        :return: Array of shape (N, n_perceptrons, 2, 2)
+        """
+        z1, z2 = z[..., 0], z[..., 1]
+        return np.stack([
+            np.stack([-gamma * z2 - phi, -gamma * z1], axis=-1),
+            np.stack([-gamma * z2, -gamma * z1 - phi], axis=-1),
+        ], axis=-2)
+
+    def solve_batch(self, z1_0, z2_0=0, t_span=(0, 10), rtol=1e-3, atol=1e-6):
+        """
+        Integrates the layer for many samples at once. Each sample keeps its own
+        error control; non-stiff samples use a vectorized Dormand-Prince scheme
+        and stiff ones a vectorized Rosenbrock scheme.
+        :param z1_0: Initial Z1 of shape (N,) or (N, n_perceptrons)
+        :param z2_0: Initial Z2, broadcastable to (N, n_perceptrons)
+        :param t_span: Time span (start, end)
+        :return: Final states of shape (N, n_perceptrons, 2) and solver statistics
+            keyed by method
+        """
+        z1_0 = np.asarray(z1_0, dtype=float)
+        if z1_0.ndim == 1:
+            z1_0 = z1_0[:, np.newaxis]
+        shape = (z1_0.shape[0], len(self))
+        z0 = np.stack([np.broadcast_to(z1_0, shape), np.broadcast_to(z2_0, shape)], axis=-1)
+        params = tuple(np.broadcast_to(p, shape) for p in (self.u, self.v, self.gamma, self.phi))
+
+        stiff = np.any(stiffness(*params, z0[..., 0], z0[..., 1], t_span) > STIFF_LIMIT, axis=1)
+        z = np.empty_like(z0)
+        stats = {}
+        for method, mask in (("dopri5", ~stiff), ("rosenbrock23", stiff)):
+            if mask.any():
+                z[mask], stats[method] = integrate(
+                    self.batch_equations, z0[mask], t_span, args=tuple(p[mask] for p in params),
+                    method=method, jac=self.batch_jacobian, rtol=rtol, atol=atol, nonnegative=True,
+                )
+        return z, stats
+
+    def activation(self, z1_final):
+        """
+        Applies the threshold activation to every perceptron in the layer.
+        :param z1_final: Final concentrations of Z1, one per perceptron
+        :return: Array of 0/1 outputs
+        """
+        return (np.asarray(z1_final) >= self.threshold).astype(int)
@@ -1,7 +1,20 @@
+from collections import namedtuple
+
 import numpy as np
-from scipy.integrate import solve_ivp
+
+# scipy is imported where it is used, so batch classification and the CLI start without it
+from .biomolecular_layer import AUTO_STIFF_LIMIT, IMPLICIT_METHODS, BiomolecularLayer, stiffness
+from .recording import Recording
+from .steady_state import settled, steady_state, warn_unsettled, z1_bounds
+from .tracing import NULL_TRACER, rejected_steps
+
+# Result of BiomolecularPerceptron.decide
+Decision = namedtuple("Decision", ["decision", "t_stop", "nfev", "reason"])
 
 class BiomolecularPerceptron:
+    # No per-instance __dict__, so large populations of perceptrons stay small
+    __slots__ = ("u", "v", "gamma", "phi", "threshold", "solver_stats")
+
     def __init__(self, u, v, gamma, phi, threshold=0):
         """
         Initializes the biomolecular perceptron parameters.
@@ -16,26 +29,163 @@ class BiomolecularPerceptron:
         self.gamma = gamma
         self.phi = phi
         self.threshold = threshold
+        self.solver_stats = None
     
     def equations(self, t, z):
         z1, z2 = z
         dz1_dt = self.u - self.gamma * z1 * z2 - self.phi * z1
         dz2_dt = self.v - self.gamma * z1 * z2 - self.phi * z2
         return [dz1_dt, dz2_dt]
+
+    def jacobian(self, t, z):
+        """
+        Closed-form Jacobian of equations with respect to (z1, z2).
+        """
+        z1, z2 = z
+        return np.array([
+            [-self.gamma * z2 - self.phi, -self.gamma * z1],
+            [-self.gamma * z2, -self.gamma * z1 - self.phi],
+        ])
+
+    def select_method(self, z1_0=0, z2_0=0, t_span=(0, 10)):
+        """
+        Picks a solver from the stiffness of the system over t_span.
+        :return: "LSODA" if strong sequestration or large concentrations make
+            the system stiff, "RK45" otherwise
+        """
+        ratio = stiffness(self.u, self.v, self.gamma, self.phi, z1_0, z2_0, t_span)
+        return "LSODA" if ratio > AUTO_STIFF_LIMIT else "RK45"
     
-    def solve(self, z1_0=0, z2_0=0, t_span=(0, 10), t_eval=None):
+    def solve(self, z1_0=0, z2_0=0, t_span=(0, 10), t_eval=None, mode="ode", method="RK45",
+              rtol=1e-3, atol=1e-6, cache=None, tracer=None):
         """
         Solves the system of ODEs over the given time span.
         :param z1_0: Initial condition for Z1
         :param z2_0: Initial condition for Z2
         :param t_span: Time span (start, end)
         :param t_eval: Optional list of times to evaluate the solution
+        :param mode: "ode" integrates the system, "steady" returns the analytic
+            equilibrium as a single point at t_span[1] and warns with a
+            TransientWarning if t_span is too short for it to be reached
+        :param method: Any solve_ivp method, or "auto" to choose one from the
+            stiffness of the system. Implicit methods get the analytic Jacobian.
+            The method used and its step counts are stored in solver_stats.
+        :param rtol: Relative tolerance of the solver
+        :param atol: Absolute tolerance of the solver
+        :param cache: Optional SolutionCache; identical solves are served from it
+        :param tracer: Optional Tracer recording a "solve" span with the solver statistics
         """
+        if tracer is None:
+            return self._solve(z1_0, z2_0, t_span, t_eval, mode, method, rtol, atol, cache)
+        with tracer.span("solve", mode=mode) as span:
+            result = self._solve(z1_0, z2_0, t_span, t_eval, mode, method, rtol, atol, cache)
+            if mode == "ode":
+                span.update(self.solver_stats)
+        return result
+
+    def _solve(self, z1_0, z2_0, t_span, t_eval, mode, method, rtol, atol, cache):
+        if mode == "steady":
+            z = np.array(steady_state(self.u, self.v, self.gamma, self.phi)).reshape(2, 1)
+            warn_unsettled(settled(self.u, self.v, self.gamma, self.phi, z1_0, z2_0, t_span), t_span)
+            return np.array([t_span[1]], dtype=float), z
+        if mode != "ode":
+            raise ValueError(f"Unknown solve mode: {mode!r}")
+
+        if method == "auto":
+            method = self.select_method(z1_0, z2_0, t_span)
+
+        if cache is not None:
+            key = cache.key(self.u, self.v, self.gamma, self.phi, z1_0, z2_0, t_span, t_eval, method, rtol, atol)
+            hit = cache.get(key)
+            if hit is not None:
+                t, y, self.solver_stats = hit
+                return t, y
+
         if t_eval is None:
             t_eval = np.linspace(t_span[0], t_span[1], 100)
+        options = {"jac": self.jacobian} if method in IMPLICIT_METHODS else {}
 
-        sol = solve_ivp(self.equations, t_span, [z1_0, z2_0], t_eval=t_eval)
+        from scipy.integrate import solve_ivp
+
+        sol = solve_ivp(self.equations, t_span, [z1_0, z2_0], t_eval=t_eval, method=method,
+                        rtol=rtol, atol=atol, dense_output=True, **options)
+        self._record_stats(sol, method, len(sol.sol.ts) - 1)
+        if cache is not None:
+            cache.put(key, sol.t, sol.y, self.solver_stats)
         return sol.t, sol.y
+
+    def _record_stats(self, sol, method, n_steps):
+        self.solver_stats = {
+            "method": method,
+            "n_steps": n_steps,
+            "nfev": sol.nfev,
+            "njev": sol.njev,
+            "nlu": sol.nlu,
+            "status": sol.status,
+        }
+        n_rejected = rejected_steps(method, sol.nfev, n_steps)
+        if n_rejected is not None:
+            self.solver_stats["n_rejected"] = n_rejected
+
+    def decision_margin(self, t, z):
+        """
+        Positive once Z1 provably stays on one side of the threshold for all
+        future times, negative while the activation is still undecided.
+        """
+        z1, z2 = z
+        lower, upper = z1_bounds(self.u, self.v, self.gamma, self.phi, z1, z2)
+        return float(min(max(lower - self.threshold, self.threshold - upper), z1))
+
+    def decide(self, z1_0=0, z2_0=0, t_span=(0, 10), settle_tol=1e-4, method="RK45"):
+        """
+        Integrates only until the activation is decided, using terminal events.
+
+        Integration stops as soon as Z1 provably stays on one side of the
+        threshold, or once the derivative norm falls below settle_tol.
+        :param z1_0: Initial condition for Z1
+        :param z2_0: Initial condition for Z2
+        :param t_span: Time span (start, end); the decision refers to t_span[1]
+        :param settle_tol: Derivative norm below which the state counts as settled
+        :param method: Any solve_ivp method, or "auto"
+        :return: Decision(decision, t_stop, nfev, reason), where reason is
+            "decided", "settled" or "t_end"
+        """
+        bounded = self.u >= 0 and self.gamma >= 0 and self.phi > 0
+        z0 = np.array([z1_0, z2_0], dtype=float)
+        if bounded and self.decision_margin(t_span[0], z0) > 0:
+            return Decision(int(z0[0] >= self.threshold), t_span[0], 0, "decided")
+        if np.linalg.norm(self.equations(t_span[0], z0)) < settle_tol:
+            return Decision(self.activation(z0[0]), t_span[0], 0, "settled")
+
+        def decided(t, z):
+            return self.decision_margin(t, z)
+        decided.terminal = True
+        decided.direction = 1
+
+        def settling(t, z):
+            return np.linalg.norm(self.equations(t, z)) - settle_tol
+        settling.terminal = True
+        settling.direction = -1
+
+        if method == "auto":
+            method = self.select_method(z1_0, z2_0, t_span)
+        options = {"jac": self.jacobian} if method in IMPLICIT_METHODS else {}
+        events = [decided, settling] if bounded else [settling]
+
+        from scipy.integrate import solve_ivp
+
+        sol = solve_ivp(self.equations, t_span, z0, method=method, events=events, **options)
+        self._record_stats(sol, method, len(sol.t) - 1)
+
+        z1_final = sol.y[0, -1]
+        if sol.status != 1:
+            return Decision(self.activation(z1_final), float(sol.t[-1]), sol.nfev, "t_end")
+        if bounded and sol.t_events[0].size:
+            # The event root may land just short of zero, so pick the side that is closing in
+            lower, upper = z1_bounds(self.u, self.v, self.gamma, self.phi, *sol.y[:, -1])
+            decision = int(lower - self.threshold > self.threshold - upper)
+            return Decision(decision, float(sol.t[-1]), sol.nfev, "decided")
+        return Decision(self.activation(z1_final), float(sol.t[-1]), sol.nfev, "settled")
         
     def activation(self, z1_final):
         """
@@ -46,43 +196,195 @@ class BiomolecularPerceptron:
         return 1 if z1_final >= self.threshold else 0
 
 class BiomolecularNeuralNetwork:
-    def __init__(self, layers):
+    def __init__(self, layers, cache=None, weights=None, input_mode="z1_0"):
         """
         Initialize a multi-layer biomolecular neural network.
         :param layers: List of lists of BiomolecularPerceptron objects
+        :param cache: Optional SolutionCache shared by every perceptron solve in "ode" mode
+        :param weights: Optional list with one (n_perceptrons, n_inputs) dense or
+            scipy.sparse matrix per layer, mapping the full input vector (or the
+            previous layer's outputs) onto every perceptron. Without weights each
+            perceptron only sees the first input.
+        :param input_mode: "z1_0" uses the weighted inputs as initial Z1
+            concentrations, "u" scales each perceptron's Z1 production rate by them
         """
+        if input_mode not in ("z1_0", "u"):
+            raise ValueError(f"Unknown input mode: {input_mode!r}")
+        if weights is not None:
+            if len(weights) != len(layers):
+                raise ValueError("Expected one weight matrix per layer")
+            for l, (layer, weight) in enumerate(zip(layers, weights)):
+                expected = len(layers[l - 1]) if l > 0 else weight.shape[1]
+                if weight.shape != (len(layer), expected):
+                    raise ValueError(f"Weight matrix of layer {l} has shape {weight.shape}, "
+                                     f"expected {(len(layer), expected)}")
         self.layers = layers
+        self.cache = cache
+        self.weights = weights
+        self.input_mode = input_mode
+        self.recording = None
+
+    def fan_in(self, l, inputs):
+        """
+        Weighted input of every perceptron in layer l, as one matrix product.
+        :param inputs: Input vector of shape (n_inputs,) or a batch of shape (N, n_inputs)
+        :return: Array of shape inputs.shape[:-1] + (n_perceptrons,)
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        batch = np.atleast_2d(inputs)
+        if self.weights is None:
+            drive = np.repeat(batch[:, :1], len(self.layers[l]), axis=1)
+        else:
+            drive = np.asarray(self.weights[l] @ batch.T).T
+        return drive if inputs.ndim > 1 else drive[0]
+
+    def layer_inputs(self, l, inputs):
+        """
+        Initial Z1 concentration and Z1 production rate of every perceptron in layer l.
+        :param inputs: Input vector of shape (n_inputs,) or a batch of shape (N, n_inputs)
+        :return: Arrays (z1_0, u), each of shape inputs.shape[:-1] + (n_perceptrons,)
+        """
+        drive = self.fan_in(l, inputs)
+        u = np.array([perceptron.u for perceptron in self.layers[l]], dtype=float)
+        if self.input_mode == "u":
+            return np.zeros_like(drive), u * drive
+        return drive, np.broadcast_to(u, drive.shape)
+
+    def _driven(self, perceptron, u):
+        # Perceptron whose Z1 production is scaled by its weighted input
+        if self.input_mode != "u":
+            return perceptron
+        return BiomolecularPerceptron(u, perceptron.v, perceptron.gamma, perceptron.phi, perceptron.threshold)
     
-    def forward(self, inputs):
+    def forward(self, inputs, mode="ode", method="RK45", tracer=None, record=False, record_points=50):
         """
         Forward pass through the network.
         :param inputs: List of initial concentrations [z1, z2]
+        :param mode: "ode" solves each perceptron separately, "fused" solves
+            each layer as one stacked ODE system with a single solver call,
+            "steady" evaluates each layer at its analytic equilibrium, "early"
+            stops each perceptron's integration once its activation is decided,
+            "coupled" integrates the whole network as one continuous-time system
+            in which inputs and upstream Z1 drive Z1 production (see CoupledNetwork)
+        :param method: Solver passed to BiomolecularPerceptron.solve in "ode"
+            and "early" modes and to BiomolecularLayer.solve in "fused" mode,
+            e.g. "auto" to switch to LSODA for stiff perceptrons
+        :param tracer: Optional Tracer recording per-layer and per-perceptron spans
+            with wall time, RHS evaluations, rejected steps and solver method
+        :param record: In "ode" and "fused" modes, store the decimated trajectory
+            of every node in self.recording (a Recording) without extra solves
+        :param record_points: Maximum number of time points kept per trajectory
         :return: List of outputs from the final layer
         """
+        recording = None
+        if record:
+            if mode not in ("ode", "fused"):
+                raise ValueError(f"Trajectories cannot be recorded in {mode!r} mode")
+            recording = Recording(inputs, [len(layer) for layer in self.layers], record_points)
+            self.recording = recording
+        if tracer is None:
+            return self._forward(inputs, mode, method, NULL_TRACER, recording)
+        with tracer.span("forward", mode=mode):
+            return self._forward(inputs, mode, method, tracer, recording)
+
+    def _forward(self, inputs, mode, method, tracer, recording=None):
+        if mode in ("fused", "steady"):
+            return self._forward_fused(inputs, mode=mode, method=method, tracer=tracer, recording=recording)
+        if mode == "coupled":
+            from .coupled import CoupledNetwork
+
+            coupled = CoupledNetwork.from_network(self)
+            with tracer.span("coupled") as span:
+                outputs = coupled.forward(inputs)
+                span.update(coupled.solver_stats)
+            return outputs
+        if mode == "early":
+            current_inputs = inputs
+            for i, layer in enumerate(self.layers):
+                z1_0, u = self.layer_inputs(i, current_inputs)
+                current_inputs = []
+                with tracer.span(f"layer {i}", layer=i):
+                    for j, perceptron in enumerate(layer):
+                        with tracer.span(f"perceptron {j}", layer=i, perceptron=j) as span:
+                            decision = self._driven(perceptron, u[j]).decide(z1_0=z1_0[j], z2_0=0, method=method)
+                            span.update(method=method, nfev=decision.nfev, reason=decision.reason)
+                        current_inputs.append(decision.decision)
+            return current_inputs
+        if mode != "ode":
+            raise ValueError(f"Unknown forward mode: {mode!r}")
+
         current_inputs = inputs
         
         # Process each layer
         for i, layer in enumerate(self.layers):
             layer_outputs = []
+            # First layer: weighted biomarker concentrations, later layers: weighted previous outputs
+            z1_0, u = self.layer_inputs(i, current_inputs)
             
             # Process each perceptron in the layer
-            for perceptron in layer:
-                if i == 0:
-                    # First layer: use biomarker concentrations as inputs
-                    # Use input concentration as z1_0, zero for z2_0 to prevent spontaneous activation
-                    t, sol = perceptron.solve(z1_0=current_inputs[0], z2_0=0)
-                else:
-                    # Subsequent layers: use previous layer outputs
-                    # Use previous output as z1_0, zero for z2_0
-                    t, sol = perceptron.solve(z1_0=current_inputs[0], z2_0=0)
-                
-                output = perceptron.activation(sol[0][-1])
-                layer_outputs.append(output)
+            with tracer.span(f"layer {i}", layer=i):
+                for j, perceptron in enumerate(layer):
+                    with tracer.span(f"perceptron {j}", layer=i, perceptron=j) as span:
+                        # Zero for z2_0 to prevent spontaneous activation
+                        driven = self._driven(perceptron, u[j])
+                        t, sol = driven.solve(z1_0=z1_0[j], z2_0=0, method=method, cache=self.cache)
+                        span.update(driven.solver_stats)
+                    
+                    output = perceptron.activation(sol[0][-1])
+                    layer_outputs.append(output)
+                    if recording is not None:
+                        recording.store(i, j, t, sol, perceptron.threshold, z1_0[j], output)
             
             current_inputs = layer_outputs
         
         return current_inputs
+
+    def _forward_fused(self, inputs, mode="fused", method="RK45", tracer=NULL_TRACER, recording=None):
+        current_inputs = inputs
+        solve_mode = "steady" if mode == "steady" else "ode"
+
+        for i, layer in enumerate(self.layers):
+            with tracer.span(f"layer {i}", layer=i, mode=solve_mode):
+                fused = BiomolecularLayer.from_perceptrons(layer)
+                z1_0, fused.u = self.layer_inputs(i, current_inputs)
+                t, sol = fused.solve(z1_0=z1_0, z2_0=0, mode=solve_mode, method=method)
+                current_inputs = fused.activation(sol[0, :, -1]).tolist()
+            if recording is not None:
+                for j in range(len(layer)):
+                    recording.store(i, j, t, sol[:, j], fused.threshold[j], z1_0[j], current_inputs[j])
+
+        return current_inputs
     
+    def forward_batch(self, inputs, chunk_size=65536):
+        """
+        Forward pass over many samples, integrating all samples and all
+        perceptrons of a layer together as one (N, P, 2) state.
+        :param inputs: Array of shape (N, n_inputs), one row per sample
+        :param chunk_size: Maximum number of samples integrated at once
+        :return: Array of shape (N, n_outputs) with the final layer outputs
+        """
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=float))
+        fused = [BiomolecularLayer.from_perceptrons(layer) for layer in self.layers]
+        outputs = np.empty((inputs.shape[0], len(fused[-1])), dtype=int)
+
+        for start in range(0, inputs.shape[0], chunk_size):
+            current_inputs = inputs[start:start + chunk_size]
+            for i, layer in enumerate(fused):
+                z1_0, layer.u = self.layer_inputs(i, current_inputs)
+                z, _ = layer.solve_batch(z1_0=z1_0, z2_0=0)
+                current_inputs = layer.activation(z[..., 0])
+            outputs[start:start + chunk_size] = current_inputs
+
+        return outputs
+
+    def classify_biosensor_batch(self, biomarkers, chunk_size=65536):
+        """
+        Classifies many biomarker samples at once.
+        :param biomarkers: Array of shape (N, n_biomarkers)
+        :return: Array of shape (N,), 1 where disease is detected
+        """
+        return self.forward_batch(biomarkers, chunk_size=chunk_size)[:, 0]
+
     def classify_biosensor(self, biomarkers):
         """
         Classifies disease presence based on biomarker inputs.
@@ -0,0 +1,220 @@
+import itertools
+
+import numpy as np
+
+class _Evaluator:
+    # Classifier wrapper memoizing labels by finest-lattice coordinates and counting solves
+    def __init__(self, classifier, lower, upper, resolution):
+        self.classifier = classifier
+        self.lower = lower
+        self.upper = upper
+        self.resolution = resolution
+        self.labels = {}
+        self.n_evaluations = 0
+        self.n_batches = 0
+
+    def points(self, lattice):
+        return self.lower + lattice / self.resolution * (self.upper - self.lower)
+
+    def classify(self, points):
+        points = np.asarray(points, dtype=float)
+        if len(points) == 0:
+            return np.zeros(0, dtype=int)
+        self.n_evaluations += len(points)
+        self.n_batches += 1
+        return np.asarray(self.classifier(points), dtype=int)
+
+    def lattice_labels(self, lattice):
+        """
+        Labels of integer lattice points of shape (..., d), evaluating unseen ones in one batch.
+        """
+        flat = lattice.reshape(-1, lattice.shape[-1])
+        keys = [tuple(row) for row in flat.tolist()]
+        missing = list(dict.fromkeys(key for key in keys if key not in self.labels))
+        if missing:
+            labels = self.classify(self.points(np.array(missing, dtype=float)))
+            self.labels.update(zip(missing, labels.tolist()))
+        return np.array([self.labels[key] for key in keys], dtype=int).reshape(lattice.shape[:-1])
+
+def bisect(classifier, a, b, tol=1e-6, max_iter=60):
+    """
+    Batched bisection for the label change on segments from a[i] to b[i].
+
+    All midpoints of one iteration are classified in a single call.
+    :param classifier: Callable mapping an (N, d) array of inputs to (N,) labels,
+        e.g. BiomolecularNeuralNetwork.classify_biosensor_batch
+    :param a: Segment starts of shape (N, d)
+    :param b: Segment ends of shape (N, d)
+    :param tol: Stop once every bracket is shorter than this
+    :return: Crossing points of shape (N, d) and their error bounds of shape (N,);
+        segments whose ends share a label give NaN
+    """
+    a = np.atleast_2d(np.asarray(a, dtype=float)).copy()
+    b = np.atleast_2d(np.asarray(b, dtype=float)).copy()
+    ends = np.asarray(classifier(np.concatenate([a, b])), dtype=int)
+    label_a = ends[:len(a)]
+    crossing = label_a != ends[len(a):]
+
+    for _ in range(max_iter):
+        active = crossing & (np.linalg.norm(b - a, axis=1) > tol)
+        if not active.any():
+            break
+        mid = 0.5 * (a[active] + b[active])
+        same = np.asarray(classifier(mid), dtype=int) == label_a[active]
+        index = np.flatnonzero(active)
+        a[index[same]] = mid[same]
+        b[index[~same]] = mid[~same]
+
+    points = 0.5 * (a + b)
+    errors = 0.5 * np.linalg.norm(b - a, axis=1)
+    points[~crossing] = np.nan
+    errors[~crossing] = np.nan
+    return points, errors
+
+def bisect_rays(classifier, origin, directions, length, tol=1e-6, max_iter=60):
+    """
+    First-order boundary search along rays from a common origin.
+    :param origin: Start point of shape (d,)
+    :param directions: Ray directions of shape (n_rays, d)
+    :param length: Distance searched along every (normalized) direction
+    :return: Crossing points of shape (n_rays, d) and error bounds, NaN where a ray
+        ends with the origin's label
+    """
+    origin = np.asarray(origin, dtype=float)
+    directions = np.atleast_2d(np.asarray(directions, dtype=float))
+    directions = directions / np.linalg.norm(directions, axis=1, keepdims=True)
+    a = np.broadcast_to(origin, directions.shape)
+    return bisect(classifier, a, a + length * directions, tol=tol, max_iter=max_iter)
+
+class BoundaryMap:
+    def __init__(self, lower, upper, max_depth, leaves, evaluator, points, errors):
+        """
+        Result of map_boundary.
+        :param leaves: Level mapped to (cell indices (M, d), labels (M,)); label -1
+            marks mixed cells at max_depth, which contain the boundary
+        :param points: Boundary points of shape (K, d)
+        :param errors: Distance bound between every point and the true boundary
+        """
+        self.lower = lower
+        self.upper = upper
+        self.max_depth = max_depth
+        self.leaves = leaves
+        self.points = points
+        self.errors = errors
+        self._evaluator = evaluator
+
+    @property
+    def n_evaluations(self):
+        """
+        Number of classified inputs, i.e. network forward passes.
+        """
+        return self._evaluator.n_evaluations
+
+    @property
+    def n_batches(self):
+        """
+        Number of batched classifier calls.
+        """
+        return self._evaluator.n_batches
+
+    @property
+    def cell_size(self):
+        """
+        Edge lengths of the finest cells.
+        """
+        return (self.upper - self.lower) / 2 ** self.max_depth
+
+    @property
+    def boundary_cells(self):
+        """
+        Lower corners of the finest cells crossed by the boundary, shape (M, d).
+        """
+        cells = self.leaves.get(self.max_depth, (np.zeros((0, len(self.lower)), dtype=int), None))
+        mixed = cells[0][cells[1] == -1] if cells[1] is not None else cells[0]
+        return self.lower + mixed * self.cell_size
+
+    def predict(self, x):
+        """
+        Labels of arbitrary inputs read from the tree without new solves; inputs in
+        boundary cells take the label of their nearest evaluated corner.
+        :param x: Array of shape (N, d)
+        :return: Array of shape (N,)
+        """
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+        relative = np.clip((x - self.lower) / (self.upper - self.lower), 0, 1)
+        labels = np.full(len(x), -2)
+        for level in sorted(self.leaves):
+            cells, cell_labels = self.leaves[level]
+            if len(cells) == 0:
+                continue
+            size = 2 ** level
+            radix = size ** np.arange(x.shape[1])
+            keys = np.minimum((relative * size).astype(np.int64), size - 1) @ radix
+            leaf_keys = cells @ radix
+            order = np.argsort(leaf_keys)
+            position = np.clip(np.searchsorted(leaf_keys[order], keys), 0, len(order) - 1)
+            found = (labels == -2) & (leaf_keys[order][position] == keys)
+            labels[found] = cell_labels[order][position[found]]
+
+        mixed = labels == -1
+        if mixed.any():
+            corners = np.rint(relative[mixed] * 2 ** self.max_depth).astype(int)
+            labels[mixed] = [self._evaluator.labels[tuple(corner)] for corner in corners.tolist()]
+        return labels
+
+def map_boundary(classifier, bounds, max_depth=10, min_depth=2, tol=None):
+    """
+    Adaptive quadtree/octree map of where a classifier changes label.
+
+    The box is split into 2**min_depth cells per axis; cells whose corners
+    disagree are subdivided until max_depth, so forward passes concentrate near
+    the boundary. Each refinement round is classified in one batch, and corners
+    shared between cells are solved once. Features smaller than the
+    min_depth cells can be missed.
+    :param classifier: Callable mapping an (N, d) array of inputs to (N,) labels,
+        e.g. BiomolecularNeuralNetwork.classify_biosensor_batch
+    :param bounds: One (low, high) pair per input dimension
+    :param max_depth: Finest level; the map matches a grid with 2**max_depth cells per axis
+    :param min_depth: Level of the initial uniform subdivision
+    :param tol: If given, boundary points on crossing cell edges are refined by
+        batched bisection down to this length; otherwise edge midpoints are used
+    :return: BoundaryMap
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    lower, upper = bounds[:, 0], bounds[:, 1]
+    d = len(bounds)
+    evaluator = _Evaluator(classifier, lower, upper, 2 ** max_depth)
+    offsets = np.array(list(itertools.product((0, 1), repeat=d)))
+
+    cells = np.indices((2 ** min_depth,) * d).reshape(d, -1).T
+    leaves = {}
+    for level in range(min_depth, max_depth + 1):
+        corners = (cells[:, np.newaxis, :] + offsets) * 2 ** (max_depth - level)
+        labels = evaluator.lattice_labels(corners)
+        uniform = np.all(labels == labels[:, :1], axis=1)
+        if level == max_depth:
+            leaves[level] = (cells, np.where(uniform, labels[:, 0], -1))
+            break
+        leaves[level] = (cells[uniform], labels[uniform, 0])
+        cells = (2 * cells[~uniform, np.newaxis, :] + offsets).reshape(-1, d)
+        if len(cells) == 0:
+            break
+
+    # Crossing edges of the boundary cells; the boundary passes through each of them
+    mixed = leaves[max_depth][0][leaves[max_depth][1] == -1] if max_depth in leaves else cells[:0]
+    edges = set()
+    for axis in range(d):
+        step = np.eye(d, dtype=int)[axis]
+        for offset in offsets[offsets[:, axis] == 0]:
+            start = mixed + offset
+            end = start + step
+            change = evaluator.lattice_labels(start) != evaluator.lattice_labels(end)
+            edges.update(zip(map(tuple, start[change].tolist()), map(tuple, end[change].tolist())))
+    edges = np.array(sorted(edges), dtype=float).reshape(-1, 2, d)
+
+    a, b = evaluator.points(edges[:, 0]), evaluator.points(edges[:, 1])
+    if tol is not None and len(edges):
+        points, errors = bisect(evaluator.classify, a, b, tol=tol)
+    else:
+        points, errors = 0.5 * (a + b), 0.5 * np.linalg.norm(b - a, axis=1)
+    return BoundaryMap(lower, upper, max_depth, leaves, evaluator, points, errors)
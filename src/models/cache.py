@@ -0,0 +1,112 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+class SolutionCache:
+    def __init__(self, maxsize=1024, digits=12, path=None):
+        """
+        Memoizes perceptron solutions in a bounded LRU with an optional on-disk tier.
+        :param maxsize: Maximum number of solutions held in memory
+        :param digits: Significant digits kept when quantizing float keys
+        :param path: Optional directory for persistent storage across runs
+        """
+        self.maxsize = maxsize
+        self.digits = digits
+        self.path = path
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def _quantize(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        if np.ndim(value):
+            return tuple(self._quantize(v) for v in np.ravel(value))
+        return f"{float(value):.{self.digits}g}"
+
+    def key(self, u, v, gamma, phi, z1_0, z2_0, t_span, t_eval=None, method="RK45", rtol=1e-3, atol=1e-6):
+        """
+        Builds the cache key of a solve, quantizing every float.
+        """
+        return tuple(self._quantize(x) for x in (u, v, gamma, phi, z1_0, z2_0, t_span, t_eval, rtol, atol)) + (method,)
+
+    def _file(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.path, f"{digest}.npz")
+
+    def get(self, key):
+        """
+        Looks up a solution in memory, then on disk.
+        :return: Tuple (t, y, solver_stats) or None on a miss
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._copy(self._entries[key])
+
+        if self.path is not None and os.path.exists(self._file(key)):
+            with np.load(self._file(key), allow_pickle=False) as data:
+                stats = {name[len("stats_"):]: data[name].item() for name in data.files if name.startswith("stats_")}
+                entry = (data["t"], data["y"], stats)
+            self._insert(key, entry)
+            self.disk_hits += 1
+            return self._copy(entry)
+
+        self.misses += 1
+        return None
+
+    def put(self, key, t, y, solver_stats=None):
+        """
+        Stores a solution in memory and, if configured, on disk.
+        """
+        entry = (np.array(t), np.array(y), dict(solver_stats or {}))
+        self._insert(key, entry)
+        if self.path is not None:
+            stats = {f"stats_{name}": value for name, value in entry[2].items()}
+            # Write then rename so concurrent sweep workers never see partial files
+            target = self._file(key)
+            temporary = f"{target[:-len('.npz')]}.{os.getpid()}.tmp.npz"
+            np.savez(temporary, t=entry[0], y=entry[1], **stats)
+            os.replace(temporary, target)
+
+    def _insert(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _copy(entry):
+        t, y, stats = entry
+        return t.copy(), y.copy(), dict(stats)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Hit/miss statistics of the cache.
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """
+        Empties the in-memory tier and resets the statistics. The disk tier is kept.
+        """
+        self._entries.clear()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
@@ -0,0 +1,204 @@
+"""
+Command-line interface, installed as the ``dbnn`` console script:
+
+    dbnn classify --network net.npz --input data.npy --output labels.npy
+    dbnn classify --network net.npz --input data.csv --output - --chunk-size 10000
+    dbnn serve --network net.npz --port 8000
+
+Only argparse is imported at startup; numpy and the models are imported by the
+command that needs them, and scipy only if the network uses sparse weights, so
+``dbnn --help`` and small jobs start quickly.
+"""
+
+import argparse
+import sys
+
+def _read_npy(path, chunk_size):
+    """
+    Chunks of a memory-mapped .npy input, read one chunk at a time.
+    :return: (number of rows, iterator over float arrays of shape (n, n_inputs))
+    """
+    import numpy as np
+
+    data = np.load(path, mmap_mode="r")
+    if data.ndim == 1:
+        data = data[:, np.newaxis]
+
+    def chunks():
+        for start in range(0, len(data), chunk_size):
+            chunk = np.asarray(data[start:start + chunk_size], dtype=float)
+            finite = np.isfinite(chunk).all(axis=1)
+            if not finite.all():
+                row = start + int(np.argmin(finite))
+                raise ValueError(f"{path}, row {row}: non-finite value in {chunk[row - start].tolist()!r}")
+            yield chunk
+
+    return len(data), chunks()
+
+def _csv_rows(path, delimiter):
+    import csv
+    import math
+
+    with open(path, newline="") as f:
+        for i, row in enumerate(csv.reader(f, delimiter=delimiter)):
+            if not row or not "".join(row).strip():
+                continue
+            try:
+                values = [float(value) for value in row]
+            except ValueError:
+                # A non-numeric first row is a header
+                if i == 0:
+                    continue
+                raise ValueError(f"{path}, line {i + 1}: non-numeric value in {row!r}")
+            # float() also accepts nan and inf, which no network can classify
+            if not all(math.isfinite(value) for value in values):
+                raise ValueError(f"{path}, line {i + 1}: non-finite value in {row!r}")
+            yield values
+
+def _read_csv(path, chunk_size, delimiter, count=False):
+    """
+    Chunks of a CSV input, parsed one chunk at a time.
+    :param count: Count the rows in a first pass, needed when writing an .npy output
+    :return: (number of rows or None, iterator over float arrays of shape (n, n_inputs))
+    """
+    import itertools
+
+    import numpy as np
+
+    n_rows = sum(1 for _ in _csv_rows(path, delimiter)) if count else None
+
+    def chunks():
+        rows = _csv_rows(path, delimiter)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield np.array(chunk, dtype=float)
+
+    return n_rows, chunks()
+
+class _NpyWriter:
+    def __init__(self, path, n_rows, n_columns):
+        from numpy.lib.format import open_memmap
+
+        shape = (n_rows,) if n_columns is None else (n_rows, n_columns)
+        self.array = open_memmap(path, mode="w+", dtype="int8", shape=shape)
+        self.position = 0
+
+    def write(self, outputs):
+        self.array[self.position:self.position + len(outputs)] = outputs
+        self.position += len(outputs)
+
+    def close(self):
+        self.array.flush()
+        del self.array
+
+class _CsvWriter:
+    def __init__(self, path, delimiter):
+        self.file = sys.stdout if path == "-" else open(path, "w")
+        self.delimiter = delimiter
+
+    def write(self, outputs):
+        lines = (self.delimiter.join(str(int(value)) for value in row) if row.ndim else str(int(row))
+                 for row in outputs)
+        self.file.write("".join(line + "\n" for line in lines))
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+def classify(args):
+    """
+    Classifies every row of the input, one chunk at a time, appending each
+    chunk's results to the output before reading the next one.
+    """
+    from .compact import CompactNetwork
+
+    network = CompactNetwork.load(args.network)
+    n_columns = network.layer_sizes[-1] if args.all_outputs else None
+    npy_output = args.output != "-" and args.output.endswith(".npy")
+
+    if args.input.endswith(".npy"):
+        n_rows, chunks = _read_npy(args.input, args.chunk_size)
+    else:
+        n_rows, chunks = _read_csv(args.input, args.chunk_size, args.delimiter, count=npy_output)
+
+    writer = _NpyWriter(args.output, n_rows, n_columns) if npy_output else _CsvWriter(args.output, args.delimiter)
+    n_done = n_positive = 0
+    try:
+        for chunk in chunks:
+            outputs = network.forward_batch(chunk, chunk_size=args.chunk_size)
+            if not args.all_outputs:
+                outputs = outputs[:, 0]
+            writer.write(outputs)
+            n_done += len(chunk)
+            n_positive += int(outputs.sum()) if not args.all_outputs else int(outputs[:, 0].sum())
+            if args.verbose:
+                print(f"{n_done} samples classified", file=sys.stderr)
+    finally:
+        writer.close()
+
+    if not args.quiet:
+        print(f"Classified {n_done} samples, {n_positive} positive", file=sys.stderr)
+    return 0
+
+def serve(args):
+    """
+    Serves classifications over HTTP on localhost until interrupted.
+    """
+    from .compact import CompactNetwork
+    from .server import serve
+
+    network = CompactNetwork.load(args.network)
+    print(f"Serving {args.network} on http://{args.host}:{args.port}", file=sys.stderr)
+    serve(network, host=args.host, port=args.port, max_batch_size=args.max_batch_size,
+          max_delay=args.max_delay, workers=args.workers, executor=args.executor)
+    return 0
+
+def parser():
+    parser = argparse.ArgumentParser(prog="dbnn", description="Dynamical biomolecular neural network tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("classify", help="Classify biomarker samples with a saved network",
+                                  description="Streams samples through a network saved with "
+                                              "CompactNetwork.save, in chunks of bounded size.")
+    command.add_argument("--network", required=True, help="Network .npz file written by CompactNetwork.save")
+    command.add_argument("--input", required=True,
+                         help="Samples as an .npy file (memory-mapped) or a CSV file, one row per sample")
+    command.add_argument("--output", default="-",
+                         help="Output .npy or CSV file, or - for standard output (default)")
+    command.add_argument("--chunk-size", type=int, default=65536, help="Samples classified at once")
+    command.add_argument("--delimiter", default=",", help="CSV field delimiter")
+    command.add_argument("--all-outputs", action="store_true",
+                         help="Write every final-layer output instead of only the first")
+    command.add_argument("-v", "--verbose", action="store_true", help="Report progress after every chunk")
+    command.add_argument("-q", "--quiet", action="store_true", help="Do not print the summary")
+    command.set_defaults(function=classify)
+
+    command = commands.add_parser("serve", help="Serve classifications over HTTP with request micro-batching",
+                                  description="Runs the asyncio inference server of models.server.")
+    command.add_argument("--network", required=True, help="Network .npz file written by CompactNetwork.save")
+    command.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    command.add_argument("--port", type=int, default=8000, help="TCP port")
+    command.add_argument("--max-batch-size", type=int, default=256, help="Samples per micro-batch")
+    command.add_argument("--max-delay", type=float, default=0.005,
+                         help="Seconds a request waits for others to join its batch")
+    command.add_argument("--workers", type=int, help="Worker pool size")
+    command.add_argument("--executor", choices=("thread", "process"), default="thread", help="Worker pool type")
+    command.set_defaults(function=serve)
+    return parser
+
+def main(argv=None):
+    arguments = parser()
+    args = arguments.parse_args(argv)
+    if getattr(args, "chunk_size", 1) < 1:
+        arguments.error("--chunk-size must be positive")
+    try:
+        return args.function(args)
+    except (OSError, ValueError, KeyError) as error:
+        print(f"dbnn: error: {error}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import json
+import os
+
+import numpy as np
+
+from .biomolecular_layer import BiomolecularLayer
+from .biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+
+# Per-perceptron parameters, in storage order
+PARAMETERS = ("u", "v", "gamma", "phi", "threshold")
+
+def _parameter(name):
+    def get(self):
+        return getattr(self._layer, name)[self._index].item()
+
+    def set(self, value):
+        getattr(self._layer, name)[self._index] = value
+
+    return property(get, set, doc=f"{name} of the viewed perceptron, stored in the layer array")
+
+class PerceptronView(BiomolecularPerceptron):
+    """
+    A BiomolecularPerceptron whose parameters live in a BiomolecularLayer's
+    arrays. Reads and writes go straight to the arrays, so views are cheap to
+    create and share state with the compact network.
+    """
+    __slots__ = ("_layer", "_index")
+
+    u = _parameter("u")
+    v = _parameter("v")
+    gamma = _parameter("gamma")
+    phi = _parameter("phi")
+    threshold = _parameter("threshold")
+
+    def __init__(self, layer, index):
+        self._layer = layer
+        self._index = index
+        self.solver_stats = None
+
+    def __repr__(self):
+        return f"PerceptronView({', '.join(f'{name}={getattr(self, name)!r}' for name in PARAMETERS)})"
+
+class CompactNetwork:
+    def __init__(self, layers, weights=None, input_mode="z1_0"):
+        """
+        Struct-of-arrays form of a BiomolecularNeuralNetwork: one contiguous
+        parameter array per layer and parameter, plus the fan-in matrices.
+        :param layers: List of BiomolecularLayer objects
+        :param weights: Optional list with one dense or scipy.sparse fan-in matrix per layer
+        :param input_mode: "z1_0" or "u", as in BiomolecularNeuralNetwork
+        """
+        self.layers = layers
+        self.weights = weights
+        self.input_mode = input_mode
+
+    @classmethod
+    def from_network(cls, network):
+        """
+        Packs a BiomolecularNeuralNetwork into parameter arrays.
+        """
+        return cls([BiomolecularLayer.from_perceptrons(layer) for layer in network.layers],
+                   weights=network.weights, input_mode=network.input_mode)
+
+    @property
+    def layer_sizes(self):
+        return [len(layer) for layer in self.layers]
+
+    def perceptron(self, l, j):
+        """
+        View of perceptron j of layer l.
+        """
+        return PerceptronView(self.layers[l], j)
+
+    def network(self, cache=None):
+        """
+        BiomolecularNeuralNetwork over PerceptronView objects sharing this network's arrays.
+        """
+        views = [[PerceptronView(layer, j) for j in range(len(layer))] for layer in self.layers]
+        return BiomolecularNeuralNetwork(views, cache=cache, weights=self.weights, input_mode=self.input_mode)
+
+    def forward_batch(self, inputs, chunk_size=65536):
+        """
+        Same as BiomolecularNeuralNetwork.forward_batch.
+        """
+        return self.network().forward_batch(inputs, chunk_size=chunk_size)
+
+    def classify_biosensor_batch(self, biomarkers, chunk_size=65536):
+        """
+        Same as BiomolecularNeuralNetwork.classify_biosensor_batch.
+        """
+        return self.forward_batch(biomarkers, chunk_size=chunk_size)[:, 0]
+
+    def arrays(self):
+        """
+        Flat dict of every array describing the network, as written by save().
+        Sparse weights are stored as their CSR components.
+        """
+        arrays = {"input_mode": np.array(self.input_mode), "n_layers": np.array(len(self.layers))}
+        for l, layer in enumerate(self.layers):
+            for name in PARAMETERS:
+                arrays[f"{name}_{l}"] = getattr(layer, name)
+            weight = None if self.weights is None else self.weights[l]
+            if hasattr(weight, "tocsr"):
+                weight = weight.tocsr()
+                arrays.update({f"weight_{l}_data": weight.data, f"weight_{l}_indices": weight.indices,
+                               f"weight_{l}_indptr": weight.indptr, f"weight_{l}_shape": np.array(weight.shape)})
+            elif weight is not None:
+                arrays[f"weight_{l}"] = np.asarray(weight, dtype=float)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Inverse of arrays().
+        """
+        n_layers = int(arrays["n_layers"])
+        layers = [BiomolecularLayer(*(arrays[f"{name}_{l}"] for name in PARAMETERS)) for l in range(n_layers)]
+        weights = []
+        for l in range(n_layers):
+            if f"weight_{l}" in arrays:
+                weights.append(np.array(arrays[f"weight_{l}"]))
+            elif f"weight_{l}_data" in arrays:
+                from scipy import sparse
+
+                weights.append(sparse.csr_matrix(
+                    (arrays[f"weight_{l}_data"], arrays[f"weight_{l}_indices"], arrays[f"weight_{l}_indptr"]),
+                    shape=tuple(arrays[f"weight_{l}_shape"]),
+                ))
+            else:
+                weights.append(None)
+        if all(weight is None for weight in weights):
+            weights = None
+        return cls(layers, weights=weights, input_mode=str(arrays["input_mode"]))
+
+    def save(self, path):
+        """
+        Writes the network to an .npz file.
+        """
+        np.savez(path, **self.arrays())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a network written by save().
+        """
+        with np.load(path) as data:
+            return cls.from_arrays({name: data[name] for name in data.files})
+
+class DesignLibrary:
+    def __init__(self, params, architecture):
+        """
+        Many designs of one architecture as a structured array with one row per
+        design and one (n_perceptrons,) field per layer and parameter, e.g. "u_0".
+        :param params: Structured array, possibly memory-mapped
+        :param architecture: CompactNetwork supplying the fan-in weights and input mode
+        """
+        self.params = params
+        self.architecture = architecture
+
+    @staticmethod
+    def dtype(layer_sizes):
+        return np.dtype([(f"{name}_{l}", float, (size,)) for l, size in enumerate(layer_sizes) for name in PARAMETERS])
+
+    @classmethod
+    def from_networks(cls, networks):
+        """
+        Packs networks of identical architecture; the first one provides weights and input mode.
+        :param networks: Sequence of BiomolecularNeuralNetwork or CompactNetwork objects
+        """
+        compact = [n if isinstance(n, CompactNetwork) else CompactNetwork.from_network(n) for n in networks]
+        sizes = compact[0].layer_sizes
+        params = np.empty(len(compact), dtype=cls.dtype(sizes))
+        for i, network in enumerate(compact):
+            if network.layer_sizes != sizes:
+                raise ValueError(f"Design {i} has layer sizes {network.layer_sizes}, expected {sizes}")
+            for l, layer in enumerate(network.layers):
+                for name in PARAMETERS:
+                    params[f"{name}_{l}"][i] = getattr(layer, name)
+        return cls(params, compact[0])
+
+    def __len__(self):
+        return len(self.params)
+
+    @property
+    def layer_sizes(self):
+        return self.architecture.layer_sizes
+
+    def column(self, l, name):
+        """
+        Parameter name of layer l for every design, shape (n_designs, n_perceptrons),
+        read without building any per-design object.
+        """
+        return self.params[f"{name}_{l}"]
+
+    def __getitem__(self, i):
+        """
+        Design i as a CompactNetwork.
+        """
+        row = self.params[i]
+        layers = [BiomolecularLayer(*(row[f"{name}_{l}"] for name in PARAMETERS)) for l in range(len(self.layer_sizes))]
+        return CompactNetwork(layers, weights=self.architecture.weights, input_mode=self.architecture.input_mode)
+
+    def save(self, path):
+        """
+        Writes the library to a directory holding params.npy, which load()
+        memory-maps, and the shared architecture as architecture.npz.
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "params.npy"), self.params)
+        self.architecture.save(os.path.join(path, "architecture.npz"))
+        with open(os.path.join(path, "library.json"), "w") as f:
+            json.dump({"n_designs": len(self), "layer_sizes": self.layer_sizes}, f)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Opens a library written by save() without reading the parameters into memory.
+        :param mmap_mode: numpy memory-map mode, or None to load everything
+        """
+        params = np.load(os.path.join(path, "params.npy"), mmap_mode=mmap_mode)
+        return cls(params, CompactNetwork.load(os.path.join(path, "architecture.npz")))
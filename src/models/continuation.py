@@ -0,0 +1,294 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .biomolecular_layer import BiomolecularLayer
+from .biomolecular_perceptron import BiomolecularPerceptron
+from .steady_state import steady_state
+from .training import forward_sensitivities
+
+# Rate constants that can be traced or designed; "input" varies the input concentration instead
+PARAMETERS = ("u", "v", "gamma", "phi")
+
+# Result of design
+Calibration = namedtuple("Calibration", ["perceptron", "value", "n_iterations"])
+
+def _rates(perceptron, parameter, value, concentration, input_mode):
+    """
+    Rate constants of the driven perceptron with parameter set to value, and the
+    input concentration. In "u" mode the input scales the Z1 production rate.
+    """
+    rates = {name: getattr(perceptron, name) for name in PARAMETERS}
+    if parameter == "input":
+        concentration = value
+    elif parameter in PARAMETERS:
+        rates[parameter] = value
+    else:
+        raise ValueError(f"Unknown parameter: {parameter!r}")
+    if input_mode == "u":
+        rates["u"] = rates["u"] * concentration
+    elif input_mode != "z1_0":
+        raise ValueError(f"Unknown input mode: {input_mode!r}")
+    return rates, concentration
+
+def _jacobian_solve(gamma, phi, z1, z2, r1, r2):
+    # Solves J @ x = r with the titration Jacobian, whose determinant
+    # phi * (phi + gamma * (z1 + z2)) is positive for phi > 0 and z >= 0
+    a, b = -gamma * z2 - phi, -gamma * z1
+    c, d = -gamma * z2, -gamma * z1 - phi
+    det = a * d - b * c
+    return (d * r1 - b * r2) / det, (a * r2 - c * r1) / det
+
+def _check_readout(input_mode, readout):
+    if readout == "steady" and input_mode != "u":
+        raise ValueError("The steady state does not depend on z1_0; use input_mode=\"u\" "
+                         "or the transient readout")
+
+def _steady_tangent(perceptron, parameter, rates, concentration, input_mode, z1, z2):
+    """
+    Derivative (dz1, dz2) of the equilibrium with respect to parameter, from
+    J @ dz = -dF/dparameter (implicit function theorem).
+    """
+    if parameter == "u":
+        explicit = (concentration if input_mode == "u" else 1.0, 0.0)
+    elif parameter == "input":
+        _check_readout(input_mode, "steady")
+        explicit = (perceptron.u, 0.0)
+    elif parameter == "v":
+        explicit = (0.0, 1.0)
+    elif parameter == "gamma":
+        explicit = (-z1 * z2, -z1 * z2)
+    else:
+        explicit = (-z1, -z2)
+    dz1, dz2 = _jacobian_solve(rates["gamma"], rates["phi"], z1, z2, *explicit)
+    return -dz1, -dz2
+
+def _readout(perceptron, parameter, values, concentration, input_mode, readout, t_span, rtol, atol):
+    """
+    Z1 read out by the activation and its derivative with respect to parameter,
+    vectorized over values.
+    :param readout: "steady" for the equilibrium, "transient" for Z1 at
+        t_span[1] starting from zero Z2, as in the "ode" forward mode
+    :return: Arrays (z1, dz1)
+    """
+    values = np.asarray(values, dtype=float)
+    rates, concentration = _rates(perceptron, parameter, values, concentration, input_mode)
+    if readout == "steady":
+        z1, z2 = steady_state(rates["u"], rates["v"], rates["gamma"], rates["phi"])
+        dz1, _ = _steady_tangent(perceptron, parameter, rates, concentration, input_mode, z1, z2)
+        return z1, dz1
+    if readout != "transient":
+        raise ValueError(f"Unknown readout: {readout!r}")
+
+    shape = np.broadcast_shapes(values.shape, np.shape(concentration))
+    layer = BiomolecularLayer(*(np.broadcast_to(rates[name], shape).ravel() for name in PARAMETERS))
+    z1_0 = np.broadcast_to(concentration if input_mode == "z1_0" else 0.0, shape).ravel()
+    z1, sens = forward_sensitivities(layer, z1_0[np.newaxis], t_span=t_span, rtol=rtol, atol=atol)
+    if parameter == "input":
+        dz1 = sens["z1_0"] if input_mode == "z1_0" else perceptron.u * sens["u"]
+    elif parameter == "u" and input_mode == "u":
+        dz1 = concentration * sens["u"]
+    else:
+        dz1 = sens[parameter]
+    return z1[0].reshape(shape), np.reshape(dz1[0], shape)
+
+class Branch:
+    def __init__(self, parameter, values, z1, z2, dz1, n_iterations):
+        """
+        Equilibria of a perceptron along one parameter, as traced by trace().
+        :param parameter: Name of the varied parameter, or "input"
+        :param values: Parameter values, one per point
+        :param z1: Equilibrium Z1 at every point
+        :param z2: Equilibrium Z2 at every point
+        :param dz1: Derivative of Z1 with respect to the parameter at every point
+        :param n_iterations: Newton corrector iterations per point
+        """
+        self.parameter = parameter
+        self.values = values
+        self.z1 = z1
+        self.z2 = z2
+        self.dz1 = dz1
+        self.n_iterations = n_iterations
+
+    def __len__(self):
+        return len(self.values)
+
+    def crossings(self, threshold):
+        """
+        Parameter values at which Z1 crosses threshold, interpolated between
+        neighbouring points with the traced derivatives (cubic Hermite).
+        """
+        above = self.z1 >= threshold
+        roots = []
+        for i in np.flatnonzero(above[1:] != above[:-1]):
+            h = self.values[i + 1] - self.values[i]
+            y0, y1 = self.z1[i] - threshold, self.z1[i + 1] - threshold
+            m0, m1 = self.dz1[i] * h, self.dz1[i + 1] * h
+            # Newton on the Hermite interpolant over s in [0, 1], started from the secant root
+            s = y0 / (y0 - y1)
+            for _ in range(20):
+                h00, h10, h01, h11 = 2 * s**3 - 3 * s**2 + 1, s**3 - 2 * s**2 + s, -2 * s**3 + 3 * s**2, s**3 - s**2
+                f = h00 * y0 + h10 * m0 + h01 * y1 + h11 * m1
+                df = (6 * s**2 - 6 * s) * (y0 - y1) + (3 * s**2 - 4 * s + 1) * m0 + (3 * s**2 - 2 * s) * m1
+                if df == 0:
+                    break
+                s = min(max(s - f / df, 0.0), 1.0)
+            roots.append(self.values[i] + s * h)
+        return np.array(roots)
+
+def trace(perceptron, parameter, values, concentration=1.0, input_mode="z1_0", tol=1e-12, max_iter=20):
+    """
+    Equilibrium of a perceptron as one parameter or the input varies, by
+    predictor-corrector continuation: every point starts from the previous
+    equilibrium moved along its tangent and is refined by Newton iterations
+    with the analytic Jacobian, typically one or two per point.
+    :param perceptron: BiomolecularPerceptron
+    :param parameter: "u", "v", "gamma", "phi", or "input" for the input concentration
+    :param values: Increasing or decreasing sequence of parameter values
+    :param concentration: Input concentration while a rate constant is varied
+    :param input_mode: "z1_0" or "u", as in BiomolecularNeuralNetwork; the
+        equilibrium only depends on the input in "u" mode
+    :param tol: Newton stops when the step is below tol * (1 + |z|)
+    :return: Branch
+    """
+    values = np.asarray(values, dtype=float)
+    if parameter == "input":
+        _check_readout(input_mode, "steady")
+    rates, x = _rates(perceptron, parameter, values[0], concentration, input_mode)
+    z = np.array(steady_state(rates["u"], rates["v"], rates["gamma"], rates["phi"]), dtype=float)
+    z1, z2, dz1 = np.empty(len(values)), np.empty(len(values)), np.empty(len(values))
+    n_iterations = np.zeros(len(values), dtype=int)
+    tangent = np.zeros(2)
+
+    for i, value in enumerate(values):
+        rates, x = _rates(perceptron, parameter, value, concentration, input_mode)
+        u, v, gamma, phi = (rates[name] for name in PARAMETERS)
+        if i > 0:
+            z = np.maximum(z + tangent * (value - values[i - 1]), 0.0)
+        for iteration in range(1, max_iter + 1):
+            titration = gamma * z[0] * z[1]
+            step = _jacobian_solve(gamma, phi, z[0], z[1], u - titration - phi * z[0], v - titration - phi * z[1])
+            z = z - np.array(step)
+            if np.max(np.abs(step)) <= tol * (1 + np.max(np.abs(z))):
+                break
+        else:
+            raise RuntimeError(f"Newton did not converge at {parameter}={value} within {max_iter} iterations")
+        tangent = np.array(_steady_tangent(perceptron, parameter, rates, x, input_mode, z[0], z[1]))
+        z1[i], z2[i], dz1[i], n_iterations[i] = z[0], z[1], tangent[0], iteration
+
+    return Branch(parameter, values, z1, z2, dz1, n_iterations)
+
+def response(perceptron, inputs, input_mode="z1_0", t_span=(0, 10), rtol=1e-8, atol=1e-10):
+    """
+    Z1 at t_span[1] for many input concentrations, with its derivative with
+    respect to the input, from a single vectorized integration of the forward
+    sensitivity equations.
+    :return: Arrays (z1, dz1_dinput) shaped like inputs
+    """
+    return _readout(perceptron, "input", inputs, None, input_mode, "transient", t_span, rtol, atol)
+
+def _find_root(function, low, high, start, tol, max_iter, max_step=np.inf):
+    """
+    Newton iteration for a root of function inside [low, high], started at
+    start. Steps are clipped to the interval and to max_step; once two iterates
+    straddle the root they bracket it, and a Newton step leaving the bracket is
+    replaced by bisection. The ends of the interval are only evaluated if the
+    iteration reaches them, which keeps extreme rate constants out of the
+    integration in the usual case.
+    :param function: Maps a point to (value, derivative)
+    :param tol: Stops once |value| <= tol or the bracket is narrower than tol * (1 + |x|)
+    :return: (root, number of function evaluations)
+    """
+    x = min(max(start, low), high)
+    negative = positive = None
+    for n in range(1, max_iter + 1):
+        f, df = (float(y) for y in function(x))
+        if abs(f) <= tol:
+            return x, n
+        if f < 0:
+            negative = x
+        else:
+            positive = x
+        step = x - f / df if df != 0 else np.nan
+        if negative is not None and positive is not None:
+            a, b = min(negative, positive), max(negative, positive)
+            if b - a <= tol * (1 + abs(x)):
+                return x, n
+            x = step if a < step < b else 0.5 * (a + b)
+            continue
+        if np.isnan(step):
+            raise ValueError(f"The response does not change with the parameter at {x:.6g}")
+        step = min(max(step, x - max_step, low), x + max_step, high)
+        if step == x:
+            raise ValueError(f"No switch inside [{low:.6g}, {high:.6g}]: the response at {x:.6g} is "
+                             f"{f:+.6g} from the threshold and the iteration cannot move further")
+        x = step
+    raise RuntimeError(f"Root finding did not converge within {max_iter} iterations")
+
+def switch_point(perceptron, input_mode="z1_0", readout="transient", bounds=(0.0, 100.0), t_span=(0, 10),
+                 tol=1e-7, max_iter=50, rtol=1e-8, atol=1e-10):
+    """
+    Input concentration at which the perceptron's activation switches, where
+    the read-out Z1 equals its threshold.
+    :param input_mode: "z1_0" or "u", as in BiomolecularNeuralNetwork
+    :param readout: "transient" reads Z1 at t_span[1] like the "ode" forward
+        mode, "steady" uses the equilibrium like the "steady" mode ("u" input only)
+    :param bounds: Input range searched for the switch
+    :param tol: Accepted deviation of the read-out Z1 from the threshold
+    :param rtol: Relative tolerance of the transient integration
+    :param atol: Absolute tolerance of the transient integration
+    :return: Input concentration
+    """
+    _check_readout(input_mode, readout)
+
+    def residual(x):
+        z1, dz1 = _readout(perceptron, "input", x, None, input_mode, readout, t_span, rtol, atol)
+        return z1 - perceptron.threshold, dz1
+
+    x, _ = _find_root(residual, bounds[0], bounds[1], 0.5 * (bounds[0] + bounds[1]), tol, max_iter)
+    return x
+
+def design(perceptron, target, parameter="threshold", input_mode="z1_0", readout="transient", bounds=None,
+           t_span=(0, 10), tol=1e-7, max_iter=50, rtol=1e-8, atol=1e-10):
+    """
+    Sets one parameter so that the perceptron's activation switches exactly at
+    a target input concentration, e.g. a clinical cutoff.
+
+    The threshold is read off the response at the target directly. A rate
+    constant is found by safeguarded Newton iteration in log space, with the
+    derivative of the read-out Z1 from the implicit function theorem (steady
+    readout) or the forward sensitivity equations (transient readout).
+    :param perceptron: BiomolecularPerceptron to start from; it is not modified
+    :param target: Input concentration at which the output should flip
+    :param parameter: "threshold", "u", "v", "gamma" or "phi"
+    :param input_mode: "z1_0" or "u", as in BiomolecularNeuralNetwork
+    :param readout: "transient" or "steady", see switch_point
+    :param bounds: (low, high) range of the rate constant; 1e-3 to 1e3 times
+        its current value by default
+    :param tol: Accepted deviation of the read-out Z1 from the threshold
+    :return: Calibration(perceptron, value, n_iterations) with the new
+        perceptron, the designed parameter value and the number of response evaluations
+    """
+    _check_readout(input_mode, readout)
+    params = {name: getattr(perceptron, name) for name in PARAMETERS + ("threshold",)}
+    if parameter == "threshold":
+        z1, _ = _readout(perceptron, "u", perceptron.u, target, input_mode, readout, t_span, rtol, atol)
+        params["threshold"] = float(z1)
+        return Calibration(BiomolecularPerceptron(**params), params["threshold"], 1)
+    if parameter not in PARAMETERS:
+        raise ValueError(f"Unknown parameter: {parameter!r}")
+
+    low, high = bounds if bounds is not None else (params[parameter] * 1e-3, params[parameter] * 1e3)
+    if low <= 0:
+        raise ValueError("Rate constants are designed in log space and need positive bounds")
+
+    def residual(s):
+        value = np.exp(s)
+        z1, dz1 = _readout(perceptron, parameter, value, target, input_mode, readout, t_span, rtol, atol)
+        return z1 - perceptron.threshold, dz1 * value
+
+    # Log-space steps of at most 1 change the rate by no more than a factor e per iteration
+    s, n_iterations = _find_root(residual, np.log(low), np.log(high), np.log(params[parameter]), tol, max_iter,
+                                 max_step=1.0)
+    params[parameter] = float(np.exp(s))
+    return Calibration(BiomolecularPerceptron(**params), params[parameter], n_iterations)
@@ -0,0 +1,141 @@
+import numpy as np
+from scipy import sparse
+from scipy.integrate import solve_ivp
+
+from .biomolecular_layer import BiomolecularLayer
+
+class CoupledNetwork:
+    def __init__(self, layers, weights=None):
+        """
+        Compiles a layered network into one flat ODE system in which upstream
+        Z1 concentrations continuously drive downstream Z1 production.
+
+        Perceptron j of layer l produces Z1 at rate u_j * (W_l @ s)_j, where s
+        is the input vector for the first layer and the Z1 of layer l - 1
+        otherwise, so u acts as a gain. Z2 is produced at the constant rate v_j.
+        :param layers: List of BiomolecularLayer objects
+        :param weights: Optional list with one (n_perceptrons, n_sources) dense or
+            scipy.sparse matrix per layer. Missing entries (None) connect every
+            perceptron to the first source only, like BiomolecularNeuralNetwork.fan_in.
+        """
+        self.layers = layers
+        self.solver_stats = None
+        self.weights = list(weights) if weights is not None else [None] * len(layers)
+        if len(self.weights) != len(layers):
+            raise ValueError("Expected one weight matrix per layer")
+
+        sizes = [len(layer) for layer in layers]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)])
+        self.n_nodes = int(self.offsets[-1])
+        self.u = np.concatenate([layer.u for layer in layers])
+        self.v = np.concatenate([layer.v for layer in layers])
+        self.gamma = np.concatenate([layer.gamma for layer in layers])
+        self.phi = np.concatenate([layer.phi for layer in layers])
+
+        # Z1 -> Z1 production couplings between consecutive layers, as one block matrix
+        blocks = [[None] * len(layers) for _ in layers]
+        for l in range(len(layers)):
+            blocks[l][l] = sparse.csr_matrix((sizes[l], sizes[l]))
+        for l in range(1, len(layers)):
+            blocks[l][l - 1] = self._weight(l, sizes[l - 1])
+        self.coupling = sparse.bmat(blocks, format="csr")
+        self.production = sparse.diags(self.u) @ self.coupling
+
+        identity = sparse.identity(self.n_nodes, format="csr")
+        self.jac_sparsity = sparse.bmat([
+            [(self.coupling != 0) + identity, identity],
+            [identity, identity],
+        ], format="csc")
+
+    @classmethod
+    def from_network(cls, network, weights=None):
+        """
+        Compiles a BiomolecularNeuralNetwork, using its fan-in weights unless others are given.
+        """
+        if weights is None:
+            weights = network.weights
+        return cls([BiomolecularLayer.from_perceptrons(layer) for layer in network.layers], weights=weights)
+
+    def _weight(self, l, n_sources):
+        weight = self.weights[l]
+        if weight is None:
+            first = np.zeros((len(self.layers[l]), n_sources))
+            first[:, 0] = 1.0
+            return sparse.csr_matrix(first)
+        weight = sparse.csr_matrix(weight)
+        if weight.shape != (len(self.layers[l]), n_sources):
+            raise ValueError(f"Weight matrix of layer {l} has shape {weight.shape}, "
+                             f"expected {(len(self.layers[l]), n_sources)}")
+        return weight
+
+    def layer_slice(self, l):
+        """
+        Indices of the perceptrons of layer l in the flat state.
+        """
+        return slice(self.offsets[l], self.offsets[l + 1])
+
+    def input_drive(self, inputs):
+        """
+        Constant Z1 production of every node due to the network inputs.
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        drive = np.zeros(self.n_nodes)
+        drive[self.layer_slice(0)] = self.layers[0].u * (self._weight(0, inputs.shape[0]) @ inputs)
+        return drive
+
+    def equations(self, t, z, drive):
+        """
+        Right-hand side of the whole network.
+        :param z: Flat state [z1 of every node, z2 of every node]
+        :param drive: Input-driven Z1 production from input_drive()
+        """
+        z1, z2 = z[:self.n_nodes], z[self.n_nodes:]
+        titration = self.gamma * z1 * z2
+        dz1_dt = drive + self.production @ z1 - titration - self.phi * z1
+        dz2_dt = self.v - titration - self.phi * z2
+        return np.concatenate([dz1_dt, dz2_dt])
+
+    def jacobian(self, t, z, drive):
+        """
+        Sparse Jacobian of equations; its non-zeros follow jac_sparsity.
+        """
+        z1, z2 = z[:self.n_nodes], z[self.n_nodes:]
+        return sparse.bmat([
+            [self.production + sparse.diags(-self.gamma * z2 - self.phi), sparse.diags(-self.gamma * z1)],
+            [sparse.diags(-self.gamma * z2), sparse.diags(-self.gamma * z1 - self.phi)],
+        ], format="csc")
+
+    def solve(self, inputs, t_span=(0, 10), t_eval=None, method="BDF", rtol=1e-3, atol=1e-6,
+              analytic_jacobian=True, z0=None):
+        """
+        Integrates the whole network in a single solver call.
+        :param inputs: Network input vector, held constant over t_span
+        :param t_span: Time span (start, end)
+        :param t_eval: Optional list of times to evaluate the solution
+        :param method: Implicit solve_ivp method using the sparse Jacobian ("BDF" or "Radau")
+        :param analytic_jacobian: Use the analytic sparse Jacobian; if False the
+            solver estimates it by finite differences restricted to jac_sparsity
+        :param z0: Optional flat initial state; all concentrations start at zero by default
+        :return: Times and solution of shape (2, n_nodes, len(t))
+        """
+        drive = self.input_drive(inputs)
+        z0 = np.zeros(2 * self.n_nodes) if z0 is None else np.asarray(z0, dtype=float).ravel()
+        options = {"jac": self.jacobian} if analytic_jacobian else {"jac_sparsity": self.jac_sparsity}
+        sol = solve_ivp(self.equations, t_span, z0, t_eval=t_eval, method=method, args=(drive,),
+                        rtol=rtol, atol=atol, **options)
+        self.solver_stats = {
+            "method": method,
+            "nfev": sol.nfev,
+            "njev": sol.njev,
+            "nlu": sol.nlu,
+            "status": sol.status,
+        }
+        return sol.t, sol.y.reshape(2, self.n_nodes, -1)
+
+    def forward(self, inputs, t_span=(0, 10), method="BDF"):
+        """
+        Outputs of the final layer after integrating the coupled network.
+        :return: List of 0/1 outputs
+        """
+        t, sol = self.solve(inputs, t_span=t_span, t_eval=[t_span[1]], method=method)
+        return self.layers[-1].activation(sol[0, self.layer_slice(len(self.layers) - 1), -1]).tolist()
@@ -0,0 +1,184 @@
+import numpy as np
+
+# Dormand-Prince 5(4) tableau, the same pair scipy uses for RK45
+C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+]
+B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+
+# Shampine-Reichelt modified Rosenbrock 2(3) pair (MATLAB's ode23s)
+D = 1 / (2 + np.sqrt(2))
+E32 = 6 + np.sqrt(2)
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10
+
+def _rms(x):
+    """Root-mean-square over every axis except the leading sample axis."""
+    return np.sqrt(np.mean(x.reshape(x.shape[0], -1) ** 2, axis=1))
+
+def _expand(x, ndim):
+    return x.reshape(x.shape + (1,) * (ndim - 1))
+
+def _initial_step(fun, t0, y0, f0, args, rtol, atol, order):
+    """Vectorized version of the Hairer-Wanner starting step heuristic used by scipy."""
+    scale = atol + np.abs(y0) * rtol
+    d0 = _rms(y0 / scale)
+    d1 = _rms(f0 / scale)
+    h0 = np.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6, 0.01 * d0 / np.maximum(d1, 1e-300))
+
+    y1 = y0 + _expand(h0, y0.ndim) * f0
+    f1 = fun(t0 + h0, y1, *args)
+    d2 = _rms((f1 - f0) / scale) / h0
+
+    dmax = np.maximum(d1, d2)
+    with np.errstate(divide="ignore"):
+        h1 = np.where(dmax <= 1e-15, np.maximum(1e-6, h0 * 1e-3), (0.01 / dmax) ** (1 / (order + 1)))
+    return np.minimum(100 * h0, h1)
+
+def _solve_blocks(W, b):
+    """Solves the 2x2 systems W x = b, with W of shape (..., 2, 2) and b of shape (..., 2)."""
+    a11, a12, a21, a22 = W[..., 0, 0], W[..., 0, 1], W[..., 1, 0], W[..., 1, 1]
+    det = a11 * a22 - a12 * a21
+    b1, b2 = b[..., 0], b[..., 1]
+    return np.stack([(a22 * b1 - a12 * b2) / det, (a11 * b2 - a21 * b1) / det], axis=-1)
+
+def _dopri5_step(fun, jac, t, y, f, h, args):
+    hx = _expand(h, y.ndim)
+    K = [f]
+    for c, a in zip(C[1:], A[1:]):
+        dy = sum(coef * k for coef, k in zip(a, K))
+        K.append(fun(t + c * h, y + hx * dy, *args))
+    y_new = y + hx * sum(b * k for b, k in zip(B, K))
+    f_new = fun(t + h, y_new, *args)
+    K.append(f_new)
+    return y_new, f_new, hx * sum(e * k for e, k in zip(E, K)), 6, 0
+
+def _rosenbrock23_step(fun, jac, t, y, f, h, args):
+    hx = _expand(h, y.ndim)
+    J = jac(t, y, *args)
+    W = np.eye(2) - (hx * D)[..., np.newaxis] * J
+
+    k1 = _solve_blocks(W, f)
+    f1 = fun(t + 0.5 * h, y + 0.5 * hx * k1, *args)
+    k2 = _solve_blocks(W, f1 - k1) + k1
+    y_new = y + hx * k2
+    f_new = fun(t + h, y_new, *args)
+    k3 = _solve_blocks(W, f_new - E32 * (k2 - f1) - 2 * (k1 - f))
+    return y_new, f_new, hx / 6 * (k1 - 2 * k2 + k3), 2, 1
+
+METHODS = {
+    "dopri5": (_dopri5_step, 4),
+    "rosenbrock23": (_rosenbrock23_step, 2),
+}
+
+def integrate(fun, y0, t_span, args=(), method="dopri5", jac=None, rtol=1e-3, atol=1e-6,
+              max_steps=100000, nonnegative=False):
+    """
+    Integrates many independent systems at once with an embedded pair. Every
+    sample keeps its own time, step size and error control, and samples that
+    reach t_span[1] drop out of later steps.
+    :param fun: Right-hand side fun(t, y, *args) acting on a batch, where t has
+        shape (n,) and y has shape (n, ...)
+    :param y0: Initial states of shape (N, ...), the leading axis indexes samples
+    :param t_span: Time span (start, end) shared by all samples
+    :param args: Extra per-sample arrays passed to fun, each with leading axis N
+    :param method: "dopri5" (explicit Dormand-Prince 5(4)) or "rosenbrock23"
+        (linearly implicit, for stiff systems whose last axis holds coupled pairs)
+    :param jac: Jacobian jac(t, y, *args) returning 2x2 blocks of shape
+        y.shape + (2,), required by "rosenbrock23"
+    :param rtol: Relative tolerance
+    :param atol: Absolute tolerance
+    :param max_steps: Maximum number of step attempts before giving up
+    :param nonnegative: Reject steps that take a non-negative component below
+        -atol, e.g. concentrations; large steps of a nonlinear system can pass
+        the error test while jumping into a region where the solution blows up
+    :return: Final states of shape (N, ...) and a dict of solver statistics
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown integration method: {method!r}")
+    if method == "rosenbrock23" and jac is None:
+        raise ValueError("rosenbrock23 requires a Jacobian")
+    step, order = METHODS[method]
+
+    t0, t_end = float(t_span[0]), float(t_span[1])
+    y = np.array(y0, dtype=float)
+    n = y.shape[0]
+    args = tuple(np.asarray(a) for a in args)
+    # A non-finite sample would reject every step until max_steps runs out
+    finite = np.isfinite(y.reshape(n, -1)).all(axis=1)
+    for a in args:
+        finite &= np.isfinite(a.reshape(n, -1)).all(axis=1)
+    if not finite.all():
+        raise ValueError(f"Non-finite initial state or parameters in samples {np.flatnonzero(~finite).tolist()}")
+    stats = {
+        "method": method,
+        "nfev": 0,
+        "njev": 0,
+        "n_accepted": np.zeros(n, dtype=int),
+        "n_rejected": np.zeros(n, dtype=int),
+    }
+    if n == 0 or t_end == t0:
+        return y, stats
+
+    t = np.full(n, t0)
+    f = fun(t, y, *args)
+    h = _initial_step(fun, t, y, f, args, rtol, atol, order)
+    stats["nfev"] += 2
+    active = np.arange(n)
+
+    for _ in range(max_steps):
+        if active.size == 0:
+            break
+
+        ya, fa, ta = y[active], f[active], t[active]
+        ha = np.minimum(h[active], t_end - ta)
+        y_new, f_new, error, nfev, njev = step(fun, jac, ta, ya, fa, ha, tuple(a[active] for a in args))
+        stats["nfev"] += nfev
+        stats["njev"] += njev
+
+        scale = atol + np.maximum(np.abs(ya), np.abs(y_new)) * rtol
+        err = _rms(error / scale)
+
+        accepted = err < 1
+        if nonnegative:
+            negative = (y_new < -atol) & (ya >= 0)
+            err = np.where(np.any(negative.reshape(negative.shape[0], -1), axis=1), np.nan, err)
+            accepted &= ~np.isnan(err)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = SAFETY * err ** (-1 / (order + 1))
+        factor = np.where(accepted, np.minimum(MAX_FACTOR, factor), np.maximum(MIN_FACTOR, factor))
+        factor[np.isnan(err)] = MIN_FACTOR
+        factor[np.isinf(factor)] = MAX_FACTOR
+        h[active] = ha * factor
+
+        done = active[accepted]
+        y[done] = y_new[accepted]
+        f[done] = f_new[accepted]
+        t[done] = np.where(ha[accepted] >= t_end - ta[accepted], t_end, ta[accepted] + ha[accepted])
+        stats["n_accepted"][done] += 1
+        stats["n_rejected"][active[~accepted]] += 1
+
+        active = active[t[active] < t_end]
+    else:
+        raise RuntimeError(f"{method} did not reach t={t_end} within {max_steps} steps")
+
+    return y, stats
+
+def dopri5(fun, y0, t_span, args=(), rtol=1e-3, atol=1e-6, max_steps=100000, nonnegative=False):
+    """Non-stiff batch integration, see integrate()."""
+    return integrate(fun, y0, t_span, args, method="dopri5", rtol=rtol, atol=atol, max_steps=max_steps,
+                     nonnegative=nonnegative)
+
+def rosenbrock23(fun, jac, y0, t_span, args=(), rtol=1e-3, atol=1e-6, max_steps=100000, nonnegative=False):
+    """Stiff batch integration with 2x2 block Jacobians, see integrate()."""
+    return integrate(fun, y0, t_span, args, method="rosenbrock23", jac=jac, rtol=rtol, atol=atol,
+                     max_steps=max_steps, nonnegative=nonnegative)
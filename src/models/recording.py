@@ -0,0 +1,75 @@
+import numpy as np
+
+class Recording:
+    def __init__(self, inputs, layer_sizes, n_points=50):
+        """
+        Decimated trajectories of every node captured during one forward pass.
+        Trajectories are stored as float32 in one (n_nodes, 2, n_points) buffer,
+        allocated when the first node is stored.
+        :param inputs: Network input vector of the pass
+        :param layer_sizes: Number of perceptrons per layer
+        :param n_points: Maximum number of time points kept per trajectory
+        """
+        self.inputs = np.asarray(inputs, dtype=float)
+        self.layer_sizes = list(layer_sizes)
+        self.n_points = n_points
+        self.offsets = np.concatenate([[0], np.cumsum(self.layer_sizes)]).astype(int)
+        n_nodes = int(self.offsets[-1])
+        self.times = None
+        self.trajectories = None
+        self._keep = None
+        self.thresholds = np.zeros(n_nodes, dtype=np.float32)
+        self.initial_z1 = np.zeros(n_nodes, dtype=np.float32)
+        self.outputs = np.zeros(n_nodes, dtype=np.int8)
+
+    @staticmethod
+    def decimation(n_samples, n_points):
+        """
+        Evenly spaced indices keeping at most n_points of n_samples, always including both ends.
+        """
+        return np.unique(np.linspace(0, n_samples - 1, min(n_points, n_samples)).round().astype(int))
+
+    def store(self, l, j, t, z, threshold, z1_0, output):
+        """
+        Records node j of layer l. All nodes share the time grid of the first one.
+        :param t: Solver output times
+        :param z: Solution of shape (2, len(t))
+        """
+        if self.times is None:
+            self._keep = self.decimation(len(t), self.n_points)
+            self.times = np.asarray(t, dtype=np.float32)[self._keep]
+            self.trajectories = np.zeros((int(self.offsets[-1]), 2, len(self._keep)), dtype=np.float32)
+        node = self.offsets[l] + j
+        self.trajectories[node] = np.asarray(z)[:, self._keep]
+        self.thresholds[node] = threshold
+        self.initial_z1[node] = z1_0
+        self.outputs[node] = output
+
+    def layer(self, l):
+        """
+        Trajectories of layer l, shape (n_perceptrons, 2, n_points).
+        """
+        return self.trajectories[self.offsets[l]:self.offsets[l + 1]]
+
+    def node(self, l, j):
+        """
+        Times and trajectory (2, n_points) of perceptron j of layer l.
+        """
+        return self.times, self.trajectories[self.offsets[l] + j]
+
+    def layer_inputs(self, l):
+        """
+        Initial Z1 of every perceptron of layer l.
+        """
+        return self.initial_z1[self.offsets[l]:self.offsets[l + 1]]
+
+    def layer_outputs(self, l):
+        return self.outputs[self.offsets[l]:self.offsets[l + 1]]
+
+    @property
+    def final_outputs(self):
+        return self.layer_outputs(len(self.layer_sizes) - 1).tolist()
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.times, self.trajectories, self.thresholds, self.initial_z1, self.outputs))
@@ -0,0 +1,177 @@
+import numpy as np
+from scipy.stats import norm, qmc
+
+from .biomolecular_layer import BiomolecularLayer
+
+# Rate constants perturbed per perceptron; inputs form one more group
+PARAMETERS = ("u", "v", "gamma", "phi")
+
+def wilson_interval(failures, n, confidence=0.95):
+    """
+    Wilson score interval of a binomial proportion.
+    :return: (low, high)
+    """
+    if n == 0:
+        return 0.0, 1.0
+    z = norm.ppf(0.5 + confidence / 2)
+    p = failures / n
+    center = (p + z ** 2 / (2 * n)) / (1 + z ** 2 / n)
+    half = z / (1 + z ** 2 / n) * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2))
+    return max(center - half, 0.0), min(center + half, 1.0)
+
+def ensemble_forward(network, params, inputs):
+    """
+    Final-layer outputs of an ensemble of perturbed networks in one vectorized pass.
+    :param network: BiomolecularNeuralNetwork providing the architecture, weights and thresholds
+    :param params: One dict per layer mapping "u", "v", "gamma" and "phi" to
+        arrays of shape (N, n_perceptrons)
+    :param inputs: Array of shape (N, n_inputs), one input vector per member
+    :return: Array of shape (N, n_outputs)
+    """
+    current_inputs = np.asarray(inputs, dtype=float)
+    for l, layer in enumerate(network.layers):
+        threshold = np.array([p.threshold for p in layer], dtype=float)
+        drive = network.fan_in(l, current_inputs)
+        u = params[l]["u"]
+        if network.input_mode == "u":
+            z1_0, u = np.zeros_like(drive), u * drive
+        else:
+            z1_0 = drive
+        fused = BiomolecularLayer(u, params[l]["v"], params[l]["gamma"], params[l]["phi"], threshold)
+        z, _ = fused.solve_batch(z1_0=z1_0, z2_0=0)
+        current_inputs = fused.activation(z[..., 0])
+    return current_inputs
+
+class RobustnessResult:
+    def __init__(self, rate, interval, n_samples, first_order, total_order, converged):
+        """
+        Outcome of analyze_robustness.
+        :param rate: Estimated misclassification probability
+        :param interval: Confidence interval (low, high) of the rate
+        :param n_samples: Number of perturbed networks behind the estimate
+        :param first_order: Group name mapped to its first-order Sobol index (Saltelli estimator)
+        :param total_order: Group name mapped to its total-effect Sobol index (Jansen estimator)
+        :param converged: Whether the interval reached the requested width
+        """
+        self.rate = rate
+        self.interval = interval
+        self.n_samples = n_samples
+        self.first_order = first_order
+        self.total_order = total_order
+        self.converged = converged
+
+    def __repr__(self):
+        return (f"RobustnessResult(rate={self.rate:.4g}, interval=({self.interval[0]:.4g}, "
+                f"{self.interval[1]:.4g}), n_samples={self.n_samples}, converged={self.converged})")
+
+def analyze_robustness(network, inputs, expected=None, parameter_cv=0.1, input_cv=0.0, sampler="sobol",
+                       batch_size=1024, max_samples=65536, tolerance=0.01, confidence=0.95,
+                       sensitivity=True, seed=None):
+    """
+    Monte Carlo misclassification rate of a network under lognormal parameter
+    and input uncertainty, with per-parameter Sobol sensitivity indices.
+
+    Perturbations come from a scrambled Sobol or Latin hypercube sequence and
+    each batch is evaluated as one vectorized ensemble. Sampling stops once the
+    Wilson interval of the rate is narrower than tolerance on each side.
+    :param network: BiomolecularNeuralNetwork at its nominal parameters
+    :param inputs: Nominal input vector
+    :param expected: Expected final-layer outputs; the nominal network's outputs by default
+    :param parameter_cv: Coefficient of variation of every u, v, gamma and phi,
+        a float or a dict keyed by parameter name
+    :param input_cv: Coefficient of variation of every input
+    :param sampler: "sobol" or "lhs"
+    :param batch_size: Perturbations per round. The Sobol sampler needs a power
+        of two and doubles its later rounds, so that the points drawn so far
+        always form a balanced power-of-two prefix of the sequence
+    :param max_samples: Upper bound on the number of perturbations; the Sobol
+        sampler stops at the last full round below it
+    :param tolerance: Target half-width of the confidence interval
+    :param sensitivity: Also estimate Sobol indices for the groups u, v, gamma,
+        phi and inputs, which costs one extra ensemble per group
+    :param seed: Seed of the scrambled sequence
+    :return: RobustnessResult
+    """
+    inputs = np.asarray(inputs, dtype=float)
+    sizes = [len(layer) for layer in network.layers]
+    nominal = [{name: np.array([getattr(p, name) for p in layer], dtype=float) for name in PARAMETERS}
+               for layer in network.layers]
+    if expected is None:
+        expected = network.forward_batch(inputs[np.newaxis])[0]
+    expected = np.asarray(expected)
+
+    cv = parameter_cv if isinstance(parameter_cv, dict) else dict.fromkeys(PARAMETERS, parameter_cv)
+    sigma = {name: np.sqrt(np.log1p(cv.get(name, 0.0) ** 2)) for name in PARAMETERS}
+    sigma["inputs"] = np.sqrt(np.log1p(input_cv ** 2))
+
+    # Columns of the unit hypercube belonging to each group
+    groups, start = {}, 0
+    for name in PARAMETERS:
+        groups[name] = np.arange(start, start + sum(sizes))
+        start += sum(sizes)
+    groups["inputs"] = np.arange(start, start + len(inputs))
+    dimension = start + len(inputs)
+    active = [name for name in groups if sigma[name] > 0]
+
+    engine = (qmc.Sobol(2 * dimension, scramble=True, seed=seed) if sampler == "sobol"
+              else qmc.LatinHypercube(2 * dimension, seed=seed) if sampler == "lhs" else None)
+    if engine is None:
+        raise ValueError(f"Unknown sampler: {sampler!r}")
+    if sampler == "sobol":
+        if batch_size < 1 or batch_size & (batch_size - 1):
+            raise ValueError(f"The Sobol sampler needs a power-of-two batch_size, got {batch_size}")
+        # Every round evaluates two blocks (A and B); shrink the block to fit max_samples
+        while batch_size > 1 and 2 * batch_size > max_samples:
+            batch_size //= 2
+
+    def misclassified(unit):
+        # Lognormal multiplicative factors from uniform samples
+        factors = np.exp(norm.ppf(np.clip(unit, 1e-12, 1 - 1e-12)) * np.concatenate(
+            [np.full(len(groups[name]), sigma[name]) for name in groups]))
+        params, offset = [], 0
+        for l, size in enumerate(sizes):
+            params.append({name: nominal[l][name] * factors[:, groups[name][offset:offset + size]]
+                           for name in PARAMETERS})
+            offset += size
+        outputs = ensemble_forward(network, params, inputs * factors[:, groups["inputs"]])
+        return np.any(outputs != expected, axis=1).astype(float)
+
+    f_a, f_b, f_ab = [], [], {name: [] for name in active}
+    n_samples, interval = 0, (0.0, 1.0)
+    while n_samples < max_samples:
+        if sampler == "sobol":
+            size = max(batch_size, engine.num_generated)
+            if n_samples and n_samples + 2 * size > max_samples:
+                break
+            unit = engine.random_base2(size.bit_length() - 1)
+        else:
+            unit = engine.random(min(batch_size, (max_samples - n_samples) // 2 or 1))
+        a, b = unit[:, :dimension], unit[:, dimension:]
+        f_a.append(misclassified(a))
+        f_b.append(misclassified(b))
+        if sensitivity:
+            for name in active:
+                ab = a.copy()
+                ab[:, groups[name]] = b[:, groups[name]]
+                f_ab[name].append(misclassified(ab))
+        n_samples += 2 * len(unit)
+        failures = sum(x.sum() for x in f_a) + sum(x.sum() for x in f_b)
+        interval = wilson_interval(failures, n_samples, confidence)
+        if (interval[1] - interval[0]) / 2 <= tolerance:
+            break
+
+    y_a, y_b = np.concatenate(f_a), np.concatenate(f_b)
+    rate = (y_a.sum() + y_b.sum()) / n_samples
+    variance = np.var(np.concatenate([y_a, y_b]))
+    first_order, total_order = {}, {}
+    if sensitivity:
+        for name in groups:
+            if name not in active or variance == 0:
+                first_order[name] = total_order[name] = 0.0
+                continue
+            y_ab = np.concatenate(f_ab[name])
+            first_order[name] = float(np.mean(y_b * (y_ab - y_a)) / variance)
+            total_order[name] = float(0.5 * np.mean((y_a - y_ab) ** 2) / variance)
+
+    converged = (interval[1] - interval[0]) / 2 <= tolerance
+    return RobustnessResult(float(rate), interval, n_samples, first_order, total_order, converged)
@@ -0,0 +1,345 @@
+"""
+Local inference server that classifies biomarker samples over HTTP, built on
+asyncio and the standard library.
+
+Concurrent requests are collected into micro-batches, closed when they reach
+max_batch_size samples or when the oldest request has waited max_delay
+seconds. Each batch runs as one vectorized forward_batch call on a worker pool,
+so the event loop never integrates an ODE itself.
+
+    POST /classify   {"biomarkers": [0.2, 1.5]}        -> {"label": 1, "outputs": [1]}
+                     {"biomarkers": [[0.2, 1.5], ...]}  -> {"labels": [...], "outputs": [[...], ...]}
+    GET  /metrics    queue depth, batch sizes and latency percentiles
+    GET  /health     {"status": "ok"}
+"""
+
+import asyncio
+import collections
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+# Network of the current worker process when the server uses a process pool
+_worker_network = None
+
+def _set_worker_network(network):
+    global _worker_network
+    _worker_network = network
+
+def _forward_in_worker(inputs):
+    return _worker_network.forward_batch(inputs)
+
+def _reject_constant(name):
+    raise ValueError(f"{name} is not valid JSON")
+
+class Metrics:
+    def __init__(self, window=10000):
+        """
+        Counters and latency samples of an InferenceServer.
+        :param window: Number of most recent requests kept for the latency percentiles
+        """
+        self.started = time.monotonic()
+        self.n_requests = 0
+        self.n_samples = 0
+        self.n_batches = 0
+        self.n_errors = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.in_flight = 0
+        self.latencies = collections.deque(maxlen=window)
+        self.queue_times = collections.deque(maxlen=window)
+        self.batch_sizes = collections.deque(maxlen=window)
+
+    @staticmethod
+    def _percentiles(samples):
+        if not samples:
+            return {"p50": None, "p90": None, "p99": None, "max": None}
+        values = np.percentile(np.fromiter(samples, dtype=float), [50, 90, 99, 100])
+        return dict(zip(("p50", "p90", "p99", "max"), (float(value) for value in values)))
+
+    def snapshot(self):
+        """
+        JSON-serializable view of the metrics; latencies are in seconds.
+        """
+        return {
+            "uptime": time.monotonic() - self.started,
+            "requests": self.n_requests,
+            "samples": self.n_samples,
+            "batches": self.n_batches,
+            "errors": self.n_errors,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "batches_in_flight": self.in_flight,
+            "mean_batch_size": float(np.mean(self.batch_sizes)) if self.batch_sizes else None,
+            "latency": self._percentiles(self.latencies),
+            "queue_time": self._percentiles(self.queue_times),
+        }
+
+class InferenceServer:
+    def __init__(self, network, host="127.0.0.1", port=0, max_batch_size=256, max_delay=0.005,
+                 workers=None, executor="thread", max_body=1 << 20, idle_timeout=5.0):
+        """
+        :param network: BiomolecularNeuralNetwork or CompactNetwork; anything with forward_batch
+        :param host: Interface to listen on; the default only accepts local connections
+        :param port: TCP port, 0 to pick a free one (see address)
+        :param max_batch_size: Samples after which a micro-batch is dispatched at once
+        :param max_delay: Seconds the first request of a batch waits for others to join it
+        :param workers: Size of the worker pool, which also bounds the batches in flight
+        :param executor: "thread" or "process"; a process pool receives the network once per worker
+        :param max_body: Largest accepted request body in bytes
+        :param idle_timeout: Seconds a keep-alive connection may wait for its next request
+        """
+        self.network = network
+        self.host = host
+        self.port = port
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.workers = workers or min(os.cpu_count() or 1, 4)
+        self.executor = executor
+        self.max_body = max_body
+        self.idle_timeout = idle_timeout
+        self.metrics = Metrics()
+        self._pool = None
+        self._server = None
+        self._queue = None
+        self._batcher = None
+        self._slots = None
+        self._tasks = set()
+        self._connections = set()
+
+    @property
+    def address(self):
+        """
+        (host, port) the server is listening on.
+        """
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        if self.executor == "process":
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_set_worker_network,
+                                             initargs=(self.network,))
+        elif self.executor == "thread":
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="dbnn-worker")
+        else:
+            raise ValueError(f"Unknown executor: {self.executor!r}")
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        return self
+
+    async def stop(self):
+        """
+        Stops accepting connections, closes the open ones, finishes the batches
+        in flight and shuts the pool down.
+        """
+        if self._server is not None:
+            self._server.close()
+            # Since Python 3.12 wait_closed() also waits for every client connection,
+            # so idle keep-alive connections are closed here rather than left to the client
+            for connection in list(self._connections):
+                connection.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            await asyncio.gather(self._batcher, return_exceptions=True)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Server stopped"))
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def classify(self, biomarkers):
+        """
+        Final-layer outputs of samples, computed as part of the next micro-batch.
+        :param biomarkers: One sample (n_inputs,) or several (n, n_inputs)
+        :return: Integer array of shape (n, n_outputs)
+        """
+        samples = np.atleast_2d(np.asarray(biomarkers, dtype=float))
+        if samples.ndim != 2 or samples.shape[1] == 0:
+            raise ValueError(f"Expected samples of shape (n, n_inputs), got {samples.shape}")
+        if not np.isfinite(samples).all():
+            # Rejected here, since a non-finite sample fails the whole micro-batch it joins
+            raise ValueError("Biomarker values must be finite")
+        if self.network.weights is None:
+            # Without weights only the first input drives the network
+            samples = samples[:, :1]
+        elif samples.shape[1] != self.network.weights[0].shape[1]:
+            raise ValueError(f"Expected {self.network.weights[0].shape[1]} inputs per sample, "
+                             f"got {samples.shape[1]}")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((samples, future, time.perf_counter()))
+        self.metrics.n_requests += 1
+        self.metrics.queue_depth += len(samples)
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        pending = None
+        while True:
+            batch = [pending or await self._queue.get()]
+            pending = None
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_delay
+            while size < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait() if self._queue.qsize() else \
+                        await asyncio.wait_for(self._queue.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+                if size + len(item[0]) > self.max_batch_size:
+                    # Would overflow the batch; it opens the next one instead
+                    pending = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        metrics = self.metrics
+        dispatched = time.perf_counter()
+        sizes = [len(samples) for samples, _, _ in batch]
+        metrics.queue_depth -= sum(sizes)
+        metrics.in_flight += 1
+        try:
+            for _, _, enqueued in batch:
+                metrics.queue_times.append(dispatched - enqueued)
+            inputs = np.concatenate([samples for samples, _, _ in batch])
+            if self.executor == "process":
+                outputs = await loop.run_in_executor(self._pool, _forward_in_worker, inputs)
+            else:
+                outputs = await loop.run_in_executor(self._pool, self.network.forward_batch, inputs)
+        except Exception as error:
+            metrics.n_errors += len(batch)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            done = time.perf_counter()
+            metrics.n_batches += 1
+            metrics.n_samples += len(inputs)
+            metrics.batch_sizes.append(len(inputs))
+            for (_, future, enqueued), part in zip(batch, np.split(outputs, np.cumsum(sizes)[:-1])):
+                metrics.latencies.append(done - enqueued)
+                if not future.done():
+                    future.set_result(part)
+        finally:
+            metrics.in_flight -= 1
+            self._slots.release()
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Cancelled by stop(); the connection is simply closed
+            pass
+        except ValueError as error:
+            self._write_response(writer, 400, {"error": str(error)}, keep_alive=False)
+        finally:
+            writer.close()
+            self._connections.discard(task)
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise ValueError("Malformed request line")
+        method, path, _ = parts
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > self.max_body:
+            raise ValueError(f"Request body larger than {self.max_body} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?")[0], headers, body
+
+    async def _route(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics.snapshot()
+        if path != "/classify":
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+        try:
+            biomarkers = json.loads(body, parse_constant=_reject_constant)["biomarkers"]
+            single = np.ndim(biomarkers) == 1
+            outputs = await self.classify(biomarkers)
+        except (ValueError, KeyError, TypeError) as error:
+            return 400, {"error": f"Expected a JSON body with a biomarkers array: {error}"}
+        except Exception as error:
+            return 500, {"error": str(error)}
+        if single:
+            return 200, {"label": int(outputs[0, 0]), "outputs": outputs[0].tolist()}
+        return 200, {"labels": outputs[:, 0].tolist(), "outputs": outputs.tolist()}
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        writer.write((f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                      f"Content-Type: application/json\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode() + body)
+
+def serve(network, host="127.0.0.1", port=8000, **options):
+    """
+    Runs an InferenceServer until interrupted.
+    """
+    server = InferenceServer(network, host=host, port=port, **options)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,88 @@
+import warnings
+
+import numpy as np
+
+class TransientWarning(RuntimeWarning):
+    """Raised when t_span is too short for the transient to have settled."""
+
+def _positive_root(a, b, c):
+    """
+    Non-negative root of a*z**2 + b*z - c = 0 for a >= 0, c >= 0, computed
+    without cancellation. Falls back to c / b when a == 0.
+    """
+    a, b, c = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (a, b, c)))
+    root = np.sqrt(b * b + 4 * a * c)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stable = 2 * c / (b + root)
+        direct = (root - b) / (2 * a)
+    return np.where(b > 0, stable, direct)
+
+def steady_state(u, v, gamma, phi):
+    """
+    Closed-form equilibrium of the titration system.
+
+    Subtracting the two rate equations gives z1 - z2 = (u - v) / phi, which
+    turns each steady-state condition into a quadratic in one species.
+    :param u: Production rate(s) of species Z1
+    :param v: Production rate(s) of species Z2
+    :param gamma: Titration rate(s)
+    :param phi: Decay rate(s), must be positive
+    :return: Equilibrium concentrations (z1, z2), broadcast over the inputs
+    """
+    u, v, gamma, phi = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (u, v, gamma, phi)))
+    if np.any(phi <= 0):
+        raise ValueError("Steady state requires a positive decay rate phi")
+
+    d = (u - v) / phi
+    z1 = _positive_root(gamma, phi - gamma * d, u)
+    z2 = _positive_root(gamma, phi + gamma * d, v)
+    return z1, z2
+
+def settled(u, v, gamma, phi, z1_0=0, z2_0=0, t_span=(0, 10), rtol=1e-3, atol=1e-6):
+    """
+    Estimates whether the trajectory starting at (z1_0, z2_0) has reached the
+    equilibrium by the end of t_span.
+
+    The difference z1 - z2 relaxes exactly at rate phi and the other mode is
+    faster, so the remaining deviation is bounded by |initial deviation| * exp(-phi * T).
+    :return: Boolean array, True where the residual is within rtol * |z1| + atol
+    """
+    z1, z2 = steady_state(u, v, gamma, phi)
+    deviation = np.maximum(np.abs(np.asarray(z1_0, dtype=float) - z1),
+                           np.abs(np.asarray(z2_0, dtype=float) - z2))
+    residual = deviation * np.exp(-np.asarray(phi, dtype=float) * (t_span[1] - t_span[0]))
+    return residual <= rtol * np.abs(z1) + atol
+
+def warn_unsettled(is_settled, t_span, stacklevel=3):
+    """
+    Emits a TransientWarning naming the perceptrons that have not settled.
+    """
+    unsettled = np.flatnonzero(~np.asarray(is_settled))
+    if unsettled.size:
+        warnings.warn(
+            f"t_span={tuple(t_span)} is too short for the transient to settle "
+            f"(perceptrons {unsettled.tolist()}); steady-state values may differ "
+            f"from the integrated solution",
+            TransientWarning,
+            stacklevel=stacklevel,
+        )
+
+def z1_bounds(u, v, gamma, phi, z1, z2):
+    """
+    Interval that provably contains Z1 for all future times, starting from (z1, z2).
+
+    w = z1 - z2 relaxes monotonically towards (u - v) / phi, and dz1/dt is
+    increasing in w while z1 >= 0, so Z1 is squeezed between the solutions of
+    the scalar equation with w frozen at either end of its range. Each of those
+    moves monotonically towards its own positive equilibrium.
+    Only valid for z1 >= 0 with non-negative u and gamma and positive phi.
+    :return: Arrays (lower, upper)
+    """
+    u, v, gamma, phi, z1, z2 = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (u, v, gamma, phi, z1, z2))
+    )
+    w = z1 - z2
+    d = (u - v) / phi
+    z1_lo = _positive_root(gamma, phi - gamma * np.minimum(w, d), u)
+    z1_hi = _positive_root(gamma, phi - gamma * np.maximum(w, d), u)
+    return np.minimum(z1, z1_lo), np.maximum(z1, z1_hi)
@@ -0,0 +1,156 @@
+import numpy as np
+
+# Stoichiometry of the five reactions on (Z1, Z2):
+# production of Z1, production of Z2, titration Z1 + Z2 -> 0, decay of Z1, decay of Z2
+STOICHIOMETRY = np.array([[1, 0], [0, 1], [-1, -1], [-1, 0], [0, -1]])
+
+def propensities(u, v, gamma, phi, n1, n2, volume):
+    """
+    Reaction propensities for copy numbers n1, n2 in a cell of the given volume.
+    :return: Array of shape n1.shape + (5,)
+    """
+    u, v, gamma, phi, n1, n2 = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (u, v, gamma, phi, n1, n2))
+    )
+    return np.stack([
+        u * volume,
+        v * volume,
+        gamma / volume * n1 * n2,
+        phi * n1,
+        phi * n2,
+    ], axis=-1)
+
+def gillespie(u, v, gamma, phi, n1_0, n2_0, t_span=(0, 10), volume=100, rng=None):
+    """
+    Exact stochastic simulation (Gillespie direct method) of the perceptrons of
+    one cell, for small systems.
+    :param u, v, gamma, phi: Rate constants, one per perceptron
+    :param n1_0: Initial copy numbers of Z1, one per perceptron
+    :param n2_0: Initial copy numbers of Z2, one per perceptron
+    :param t_span: Time span (start, end)
+    :param volume: Cell volume converting concentrations to copy numbers
+    :param rng: numpy Generator
+    :return: Event times and copy numbers of shape (n_events + 1, n_perceptrons, 2)
+    """
+    rng = np.random.default_rng(rng)
+    u, v, gamma, phi = (np.atleast_1d(np.asarray(x, dtype=float)) for x in (u, v, gamma, phi))
+    state = np.stack(np.broadcast_arrays(np.atleast_1d(n1_0), np.atleast_1d(n2_0)), axis=-1)
+    state = np.maximum(np.rint(state), 0).astype(np.int64)
+    t = float(t_span[0])
+    times, states = [t], [state.copy()]
+
+    while True:
+        a = propensities(u, v, gamma, phi, state[:, 0], state[:, 1], volume).ravel()
+        total = a.sum()
+        if total <= 0:
+            break
+        t += rng.exponential(1 / total)
+        if t > t_span[1]:
+            break
+        reaction = np.searchsorted(np.cumsum(a), rng.uniform(0, total), side="right")
+        reaction = min(reaction, a.size - 1)
+        state[reaction // 5] += STOICHIOMETRY[reaction % 5]
+        times.append(t)
+        states.append(state.copy())
+
+    return np.array(times), np.array(states)
+
+def tau_leap(u, v, gamma, phi, n1_0, n2_0, t_span=(0, 10), volume=100, tau=0.01, rng=None):
+    """
+    Vectorized tau-leaping over many independent cells at once.
+
+    Reaction counts over each leap are Poisson distributed and clipped so that
+    copy numbers never become negative.
+    :param u, v, gamma, phi: Rate constants, broadcastable to (n_cells, n_perceptrons)
+    :param n1_0: Initial copy numbers of Z1 of shape (n_cells, n_perceptrons)
+    :param n2_0: Initial copy numbers of Z2, broadcastable to n1_0
+    :param t_span: Time span (start, end)
+    :param volume: Cell volume converting concentrations to copy numbers
+    :param tau: Leap size
+    :param rng: numpy Generator
+    :return: Final copy numbers of shape (n_cells, n_perceptrons, 2)
+    """
+    rng = np.random.default_rng(rng)
+    n1, n2 = np.broadcast_arrays(np.asarray(n1_0), np.asarray(n2_0))
+    n1 = np.maximum(np.rint(n1), 0).astype(np.int64)
+    n2 = np.maximum(np.rint(n2), 0).astype(np.int64)
+    n_steps = max(int(np.ceil((t_span[1] - t_span[0]) / tau)), 1)
+    dt = (t_span[1] - t_span[0]) / n_steps
+
+    for _ in range(n_steps):
+        k = rng.poisson(propensities(u, v, gamma, phi, n1, n2, volume) * dt)
+        titrated = np.minimum(k[..., 2], np.minimum(n1, n2))
+        decay1 = np.minimum(k[..., 3], n1 - titrated)
+        decay2 = np.minimum(k[..., 4], n2 - titrated)
+        n1 = n1 + k[..., 0] - titrated - decay1
+        n2 = n2 + k[..., 1] - titrated - decay2
+
+    return np.stack([n1, n2], axis=-1)
+
+class StochasticSimulator:
+    def __init__(self, network, volume=100, n_cells=1000, method="tau", tau=0.01, t_span=(0, 10)):
+        """
+        Simulates a BiomolecularNeuralNetwork with molecular noise in a population of cells.
+        :param network: BiomolecularNeuralNetwork
+        :param volume: Cell volume; concentrations are copy numbers divided by it
+        :param n_cells: Number of independent cells
+        :param method: "tau" for vectorized tau-leaping, "ssa" for the exact
+            Gillespie algorithm cell by cell
+        :param tau: Leap size for tau-leaping
+        :param t_span: Time span of every layer
+        """
+        if method not in ("tau", "ssa"):
+            raise ValueError(f"Unknown stochastic method: {method!r}")
+        self.network = network
+        self.volume = volume
+        self.n_cells = n_cells
+        self.method = method
+        self.tau = tau
+        self.t_span = t_span
+
+    def _simulate_layer(self, l, z1_0, u, rng):
+        layer = self.network.layers[l]
+        v, gamma, phi = (np.array([getattr(p, name) for p in layer], dtype=float) for name in ("v", "gamma", "phi"))
+        n1_0 = z1_0 * self.volume
+        if self.method == "tau":
+            return tau_leap(u, v, gamma, phi, n1_0, 0, self.t_span, self.volume, self.tau, rng)
+
+        # One independent stream per cell keeps results reproducible whatever the cell order
+        streams = rng.spawn(self.n_cells)
+        return np.array([
+            gillespie(u[c], v, gamma, phi, n1_0[c], 0, self.t_span, self.volume, streams[c])[1][-1]
+            for c in range(self.n_cells)
+        ])
+
+    def simulate(self, inputs, seed=None):
+        """
+        Runs the network stage by stage in every cell; each cell passes its own
+        0/1 outputs to the next layer.
+        :param inputs: Network input vector, shared by all cells
+        :param seed: Seed making the run reproducible
+        :return: List with one (n_cells, n_perceptrons) array of 0/1 outputs per layer
+        """
+        rng = np.random.default_rng(seed)
+        current_inputs = np.tile(np.asarray(inputs, dtype=float), (self.n_cells, 1))
+        outputs = []
+        for l, layer in enumerate(self.network.layers):
+            z1_0, u = self.network.layer_inputs(l, current_inputs)
+            counts = self._simulate_layer(l, np.asarray(z1_0), np.asarray(u), rng)
+            thresholds = np.array([p.threshold for p in layer], dtype=float)
+            current_inputs = (counts[..., 0] / self.volume >= thresholds).astype(int)
+            outputs.append(current_inputs)
+        return outputs
+
+    def activation_probabilities(self, inputs, seed=None):
+        """
+        Fraction of cells in which each perceptron is active.
+        :return: List with one (n_perceptrons,) array per layer
+        """
+        return [layer_outputs.mean(axis=0) for layer_outputs in self.simulate(inputs, seed)]
+
+    def output_probabilities(self, inputs, seed=None):
+        """
+        Fraction of cells in which each network output is active.
+        :return: Array of shape (n_outputs,)
+        """
+        return self.activation_probabilities(inputs, seed)[-1]
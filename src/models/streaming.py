@@ -0,0 +1,89 @@
+import itertools
+
+import numpy as np
+
+from .coupled import CoupledNetwork
+
+class BiosensorStream:
+    def __init__(self, network, interval=1.0, t0=0.0, method="BDF", rtol=1e-3, atol=1e-6):
+        """
+        Stateful biosensor that integrates continuously as readings arrive.
+
+        The network is compiled into a CoupledNetwork. Each reading drives Z1
+        production over the interval that ends at its timestamp, and every
+        perceptron carries its (z1, z2) state over to the next reading instead of
+        restarting from zero.
+        :param network: BiomolecularNeuralNetwork or CoupledNetwork
+        :param interval: Default time between readings when push() gets no timestamp
+        :param t0: Time at which the sensor starts, with all concentrations at zero
+        :param method: Implicit solve_ivp method
+        :param rtol: Relative tolerance of the solver
+        :param atol: Absolute tolerance of the solver
+        """
+        self.network = network if isinstance(network, CoupledNetwork) else CoupledNetwork.from_network(network)
+        self.interval = interval
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.t0 = t0
+        self.reset()
+
+    def reset(self):
+        """
+        Returns the sensor to zero concentrations at t0.
+        """
+        self.t = self.t0
+        self.z = np.zeros(2 * self.network.n_nodes)
+        self.nfev = 0
+
+    @property
+    def z1(self):
+        """
+        Current Z1 concentration of every perceptron, one array per layer.
+        """
+        return [self.z[self.network.layer_slice(l)] for l in range(len(self.network.layers))]
+
+    @property
+    def z2(self):
+        """
+        Current Z2 concentration of every perceptron, one array per layer.
+        """
+        z2 = self.z[self.network.n_nodes:]
+        return [z2[self.network.layer_slice(l)] for l in range(len(self.network.layers))]
+
+    def outputs(self):
+        """
+        Current activation of the final layer.
+        :return: List of 0/1 outputs
+        """
+        return self.network.layers[-1].activation(self.z1[-1]).tolist()
+
+    def push(self, reading, t=None):
+        """
+        Integrates the interval since the previous reading and updates the state.
+        :param reading: Biomarker concentrations measured over the new interval
+        :param t: Timestamp of the reading; defaults to the previous one plus interval
+        :return: List of final layer outputs at time t
+        """
+        t = self.t + self.interval if t is None else float(t)
+        if t < self.t:
+            raise ValueError(f"Reading at t={t} is older than the stream time t={self.t}")
+        if t > self.t:
+            times, sol = self.network.solve(reading, t_span=(self.t, t), t_eval=[t], method=self.method,
+                                            rtol=self.rtol, atol=self.atol, z0=self.z)
+            self.z = sol[:, :, -1].ravel()
+            self.nfev += self.network.solver_stats["nfev"]
+            self.t = t
+        return self.outputs()
+
+def stream(network, readings, times=None, **kwargs):
+    """
+    Generator classifying a time series of readings with one BiosensorStream.
+    :param readings: Iterable of biomarker vectors
+    :param times: Optional iterable of timestamps, one per reading
+    :return: Yields the final layer outputs after every reading
+    """
+    sensor = BiosensorStream(network, **kwargs)
+    times = itertools.repeat(None) if times is None else times
+    for reading, t in zip(readings, times):
+        yield sensor.push(reading, t)
@@ -0,0 +1,148 @@
+import hashlib
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+def grid(**axes):
+    """
+    Cartesian product of parameter values.
+    :param axes: Parameter name mapped to the list of values to sweep
+    :return: List of parameter dicts, one per design
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+def sample(bounds, n, seed=None):
+    """
+    Uniform random designs inside per-parameter bounds.
+    :param bounds: Parameter name mapped to a (low, high) tuple
+    :param n: Number of designs
+    :param seed: Seed of the random generator
+    :return: List of parameter dicts, one per design
+    """
+    rng = np.random.default_rng(seed)
+    columns = {name: rng.uniform(low, high, size=n) for name, (low, high) in bounds.items()}
+    return [{name: float(values[i]) for name, values in columns.items()} for i in range(n)]
+
+class SweepResult:
+    def __init__(self, params, outputs, labels=None):
+        """
+        Columnar results of a parameter sweep.
+        :param params: Parameter name mapped to an array with one value per design
+        :param outputs: Array of shape (n_designs, n_samples) with the classification
+            of every sample under every design
+        :param labels: Optional expected classification of every sample
+        """
+        self.params = params
+        self.outputs = outputs
+        self.labels = None if labels is None else np.asarray(labels)
+
+    def __len__(self):
+        return self.outputs.shape[0]
+
+    @property
+    def accuracy(self):
+        """
+        Fraction of correctly classified samples per design.
+        """
+        if self.labels is None:
+            raise ValueError("Accuracy requires labels")
+        return np.mean(self.outputs == self.labels, axis=1)
+
+    def best(self, k=1):
+        """
+        Parameter dicts of the k most accurate designs.
+        """
+        order = np.argsort(-self.accuracy, kind="stable")[:k]
+        return [{name: values[i].item() for name, values in self.params.items()} for i in order]
+
+def _evaluate_chunk(template, designs, inputs):
+    return np.array([template(**design).classify_biosensor_batch(inputs) for design in designs], dtype=np.int8)
+
+def _panel_digest(inputs):
+    """Fingerprint of a biomarker panel, so a checkpoint is only resumed with the panel it was written for."""
+    return hashlib.sha256(np.ascontiguousarray(inputs).tobytes() + str(inputs.shape).encode()).hexdigest()
+
+def _save_checkpoint(path, params, inputs, outputs, done):
+    temporary = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(temporary, outputs=outputs, done=done, inputs_digest=_panel_digest(inputs),
+             **{f"param_{name}": values for name, values in params.items()})
+    os.replace(temporary, path)
+
+def _load_checkpoint(path, params, inputs, outputs, done):
+    with np.load(path) as data:
+        same = ("inputs_digest" in data.files and str(data["inputs_digest"]) == _panel_digest(inputs)
+                and data["outputs"].shape == outputs.shape)
+        for name, values in params.items():
+            same = same and f"param_{name}" in data.files and np.array_equal(data[f"param_{name}"], values)
+        if not same:
+            raise ValueError(f"Checkpoint {path} belongs to a different sweep")
+        if data["done"].shape != done.shape:
+            raise ValueError(f"Checkpoint {path} was written with a different chunk size")
+        outputs[...] = data["outputs"]
+        done[...] = data["done"]
+
+def run_sweep(template, designs, inputs, labels=None, processes=None, chunk_size=16,
+              checkpoint=None, checkpoint_interval=5.0):
+    """
+    Evaluates every design on a biomarker panel, sharded across a process pool.
+    :param template: Picklable callable building a BiomolecularNeuralNetwork from
+        the keyword arguments of one design
+    :param designs: Parameter dict per design, e.g. from grid() or sample()
+    :param inputs: Biomarker panel of shape (n_samples, n_biomarkers)
+    :param labels: Optional expected classification of every sample
+    :param processes: Number of worker processes; 0 evaluates in this process
+    :param chunk_size: Number of designs per scheduled task
+    :param checkpoint: Optional .npz path; completed chunks are saved there and
+        skipped when the sweep is run again
+    :param checkpoint_interval: Minimum number of seconds between checkpoint writes
+    :return: SweepResult
+    """
+    designs = list(designs)
+    inputs = np.atleast_2d(np.asarray(inputs, dtype=float))
+    names = list(designs[0]) if designs else []
+    params = {name: np.array([design[name] for design in designs]) for name in names}
+    outputs = np.full((len(designs), inputs.shape[0]), -1, dtype=np.int8)
+    chunks = [range(start, min(start + chunk_size, len(designs))) for start in range(0, len(designs), chunk_size)]
+    done = np.zeros(len(chunks), dtype=bool)
+
+    if checkpoint is not None and os.path.exists(checkpoint):
+        _load_checkpoint(checkpoint, params, inputs, outputs, done)
+    pending = [i for i in range(len(chunks)) if not done[i]]
+    last_saved = time.monotonic()
+
+    def store(i, chunk_outputs):
+        nonlocal last_saved
+        outputs[chunks[i].start:chunks[i].stop] = chunk_outputs
+        done[i] = True
+        if checkpoint is not None and time.monotonic() - last_saved >= checkpoint_interval:
+            _save_checkpoint(checkpoint, params, inputs, outputs, done)
+            last_saved = time.monotonic()
+
+    try:
+        if processes == 0:
+            for i in pending:
+                store(i, _evaluate_chunk(template, [designs[j] for j in chunks[i]], inputs))
+        else:
+            workers = processes or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Keep a bounded window of chunks in flight so huge grids are not queued at once
+                window = 2 * workers
+                queue = iter(pending)
+                running = {}
+                while True:
+                    for i in itertools.islice(queue, window - len(running)):
+                        running[pool.submit(_evaluate_chunk, template, [designs[j] for j in chunks[i]], inputs)] = i
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        store(running.pop(future), future.result())
+    finally:
+        # Also reached on errors and interrupts, so finished chunks are never lost
+        if checkpoint is not None:
+            _save_checkpoint(checkpoint, params, inputs, outputs, done)
+    return SweepResult(params, outputs, labels)
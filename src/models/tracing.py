@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+
+# Right-hand-side evaluations per step attempt of the explicit Runge-Kutta solvers;
+# each also spends 2 evaluations on the initial step size selection
+RK_EVALUATIONS = {"RK45": 6, "RK23": 3}
+
+def rejected_steps(method, nfev, n_steps):
+    """
+    Number of rejected steps of an explicit Runge-Kutta solve, recovered from
+    its evaluation count, or None for solvers where it cannot be derived.
+    """
+    if method not in RK_EVALUATIONS:
+        return None
+    return max((nfev - 2) // RK_EVALUATIONS[method] - n_steps, 0)
+
+class _Span:
+    __slots__ = ("tracer", "record", "start")
+
+    def __init__(self, tracer, record):
+        self.tracer = tracer
+        self.record = record
+
+    def __enter__(self):
+        self.tracer._stack.append(self.record)
+        self.start = time.perf_counter_ns()
+        return self.record["args"]
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer._stack.pop()
+        self.record["start"] = (self.start - self.tracer.origin) / 1e3
+        self.record["duration"] = (end - self.start) / 1e3
+        self.tracer.records.append(self.record)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc):
+        return False
+
+class NullTracer:
+    """
+    Tracer that records nothing; the default of every traced call.
+    """
+    _span = _NullSpan()
+
+    def __bool__(self):
+        return False
+
+    def span(self, name, **args):
+        return self._span
+
+NULL_TRACER = NullTracer()
+
+class Tracer:
+    def __init__(self):
+        """
+        Collects nested timing spans from BiomolecularNeuralNetwork.forward and
+        BiomolecularPerceptron.solve. Every span stores its name, its stack of
+        enclosing span names, start and duration in microseconds, and args such
+        as layer and perceptron indices and solver statistics.
+        """
+        self.origin = time.perf_counter_ns()
+        self.records = []
+        self._stack = []
+
+    def __bool__(self):
+        return True
+
+    def span(self, name, **args):
+        """
+        Context manager timing one span; it yields the span's args dict so the
+        caller can attach results such as solver statistics.
+        """
+        stack = tuple(record["name"] for record in self._stack) + (name,)
+        return _Span(self, {"name": name, "stack": stack, "args": args})
+
+    def clear(self):
+        self.records = []
+
+    def per_layer(self):
+        """
+        Wall time and solver totals of every layer span.
+        :return: Dict mapping layer index to wall_time (seconds), n_perceptrons,
+            nfev, n_rejected and the set of methods used
+        """
+        summary = {}
+        for record in self.records:
+            args = record["args"]
+            if record["name"].startswith("layer"):
+                summary.setdefault(args["layer"], {"wall_time": 0.0, "n_perceptrons": 0, "nfev": 0,
+                                                   "n_rejected": 0, "methods": set()})
+                summary[args["layer"]]["wall_time"] += record["duration"] / 1e6
+        for record in self.records:
+            args = record["args"]
+            if record["name"].startswith("perceptron") and args.get("layer") in summary:
+                layer = summary[args["layer"]]
+                layer["n_perceptrons"] += 1
+                layer["nfev"] += args.get("nfev", 0)
+                layer["n_rejected"] += args.get("n_rejected") or 0
+                if "method" in args:
+                    layer["methods"].add(args["method"])
+        return summary
+
+    def chrome_trace(self, path=None):
+        """
+        Spans as Chrome trace events, viewable in chrome://tracing or Perfetto.
+        :param path: Optional JSON file to write
+        :return: Trace dict
+        """
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [{
+            "name": record["name"],
+            "cat": record["stack"][0],
+            "ph": "X",
+            "ts": record["start"],
+            "dur": record["duration"],
+            "pid": pid,
+            "tid": tid,
+            "args": {name: value for name, value in record["args"].items() if _is_json(value)},
+        } for record in sorted(self.records, key=lambda record: record["start"])]
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(trace, f)
+        return trace
+
+    def collapsed_stacks(self, path=None):
+        """
+        Self time of every span stack in the collapsed format read by
+        flamegraph.pl and speedscope ("forward;layer 0;perceptron 1 <microseconds>").
+        :param path: Optional text file to write
+        :return: List of lines
+        """
+        self_time = {}
+        for record in self.records:
+            self_time[record["stack"]] = self_time.get(record["stack"], 0.0) + record["duration"]
+            if len(record["stack"]) > 1:
+                parent = record["stack"][:-1]
+                self_time[parent] = self_time.get(parent, 0.0) - record["duration"]
+        lines = [f"{';'.join(stack)} {max(int(round(duration)), 0)}" for stack, duration in self_time.items()]
+        if path is not None:
+            with open(path, "w") as f:
+                f.write("\n".join(lines) + "\n")
+        return lines
+
+def _is_json(value):
+    return isinstance(value, (str, int, float, bool)) or value is None
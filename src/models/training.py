@@ -0,0 +1,163 @@
+import numpy as np
+
+from .integrators import dopri5
+
+# Parameters whose sensitivities are integrated, in the order of the augmented state
+SENSITIVITIES = ("u", "v", "gamma", "phi", "z1_0")
+
+# Parameters fitted by fit(); the rate constants are optimized in log space to stay positive
+RATES = ("u", "v", "gamma", "phi")
+
+def _sensitivity_equations(t, y, u, v, gamma, phi):
+    """
+    Titration equations augmented with their forward sensitivities.
+    :param y: Array of shape (N, P, 6, 2) holding (z1, z2) followed by its
+        derivatives with respect to each entry of SENSITIVITIES
+    """
+    z1, z2 = y[..., 0, 0], y[..., 0, 1]
+    titration = gamma * z1 * z2
+    dz = np.stack([u - titration - phi * z1, v - titration - phi * z2], axis=-1)
+
+    s1, s2 = y[..., 1:, 0], y[..., 1:, 1]
+    a, b = (-gamma * z2 - phi)[..., np.newaxis], (-gamma * z1)[..., np.newaxis]
+    c, d = (-gamma * z2)[..., np.newaxis], (-gamma * z1 - phi)[..., np.newaxis]
+    ds = np.stack([a * s1 + b * s2, c * s1 + d * s2], axis=-1)
+
+    # Explicit parameter dependence of the right-hand side
+    ones, zeros = np.ones_like(z1), np.zeros_like(z1)
+    ds += np.stack([
+        np.stack([ones, zeros], axis=-1),
+        np.stack([zeros, ones], axis=-1),
+        np.stack([-z1 * z2, -z1 * z2], axis=-1),
+        np.stack([-z1, -z2], axis=-1),
+        np.stack([zeros, zeros], axis=-1),
+    ], axis=-2)
+    return np.concatenate([dz[..., np.newaxis, :], ds], axis=-2)
+
+def forward_sensitivities(layer, z1_0, u=None, t_span=(0, 10), rtol=1e-3, atol=1e-6):
+    """
+    Final Z1 of every sample and perceptron together with its derivatives,
+    obtained by integrating the forward-sensitivity equations alongside the model.
+    :param layer: BiomolecularLayer
+    :param z1_0: Initial Z1 of shape (N, n_perceptrons)
+    :param u: Optional Z1 production rates of shape (N, n_perceptrons); layer.u by default
+    :param t_span: Time span (start, end)
+    :return: Final Z1 of shape (N, n_perceptrons) and a dict mapping each entry
+        of SENSITIVITIES to dZ1/dparameter of the same shape
+    """
+    z1_0 = np.asarray(z1_0, dtype=float)
+    shape = z1_0.shape
+    u = layer.u if u is None else u
+    params = tuple(np.broadcast_to(p, shape) for p in (u, layer.v, layer.gamma, layer.phi))
+
+    y0 = np.zeros(shape + (1 + len(SENSITIVITIES), 2))
+    y0[..., 0, 0] = z1_0
+    y0[..., 1 + SENSITIVITIES.index("z1_0"), 0] = 1.0
+    y, _ = dopri5(_sensitivity_equations, y0, t_span, args=params, rtol=rtol, atol=atol)
+    return y[..., 0, 0], {name: y[..., 1 + i, 0] for i, name in enumerate(SENSITIVITIES)}
+
+def _sigmoid(x):
+    return 0.5 * (1 + np.tanh(0.5 * x))
+
+def _weight_matrix(network, l, n_inputs):
+    # Dense fan-in matrix, including the implicit "first input only" wiring
+    if network.weights is None:
+        weight = np.zeros((len(network.layers[l]), n_inputs))
+        weight[:, 0] = 1.0
+        return weight
+    weight = network.weights[l]
+    return weight.toarray() if hasattr(weight, "toarray") else np.asarray(weight, dtype=float)
+
+def loss_and_gradient(network, inputs, labels, temperature=0.25, t_span=(0, 10), rtol=1e-3, atol=1e-6):
+    """
+    Binary cross-entropy of the network's smoothed outputs and its gradient.
+
+    Every hard activation is replaced by sigmoid((z1 - threshold) / temperature),
+    so outputs of one layer feed the next as soft values.
+    :param network: BiomolecularNeuralNetwork
+    :param inputs: Array of shape (N, n_inputs)
+    :param labels: Expected outputs of shape (N,) or (N, n_outputs)
+    :param temperature: Width of the smooth activation
+    :return: Loss and a list with one dict per layer mapping "u", "v", "gamma",
+        "phi" and "threshold" to the gradient, one value per perceptron
+    """
+    from .biomolecular_layer import BiomolecularLayer
+
+    current_inputs = np.atleast_2d(np.asarray(inputs, dtype=float))
+    labels = np.asarray(labels, dtype=float).reshape(current_inputs.shape[0], -1)
+    tape = []
+
+    for l, layer in enumerate(network.layers):
+        fused = BiomolecularLayer.from_perceptrons(layer)
+        drive = network.fan_in(l, current_inputs)
+        z1_0, u = network.layer_inputs(l, current_inputs)
+        z1, sens = forward_sensitivities(fused, z1_0, u, t_span, rtol, atol)
+        logits = (z1 - fused.threshold) / temperature
+        activation = _sigmoid(logits)
+        tape.append((fused, drive, sens, activation, current_inputs.shape[1]))
+        current_inputs = activation
+
+    # Cross-entropy in terms of the output logits stays exact when the sigmoid saturates
+    loss = np.mean(np.logaddexp(0, logits) - labels * logits)
+    dz1 = (current_inputs - labels) / labels.size / temperature
+
+    gradients = []
+    for l in reversed(range(len(network.layers))):
+        fused, drive, sens, activation, n_inputs = tape[l]
+        if l < len(network.layers) - 1:
+            dz1 = delta * activation * (1 - activation) / temperature
+        if network.input_mode == "u":
+            dz1_ddrive = sens["u"] * fused.u
+            du = np.sum(dz1 * sens["u"] * drive, axis=0)
+        else:
+            dz1_ddrive = sens["z1_0"]
+            du = np.sum(dz1 * sens["u"], axis=0)
+        gradients.append({
+            "u": du,
+            "v": np.sum(dz1 * sens["v"], axis=0),
+            "gamma": np.sum(dz1 * sens["gamma"], axis=0),
+            "phi": np.sum(dz1 * sens["phi"], axis=0),
+            "threshold": -np.sum(dz1, axis=0),
+        })
+        delta = (dz1 * dz1_ddrive) @ _weight_matrix(network, l, n_inputs)
+
+    return loss, gradients[::-1]
+
+def fit(network, inputs, labels, epochs=200, learning_rate=0.05, temperature=0.25, t_span=(0, 10),
+        callback=None):
+    """
+    Fits u, v, gamma, phi and threshold of every perceptron to labelled data
+    with Adam, updating the network's perceptrons in place.
+    :param network: BiomolecularNeuralNetwork
+    :param inputs: Array of shape (N, n_inputs)
+    :param labels: Expected outputs of shape (N,) or (N, n_outputs)
+    :param epochs: Number of full-batch gradient steps
+    :param learning_rate: Adam step size (log space for rates, linear for thresholds)
+    :param temperature: Width of the smooth activation
+    :param callback: Optional callable(epoch, loss) called after every step
+    :return: List of losses, one per epoch
+    """
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    names = RATES + ("threshold",)
+    moments = [{name: (np.zeros(len(layer)), np.zeros(len(layer))) for name in names} for layer in network.layers]
+    history = []
+
+    for epoch in range(1, epochs + 1):
+        loss, gradients = loss_and_gradient(network, inputs, labels, temperature, t_span)
+        history.append(loss)
+        for layer, gradient, moment in zip(network.layers, gradients, moments):
+            for name in names:
+                values = np.array([getattr(p, name) for p in layer], dtype=float)
+                grad = gradient[name] * values if name in RATES else gradient[name]
+                m, v = moment[name]
+                m = beta1 * m + (1 - beta1) * grad
+                v = beta2 * v + (1 - beta2) * grad ** 2
+                moment[name] = (m, v)
+                step = learning_rate * (m / (1 - beta1 ** epoch)) / (np.sqrt(v / (1 - beta2 ** epoch)) + eps)
+                values = values * np.exp(-step) if name in RATES else values - step
+                for perceptron, value in zip(layer, values):
+                    setattr(perceptron, name, float(value))
+        if callback is not None:
+            callback(epoch, loss)
+
+    return history
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+def plot_node(ax, times, z, threshold, title):
+    """
+    Z1/Z2 trajectories of one perceptron against its threshold.
+    """
+    ax.plot(times, z[0], label="Z1 (active)")
+    ax.plot(times, z[1], label="Z2 (sequestered)")
+    ax.axhline(y=threshold, color='r', linestyle='--', label='Threshold')
+    ax.set_xlabel("Time")
+    ax.set_ylabel("Concentration")
+    ax.set_title(title)
+    ax.legend()
+
+def plot_recording(recording, figure=None):
+    """
+    One subplot per perceptron of a recorded forward pass, layers as rows.
+    Uses a plain Figure on the Agg canvas, so no display or pyplot state is needed.
+    :param recording: Recording from BiomolecularNeuralNetwork.forward(record=True)
+    :param figure: Optional Figure to draw into
+    :return: Figure
+    """
+    n_layers = len(recording.layer_sizes)
+    max_perceptrons = max(recording.layer_sizes)
+    if figure is None:
+        figure = Figure(figsize=(5 * max_perceptrons, 5 * n_layers))
+        FigureCanvasAgg(figure)
+
+    for l, size in enumerate(recording.layer_sizes):
+        for j in range(size):
+            ax = figure.add_subplot(n_layers, max_perceptrons, l * max_perceptrons + j + 1)
+            times, z = recording.node(l, j)
+            node = recording.offsets[l] + j
+            plot_node(ax, times, z, recording.thresholds[node],
+                      f"Layer {l + 1}, Perceptron {j + 1}\nZ1(0) = {recording.initial_z1[node]:.3g}, "
+                      f"output {recording.outputs[node]}")
+
+    figure.suptitle(f"Network Dynamics for Inputs: {recording.inputs.tolist()} -> {recording.final_outputs}")
+    figure.tight_layout()
+    return figure
+
+def save_recording(recording, path, dpi=100):
+    """
+    Renders a recording straight to an image file.
+    """
+    plot_recording(recording).savefig(path, dpi=dpi)
+    return path
+
+def _render_scenario(network, inputs, path, mode, record_points, dpi):
+    outputs = network.forward(inputs, mode=mode, record=True, record_points=record_points)
+    save_recording(network.recording, path, dpi=dpi)
+    return path, outputs
+
+def _paths(directory, n, fmt):
+    os.makedirs(directory, exist_ok=True)
+    return [os.path.join(directory, f"scenario_{i:04d}.{fmt}") for i in range(n)]
+
+def render_recordings(recordings, directory, fmt="png", processes=None, dpi=100):
+    """
+    Renders existing recordings to files across a process pool.
+    :param recordings: Sequence of Recording objects
+    :param directory: Output directory, created if missing
+    :param processes: Number of worker processes; 0 renders in this process
+    :return: List of written paths
+    """
+    recordings = list(recordings)
+    paths = _paths(directory, len(recordings), fmt)
+    if processes == 0 or not recordings:
+        return [save_recording(recording, path, dpi) for recording, path in zip(recordings, paths)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(save_recording, recordings, paths, [dpi] * len(paths)))
+
+def render_scenarios(network, scenarios, directory, mode="ode", fmt="png", processes=None,
+                     record_points=50, dpi=100):
+    """
+    Runs one recorded forward pass per input scenario and renders it to a file,
+    each worker solving and drawing its own scenarios so nothing is solved twice.
+    :param network: Picklable BiomolecularNeuralNetwork
+    :param scenarios: Sequence of network input vectors
+    :param directory: Output directory, created if missing
+    :param mode: Forward mode, "ode" or "fused"
+    :param processes: Number of worker processes; 0 renders in this process
+    :return: List of (path, outputs) tuples in scenario order
+    """
+    scenarios = [list(inputs) for inputs in scenarios]
+    paths = _paths(directory, len(scenarios), fmt)
+    args = [(network, inputs, path, mode, record_points, dpi) for inputs, path in zip(scenarios, paths)]
+    if processes == 0 or not args:
+        return [_render_scenario(*arg) for arg in args]
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_scenario, *zip(*args), chunksize=max(len(args) // (4 * workers), 1)))
@@ -0,0 +1,39 @@
+"""
+Networks shared by the test modules.
+"""
+
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+
+def create_biosensor_network(u=15.0):
+    """Creates a BNN configured for biosensor detection"""
+    # Layer 1: Process individual biomarkers with clinically relevant thresholds
+    layer1 = [
+        BiomolecularPerceptron(u=u, v=3, gamma=1.0, phi=0.3, threshold=1.8),  # PSA detector (>2.0 ng/mL suspicious)
+        BiomolecularPerceptron(u=u, v=3, gamma=1.0, phi=0.3, threshold=1.8),  # HER2 detector (>2.0 overexpression)
+        BiomolecularPerceptron(u=u, v=3, gamma=1.0, phi=0.3, threshold=1.8),  # IL-6 detector (>2.0 pg/mL inflammatory)
+    ]
+
+    # Layer 2: Pattern detection - activates if any biomarker is significantly elevated
+    layer2 = [
+        BiomolecularPerceptron(u=12, v=3, gamma=1.0, phi=0.3, threshold=0.5)  # Final classifier
+    ]
+
+    return BiomolecularNeuralNetwork(layers=[layer1, layer2])
+
+def make_network(layer_sizes=(3, 1)):
+    """Small unweighted network whose last layer has a single output"""
+    hidden = lambda: BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0)
+    output = lambda: BiomolecularPerceptron(u=6, v=3, gamma=2, phi=0.5, threshold=1.2)
+    return BiomolecularNeuralNetwork(layers=[
+        [hidden() for _ in range(size)] for size in layer_sizes[:-1]
+    ] + [[output() for _ in range(layer_sizes[-1])]])
+
+def make_weighted_network():
+    """Small weighted network driven through u"""
+    perceptron = lambda u, threshold: BiomolecularPerceptron(u=u, v=3, gamma=1.0, phi=0.3, threshold=threshold)
+    return BiomolecularNeuralNetwork(
+        layers=[[perceptron(1, 1.8), perceptron(1, 1.8)], [perceptron(2, 0.5)]],
+        weights=[np.array([[1.0, 0.5], [0.3, 1.0]]), np.array([[0.5, 0.5]])],
+        input_mode="u",
+    )
@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import pytest
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.biomolecular_layer import BiomolecularLayer
+from src.models.integrators import dopri5, integrate, rosenbrock23
+
+@pytest.mark.parametrize("method", ["dopri5", "rosenbrock23"])
+def test_integrator_exponential_decay(method):
+    rates = np.array([0.1, 1.0, 5.0])
+    y0 = np.ones((3, 2))
+    fun = lambda t, y, k: -k[:, np.newaxis] * y
+    jac = lambda t, y, k: -k[:, np.newaxis, np.newaxis] * np.eye(2)
+    if method == "dopri5":
+        y, stats = dopri5(fun, y0, (0, 2), args=(rates,), rtol=1e-6, atol=1e-9)
+    else:
+        y, stats = rosenbrock23(fun, jac, y0, (0, 2), args=(rates,), rtol=1e-6, atol=1e-9)
+    np.testing.assert_allclose(y[:, 0], np.exp(-2 * rates), rtol=1e-4, atol=1e-7)
+    assert stats["n_accepted"].shape == (3,)
+
+@pytest.mark.parametrize("method", ["dopri5", "rosenbrock23"])
+@pytest.mark.parametrize("bad", [np.nan, np.inf])
+def test_integrator_rejects_non_finite(method, bad):
+    fun = lambda t, y, k: -k[:, np.newaxis] * y
+    jac = lambda t, y, k: -k[:, np.newaxis, np.newaxis] * np.eye(2)
+    with pytest.raises(ValueError, match=r"samples \[1\]"):
+        integrate(fun, np.array([[1.0, 1.0], [bad, 1.0]]), (0, 2), args=(np.ones(2),), method=method, jac=jac)
+    with pytest.raises(ValueError, match=r"samples \[0\]"):
+        integrate(fun, np.ones((2, 2)), (0, 2), args=(np.array([bad, 1.0]),), method=method, jac=jac)
+
+def test_nonnegative_rejects_overshoot():
+    # A large accepted RK45 step jumps to negative concentrations here, after which the system blows up
+    layer = BiomolecularLayer(u=[10.26529907], v=[4.93322549], gamma=[0.88464166], phi=[0.36624793])
+    z, stats = layer.solve_batch(z1_0=np.array([1.0]))
+    np.testing.assert_allclose(z[0, 0], [14.5827, 0.37209], rtol=1e-3)
+    assert stats["dopri5"]["n_rejected"][0] > 0
+
+class TestBatchForward(unittest.TestCase):
+    def setUp(self):
+        self.layer1 = [
+            BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0),
+            BiomolecularPerceptron(u=4, v=2, gamma=1.5, phi=0.4, threshold=0.8)
+        ]
+        self.layer2 = [
+            BiomolecularPerceptron(u=6, v=3, gamma=2, phi=0.5, threshold=1.2)
+        ]
+        self.network = BiomolecularNeuralNetwork(layers=[self.layer1, self.layer2])
+
+    def test_layer_batch_matches_solve(self):
+        layer = BiomolecularLayer.from_perceptrons(self.layer1)
+        z, stats = layer.solve_batch(z1_0=np.array([0.0, 1.0, 3.0]))
+        self.assertEqual(z.shape, (3, 2, 2))
+        for i, z1_0 in enumerate([0.0, 1.0, 3.0]):
+            t, sol = layer.solve(z1_0=z1_0, z2_0=0)
+            np.testing.assert_allclose(z[i].T, sol[:, :, -1], rtol=1e-2, atol=1e-3)
+
+    def test_forward_batch_matches_forward(self):
+        inputs = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [-1.0, -1.0]])
+        outputs = self.network.forward_batch(inputs)
+        self.assertEqual(outputs.shape, (5, 1))
+        for row, output in zip(inputs, outputs):
+            self.assertEqual(self.network.forward(list(row)), output.tolist())
+
+    def test_classify_biosensor_batch(self):
+        inputs = np.random.default_rng(0).uniform(0, 5, size=(50, 2))
+        results = self.network.classify_biosensor_batch(inputs, chunk_size=16)
+        self.assertEqual(results.shape, (50,))
+        self.assertTrue(np.isin(results, [0, 1]).all())
+
+    def test_stiff_samples(self):
+        """Huge inputs are routed to the stiff integrator instead of stalling"""
+        layer = BiomolecularLayer.from_perceptrons(self.layer1)
+        z, stats = layer.solve_batch(z1_0=np.array([1.0, 1e6]))
+        self.assertIn("rosenbrock23", stats)
+        self.assertLess(stats["rosenbrock23"]["n_accepted"].max(), 1000)
+        self.assertTrue(np.isfinite(z).all())
+
+    def test_non_finite_sample(self):
+        """A NaN sample fails at once instead of exhausting the step budget"""
+        with self.assertRaises(ValueError):
+            self.network.forward_batch(np.array([[1.0, 0.0], [np.nan, 1.0]]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+from benchmarks.bench import compare, count_rhs, measure
+from src.models.biomolecular_perceptron import BiomolecularPerceptron
+
+class TestBenchmarks(unittest.TestCase):
+    def test_compare_flags_regressions(self):
+        baseline = {"solve": {"wall_time": 0.1, "rhs_evals": 200, "peak_memory": 1e6}}
+        self.assertEqual(compare({"solve": {"wall_time": 0.12, "rhs_evals": 205, "peak_memory": 1.1e6}}, baseline), [])
+
+        regressions = compare({"solve": {"wall_time": 0.3, "rhs_evals": 400, "peak_memory": 1e6}}, baseline)
+        self.assertEqual(len(regressions), 2)
+        self.assertIn("wall_time", regressions[0])
+        self.assertIn("rhs_evals", regressions[1])
+
+    def test_compare_ignores_noise_and_new_cases(self):
+        baseline = {"fast": {"wall_time": 0.001, "peak_memory": 1000}}
+        results = {"fast": {"wall_time": 0.003, "peak_memory": 5000}, "new": {"wall_time": 1.0}}
+        self.assertEqual(compare(results, baseline), [])
+        self.assertEqual(len(compare(results, baseline, noise_floors={"wall_time": 0, "peak_memory": 0})), 2)
+
+    def test_measure_counts_rhs(self):
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        metrics = measure(lambda: perceptron.solve(z1_0=1.0), repeat=1)
+        self.assertEqual(metrics["rhs_evals"], perceptron.solver_stats["nfev"])
+        self.assertGreater(metrics["peak_memory"], 0)
+
+        with count_rhs() as counter:
+            perceptron.solve(z1_0=1.0, mode="steady", t_span=(0, 50))
+        self.assertEqual(counter["rhs_evals"], 0)
+        self.assertNotIn("wrapper", BiomolecularPerceptron.equations.__name__)
+
+if __name__ == '__main__':
+    unittest.main()
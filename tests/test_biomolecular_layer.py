@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import pytest
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.biomolecular_layer import BiomolecularLayer
+
+@pytest.mark.parametrize("layer_sizes", [
+    ([1, 1]),
+    ([2, 1]),
+    ([3, 2, 1]),
+    ([4, 3, 2, 1])
+])
+def test_fused_matches_per_node(layer_sizes):
+    layers = [
+        [BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0) for _ in range(size)]
+        for size in layer_sizes
+    ]
+    network = BiomolecularNeuralNetwork(layers=layers)
+    inputs = [1.0, 1.0]
+    assert network.forward(inputs, mode="fused") == network.forward(inputs)
+
+class TestBiomolecularLayer(unittest.TestCase):
+    def setUp(self):
+        self.perceptrons = [
+            BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0),
+            BiomolecularPerceptron(u=4, v=2, gamma=1.5, phi=0.4, threshold=0.8),
+            BiomolecularPerceptron(u=2, v=3, gamma=20, phi=0.5, threshold=5.0),
+        ]
+        self.layer = BiomolecularLayer.from_perceptrons(self.perceptrons)
+
+    def test_packing(self):
+        self.assertEqual(len(self.layer), 3)
+        np.testing.assert_array_equal(self.layer.u, [5, 4, 2])
+        np.testing.assert_array_equal(self.layer.threshold, [1.0, 0.8, 5.0])
+
+    def test_solve_shape(self):
+        t, sol = self.layer.solve(z1_0=[0.5, 1.0, 0.0], z2_0=0, t_span=(0, 1))
+        self.assertEqual(len(t), 100)
+        self.assertEqual(sol.shape, (2, 3, 100))
+        np.testing.assert_almost_equal(sol[0, :, 0], [0.5, 1.0, 0.0])
+        np.testing.assert_almost_equal(sol[1, :, 0], 0)
+
+    def test_matches_individual_solves(self):
+        t, sol = self.layer.solve(z1_0=1.0, z2_0=0)
+        for i, perceptron in enumerate(self.perceptrons):
+            _, single = perceptron.solve(z1_0=1.0, z2_0=0)
+            np.testing.assert_allclose(sol[:, i, -1], single[:, -1], rtol=1e-2, atol=1e-3)
+
+    def test_jacobian(self):
+        z = np.random.default_rng(0).uniform(0, 2, size=6)
+        eps = 1e-6
+        numeric = np.column_stack([
+            (self.layer.equations(0, z + eps * e) - self.layer.equations(0, z - eps * e)) / (2 * eps)
+            for e in np.eye(6)
+        ])
+        np.testing.assert_allclose(self.layer.jacobian(0, z).toarray(), numeric, atol=1e-6)
+
+    def test_implicit_methods_match(self):
+        _, reference = self.layer.solve(z1_0=1.0, z2_0=0)
+        for method in ("BDF", "Radau", "LSODA", "auto"):
+            _, sol = self.layer.solve(z1_0=1.0, z2_0=0, method=method)
+            np.testing.assert_allclose(sol[:, :, -1], reference[:, :, -1], rtol=1e-2, atol=1e-3)
+
+    def test_fused_auto_handles_stiff_node(self):
+        network = BiomolecularNeuralNetwork(layers=[self.perceptrons])
+        self.assertEqual(self.layer.select_method(z1_0=1e6), "LSODA")
+        self.assertEqual(network.forward([1e6, 0], mode="fused", method="auto"),
+                         network.forward([1e6, 0], method="auto"))
+
+    def test_activation(self):
+        np.testing.assert_array_equal(self.layer.activation([1.0, 0.5, 6.0]), [1, 0, 1])
+
+    def test_unknown_mode(self):
+        network = BiomolecularNeuralNetwork(layers=[self.perceptrons])
+        with self.assertRaises(ValueError):
+            network.forward([1.0, 1.0], mode="bogus")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -82,5 +82,35 @@ class TestBiomolecularPerceptron(unittest.TestCase):
         
         np.testing.assert_array_almost_equal(sol1, sol2)
 
+    def test_jacobian(self):
+        """Test analytic Jacobian against finite differences"""
+        z = np.array([1.3, 0.7])
+        eps = 1e-6
+        numeric = np.column_stack([
+            (np.array(self.model.equations(0, z + eps * e)) - np.array(self.model.equations(0, z - eps * e))) / (2 * eps)
+            for e in np.eye(2)
+        ])
+        np.testing.assert_allclose(self.model.jacobian(0, z), numeric, rtol=1e-6)
+
+    def test_auto_method_selection(self):
+        """Test stiff parameter regimes switch to an implicit solver"""
+        self.assertEqual(BiomolecularPerceptron(u=1, v=1, gamma=0.1, phi=0.5).select_method(), "RK45")
+        self.assertEqual(BiomolecularPerceptron(u=2, v=3, gamma=20, phi=0.5).select_method(), "LSODA")
+        self.assertEqual(self.model.select_method(z1_0=1e6), "LSODA")
+
+    def test_auto_method_stiff_input(self):
+        """Test huge inputs are integrated with few steps"""
+        t, sol = self.model.solve(z1_0=1e6, method="auto")
+        stats = self.model.solver_stats
+        self.assertEqual(stats["method"], "LSODA")
+        self.assertEqual(stats["status"], 0)
+        self.assertLess(stats["n_steps"], 1000)
+        self.assertTrue(np.all(np.isfinite(sol)))
+
+    def test_solver_stats(self):
+        self.model.solve(method="auto")
+        for key in ("method", "n_steps", "nfev", "njev", "nlu", "status"):
+            self.assertIn(key, self.model.solver_stats)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -14,23 +14,7 @@ BNN Layers:
 
 import pytest
 import numpy as np
-from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
-
-def create_biosensor_network():
-    """Creates a BNN configured for biosensor detection"""
-    # Layer 1: Process individual biomarkers with clinically relevant thresholds
-    layer1 = [
-        BiomolecularPerceptron(u=15, v=3, gamma=1.0, phi=0.3, threshold=1.8),  # PSA detector (>2.0 ng/mL suspicious)
-        BiomolecularPerceptron(u=15, v=3, gamma=1.0, phi=0.3, threshold=1.8),  # HER2 detector (>2.0 overexpression)
-        BiomolecularPerceptron(u=15, v=3, gamma=1.0, phi=0.3, threshold=1.8),  # IL-6 detector (>2.0 pg/mL inflammatory)
-    ]
-    
-    # Layer 2: Pattern detection - activates if any biomarker is significantly elevated
-    layer2 = [
-        BiomolecularPerceptron(u=12, v=3, gamma=1.0, phi=0.3, threshold=0.5)  # Final classifier
-    ]
-    
-    return BiomolecularNeuralNetwork(layers=[layer1, layer2])
+from tests.networks import create_biosensor_network
 
 @pytest.mark.parametrize("biomarkers, expected", [
     ([0.0, 0.0], 0),  # Healthy - low levels of all markers
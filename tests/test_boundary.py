@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import numpy as np
+from src.models.boundary import bisect, bisect_rays, map_boundary
+from tests.networks import make_weighted_network
+
+def disk(x):
+    return (np.sum((x - 0.3) ** 2, axis=1) < 0.2).astype(int)
+
+def grid_points(bounds, n):
+    axes = [np.linspace(low, high, n) for low, high in bounds]
+    return np.stack(np.meshgrid(*axes), axis=-1).reshape(-1, len(bounds))
+
+class TestBoundary(unittest.TestCase):
+    def test_matches_dense_grid_with_fewer_solves(self):
+        bounds = [(-1, 1), (-1, 1)]
+        boundary = map_boundary(disk, bounds, max_depth=10)
+        points = grid_points(bounds, 1000)
+
+        self.assertGreater(np.mean(boundary.predict(points) == disk(points)), 0.999)
+        self.assertLess(boundary.n_evaluations, 0.02 * len(points))
+        self.assertEqual(boundary.n_batches, 10 - 2 + 1)  # One batch per refinement level
+
+        radius = np.linalg.norm(boundary.points - 0.3, axis=1)
+        self.assertTrue(np.all(np.abs(radius - np.sqrt(0.2)) <= boundary.errors + 1e-12))
+
+    def test_bisection_refines_points(self):
+        boundary = map_boundary(disk, [(-1, 1), (-1, 1)], max_depth=5, tol=1e-8)
+        radius = np.linalg.norm(boundary.points - 0.3, axis=1)
+        np.testing.assert_allclose(radius, np.sqrt(0.2), atol=1e-8)
+        self.assertTrue(np.all(boundary.errors <= 1e-8))
+
+    def test_bisect_rays(self):
+        points, errors = bisect_rays(disk, [0.3, 0.3], [[1, 0], [0, -1]], length=2.0, tol=1e-9)
+        np.testing.assert_allclose(points, [[0.3 + np.sqrt(0.2), 0.3], [0.3, 0.3 - np.sqrt(0.2)]], atol=1e-9)
+
+        points, errors = bisect(disk, [[2.0, 2.0]], [[3.0, 3.0]])
+        self.assertTrue(np.isnan(points).all() and np.isnan(errors).all())
+
+    def test_network_boundary(self):
+        network = make_weighted_network()
+        bounds = [(0, 10), (0, 10)]
+        boundary = map_boundary(network.classify_biosensor_batch, bounds, max_depth=7)
+        points = grid_points(bounds, 100)
+
+        self.assertGreater(np.mean(boundary.predict(points) == network.classify_biosensor_batch(points)), 0.99)
+        self.assertLess(boundary.n_evaluations, (2 ** 7 + 1) ** 2 / 10)
+        self.assertGreater(len(boundary.boundary_cells), 0)
+
+if __name__ == '__main__':
+    unittest.main()
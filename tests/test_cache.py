@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import unittest
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.cache import SolutionCache
+
+class TestSolutionCache(unittest.TestCase):
+    def test_identical_perceptrons_hit(self):
+        cache = SolutionCache()
+        layers = [
+            [BiomolecularPerceptron(u=15, v=3, gamma=1.0, phi=0.3, threshold=1.8) for _ in range(3)],
+            [BiomolecularPerceptron(u=12, v=3, gamma=1.0, phi=0.3, threshold=0.5)],
+        ]
+        network = BiomolecularNeuralNetwork(layers=layers, cache=cache)
+        uncached = BiomolecularNeuralNetwork(layers=layers)
+
+        self.assertEqual(network.forward([5.0, 0.0]), uncached.forward([5.0, 0.0]))
+        self.assertEqual(cache.stats()["misses"], 2)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+        network.forward([5.0, 0.0])
+        self.assertEqual(cache.stats()["hits"], 6)
+
+    def test_cached_solution_matches(self):
+        cache = SolutionCache()
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        t1, sol1 = perceptron.solve(z1_0=1.0, cache=cache)
+        sol1[0][0] = -99  # Callers must not be able to corrupt the cache
+        t2, sol2 = perceptron.solve(z1_0=1.0, cache=cache)
+        self.assertEqual(sol2[0][0], 1.0)
+        self.assertEqual(perceptron.solver_stats["method"], "RK45")
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_key_distinguishes_tolerances(self):
+        cache = SolutionCache()
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        perceptron.solve(cache=cache)
+        perceptron.solve(rtol=1e-6, cache=cache)
+        perceptron.solve(t_span=(0, 5), cache=cache)
+        self.assertEqual(cache.stats()["misses"], 3)
+
+    def test_quantization(self):
+        cache = SolutionCache(digits=6)
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        perceptron.solve(z1_0=1.0, cache=cache)
+        perceptron.solve(z1_0=1.0 + 1e-12, cache=cache)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_lru_eviction(self):
+        cache = SolutionCache(maxsize=2)
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        for z1_0 in (0.0, 1.0, 2.0):
+            perceptron.solve(z1_0=z1_0, cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        perceptron.solve(z1_0=0.0, cache=cache)
+        self.assertEqual(cache.stats()["hits"], 0)
+
+    def test_disk_tier(self):
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        with tempfile.TemporaryDirectory() as path:
+            t1, sol1 = perceptron.solve(z1_0=1.0, method="auto", cache=SolutionCache(path=path))
+            cache = SolutionCache(path=path)
+            t2, sol2 = perceptron.solve(z1_0=1.0, method="auto", cache=cache)
+        np.testing.assert_array_equal(sol1, sol2)
+        self.assertEqual(cache.stats()["disk_hits"], 1)
+        self.assertEqual(perceptron.solver_stats["method"], "RK45")
+
+if __name__ == '__main__':
+    unittest.main()
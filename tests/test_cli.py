@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import io
+import subprocess
+import tempfile
+
+import numpy as np
+
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.cli import main
+from src.models.compact import CompactNetwork
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.network = BiomolecularNeuralNetwork([
+            [BiomolecularPerceptron(u=1.0, v=0.5, gamma=1.0, phi=0.5, threshold=0.5),
+             BiomolecularPerceptron(u=0.5, v=1.0, gamma=1.0, phi=0.5, threshold=0.3)],
+            [BiomolecularPerceptron(u=1.0, v=0.8, gamma=1.0, phi=0.5, threshold=0.4)],
+        ], weights=[np.eye(2), np.array([[1.0, 1.0]])])
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        self.network_path = os.path.join(self.path, "net.npz")
+        CompactNetwork.from_network(self.network).save(self.network_path)
+        self.inputs = np.random.default_rng(0).uniform(0, 3, size=(37, 2))
+        self.expected = self.network.classify_biosensor_batch(self.inputs)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cli(self, *argv):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            status = main(list(argv))
+        return status, stderr.getvalue()
+
+    def test_npy_to_npy_in_chunks(self):
+        np.save(os.path.join(self.path, "data.npy"), self.inputs)
+        output = os.path.join(self.path, "labels.npy")
+        status, message = self.run_cli("classify", "--network", self.network_path, "--input",
+                                       os.path.join(self.path, "data.npy"), "--output", output,
+                                       "--chunk-size", "8")
+        self.assertEqual(status, 0)
+        np.testing.assert_array_equal(np.load(output), self.expected)
+        self.assertIn("Classified 37 samples", message)
+
+    def test_csv_with_header_to_npy_and_csv(self):
+        data = os.path.join(self.path, "data.csv")
+        with open(data, "w") as f:
+            f.write("marker_a,marker_b\n")
+            f.writelines(f"{a},{b}\n" for a, b in self.inputs)
+
+        output = os.path.join(self.path, "labels.npy")
+        status, _ = self.run_cli("classify", "--network", self.network_path, "--input", data,
+                                 "--output", output, "--chunk-size", "5")
+        self.assertEqual(status, 0)
+        np.testing.assert_array_equal(np.load(output), self.expected)
+
+        output = os.path.join(self.path, "labels.csv")
+        status, _ = self.run_cli("classify", "--network", self.network_path, "--input", data,
+                                 "--output", output, "--chunk-size", "5", "--all-outputs", "-q")
+        self.assertEqual(status, 0)
+        np.testing.assert_array_equal(np.loadtxt(output, delimiter=",", ndmin=2)[:, 0], self.expected)
+
+    def test_missing_input_reports_error(self):
+        status, message = self.run_cli("classify", "--network", self.network_path, "--input",
+                                       os.path.join(self.path, "missing.npy"))
+        self.assertEqual(status, 1)
+        self.assertIn("dbnn: error", message)
+
+    def test_non_finite_row_reports_error(self):
+        data = os.path.join(self.path, "data.csv")
+        with open(data, "w") as f:
+            f.write("1.0,2.0\nnan,1\n")
+        status, message = self.run_cli("classify", "--network", self.network_path, "--input", data,
+                                       "--output", os.path.join(self.path, "labels.csv"))
+        self.assertEqual(status, 1)
+        self.assertIn("line 2: non-finite value", message)
+
+        inputs = self.inputs.copy()
+        inputs[10, 1] = np.inf
+        np.save(os.path.join(self.path, "data.npy"), inputs)
+        status, message = self.run_cli("classify", "--network", self.network_path, "--input",
+                                       os.path.join(self.path, "data.npy"), "--output", "-", "--chunk-size", "8")
+        self.assertEqual(status, 1)
+        self.assertIn("row 10: non-finite value", message)
+
+    def test_help_and_classify_do_not_import_scipy(self):
+        np.save(os.path.join(self.path, "data.npy"), self.inputs)
+        script = (
+            "import sys\n"
+            "from models.cli import main\n"
+            "try:\n"
+            "    main(['--help'])\n"
+            "except SystemExit as exit:\n"
+            "    assert exit.code == 0\n"
+            f"assert main(['classify', '--network', {self.network_path!r}, '--input', "
+            f"{os.path.join(self.path, 'data.npy')!r}, '-q']) == 0\n"
+            "print(sorted(m for m in sys.modules if m.split('.')[0] == 'scipy'))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                                env={**os.environ, "PYTHONPATH": SRC}, check=True)
+        self.assertTrue(result.stdout.strip().endswith("[]"), result.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
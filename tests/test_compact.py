@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from scipy import sparse
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.compact import CompactNetwork, DesignLibrary
+from tests.networks import create_biosensor_network
+
+class TestCompactNetwork(unittest.TestCase):
+    def test_perceptrons_have_no_dict(self):
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        self.assertFalse(hasattr(perceptron, "__dict__"))
+        with self.assertRaises(AttributeError):
+            perceptron.extra = 1
+        self.assertEqual(pickle.loads(pickle.dumps(perceptron)).phi, 0.5)
+
+    def test_views_share_arrays(self):
+        compact = CompactNetwork.from_network(create_biosensor_network())
+        view = compact.perceptron(0, 1)
+        self.assertIsInstance(view, BiomolecularPerceptron)
+        self.assertFalse(hasattr(view, "__dict__"))
+        self.assertEqual(view.u, 15.0)
+
+        view.u = 20.0
+        self.assertEqual(compact.layers[0].u[1], 20.0)
+        compact.layers[0].threshold[1] = 2.5
+        self.assertEqual(view.threshold, 2.5)
+
+        t, sol = view.solve(z1_0=1.0)
+        np.testing.assert_allclose(sol, BiomolecularPerceptron(20.0, 3, 1.0, 0.3).solve(z1_0=1.0)[1])
+
+    def test_forward_matches_network(self):
+        network = create_biosensor_network()
+        compact = CompactNetwork.from_network(network)
+        inputs = np.random.default_rng(0).uniform(0, 6, size=(200, 2))
+        np.testing.assert_array_equal(compact.classify_biosensor_batch(inputs), network.classify_biosensor_batch(inputs))
+        self.assertEqual(compact.network().forward([5.0, 0.0]), network.forward([5.0, 0.0]))
+
+    def test_save_load(self):
+        layers = CompactNetwork.from_network(create_biosensor_network()).layers
+        weights = [sparse.csr_matrix(np.full((3, 2), 0.5)), np.ones((1, 3))]
+        compact = CompactNetwork(layers, weights=weights, input_mode="u")
+        with tempfile.TemporaryDirectory() as path:
+            compact.save(os.path.join(path, "network.npz"))
+            loaded = CompactNetwork.load(os.path.join(path, "network.npz"))
+        self.assertEqual(loaded.input_mode, "u")
+        self.assertTrue(sparse.issparse(loaded.weights[0]))
+        np.testing.assert_array_equal(loaded.weights[0].toarray(), 0.5)
+        np.testing.assert_array_equal(loaded.layers[1].u, [12.0])
+
+        with tempfile.TemporaryDirectory() as path:
+            CompactNetwork.from_network(create_biosensor_network()).save(os.path.join(path, "legacy.npz"))
+            self.assertIsNone(CompactNetwork.load(os.path.join(path, "legacy.npz")).weights)
+
+class TestDesignLibrary(unittest.TestCase):
+    def test_memory_mapped_library(self):
+        networks = [create_biosensor_network(u) for u in np.linspace(0.5, 20, 8)]
+        library = DesignLibrary.from_networks(networks)
+        with tempfile.TemporaryDirectory() as path:
+            library.save(os.path.join(path, "library"))
+            loaded = DesignLibrary.load(os.path.join(path, "library"))
+            self.assertIsInstance(loaded.params, np.memmap)
+            self.assertEqual(len(loaded), 8)
+            self.assertEqual(loaded.layer_sizes, [3, 1])
+            np.testing.assert_allclose(loaded.column(0, "u")[:, 0], np.linspace(0.5, 20, 8))
+
+            inputs = np.array([[1.0, 0.0], [5.0, 0.0]])
+            np.testing.assert_array_equal(loaded[5].classify_biosensor_batch(inputs),
+                                          networks[5].classify_biosensor_batch(inputs))
+            del loaded
+
+    def test_rejects_mixed_architectures(self):
+        small = BiomolecularNeuralNetwork([[BiomolecularPerceptron(1, 1, 1, 1)]])
+        with self.assertRaises(ValueError):
+            DesignLibrary.from_networks([create_biosensor_network(), small])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.models.biomolecular_perceptron import BiomolecularPerceptron
+from src.models.continuation import design, response, switch_point, trace
+from src.models.steady_state import steady_state
+
+class TestContinuation(unittest.TestCase):
+    def setUp(self):
+        self.perceptron = BiomolecularPerceptron(u=1.0, v=2.0, gamma=1.0, phi=0.5, threshold=0.8)
+
+    def steady_switch(self, p):
+        # Input scaling u at which the equilibrium Z1 equals the threshold, from
+        # u * x = T * (phi + gamma * v / (gamma * T + phi))
+        T = p.threshold
+        return T * (p.phi + p.gamma * p.v / (p.gamma * T + p.phi)) / p.u
+
+    def test_trace_follows_closed_form(self):
+        values = np.linspace(0.2, 3.0, 40)
+        for parameter in ("u", "v", "gamma", "phi", "input"):
+            branch = trace(self.perceptron, parameter, values, concentration=1.5, input_mode="u")
+            rates = {"u": 1.5, "v": 2.0, "gamma": 1.0, "phi": 0.5}
+            rates[parameter if parameter != "input" else "u"] = values * (1.5 if parameter == "u" else 1.0)
+            z1, z2 = steady_state(**rates)
+            np.testing.assert_allclose(branch.z1, z1, rtol=1e-12)
+            np.testing.assert_allclose(branch.z2, z2, rtol=1e-12)
+            self.assertLessEqual(branch.n_iterations[1:].max(), 5)
+
+            # Tangents against central differences of the closed form
+            h = 1e-6
+            shifted = [dict(rates) for _ in range(2)]
+            for sign, r in zip((1, -1), shifted):
+                r[parameter if parameter != "input" else "u"] = (values + sign * h) * (1.5 if parameter == "u" else 1.0)
+            derivative = (steady_state(**shifted[0])[0] - steady_state(**shifted[1])[0]) / (2 * h)
+            np.testing.assert_allclose(branch.dz1, derivative, rtol=1e-5, atol=1e-8)
+
+    def test_steady_state_ignores_z1_0_input(self):
+        with self.assertRaises(ValueError):
+            trace(self.perceptron, "input", [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            switch_point(self.perceptron, readout="steady")
+
+    def test_steady_switch_point_and_crossings(self):
+        expected = self.steady_switch(self.perceptron)
+        self.assertAlmostEqual(switch_point(self.perceptron, input_mode="u", readout="steady"), expected, places=7)
+        branch = trace(self.perceptron, "input", np.linspace(0.5, 3.0, 11), input_mode="u")
+        np.testing.assert_allclose(branch.crossings(self.perceptron.threshold), [expected], rtol=1e-4)
+
+    def test_steady_design_matches_closed_form(self):
+        p = self.perceptron
+        for parameter in ("u", "v", "gamma", "phi"):
+            calibration = design(p, 2.0, parameter, input_mode="u", readout="steady")
+            self.assertAlmostEqual(self.steady_switch(calibration.perceptron), 2.0, places=6)
+            self.assertLessEqual(calibration.n_iterations, 12)
+        # v from u * x = T * (phi + gamma * v / (gamma * T + phi))
+        v = (p.u * 2.0 / p.threshold - p.phi) * (p.gamma * p.threshold + p.phi) / p.gamma
+        self.assertAlmostEqual(design(p, 2.0, "v", input_mode="u", readout="steady").value, v, places=6)
+        self.assertEqual(p.v, 2.0)
+
+    def test_transient_switch_and_design(self):
+        p = BiomolecularPerceptron(u=1.0, v=2.0, gamma=1.0, phi=0.5, threshold=0.355)
+        x = switch_point(p, bounds=(0.0, 10.0))
+        below = p.solve(z1_0=0.98 * x, rtol=1e-9, atol=1e-12)[1][0][-1]
+        above = p.solve(z1_0=1.02 * x, rtol=1e-9, atol=1e-12)[1][0][-1]
+        self.assertEqual((p.activation(below), p.activation(above)), (0, 1))
+
+        z1, dz1 = response(p, [x - 1e-3, x, x + 1e-3])
+        self.assertAlmostEqual(z1[1], p.threshold, places=6)
+        self.assertAlmostEqual(dz1[1], (z1[2] - z1[0]) / 2e-3, places=6)
+
+        for parameter in ("threshold", "v"):
+            calibration = design(p, 5.0, parameter)
+            self.assertAlmostEqual(switch_point(calibration.perceptron, bounds=(0.0, 10.0)), 5.0, places=4)
+            self.assertLessEqual(calibration.n_iterations, 12)
+
+    def test_design_without_switch_in_bounds(self):
+        with self.assertRaises(ValueError):
+            design(self.perceptron, 2.0, "v", input_mode="u", readout="steady", bounds=(10.0, 20.0))
+
+if __name__ == '__main__':
+    unittest.main()
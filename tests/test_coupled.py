@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import pytest
+import numpy as np
+from scipy import sparse
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.biomolecular_layer import BiomolecularLayer
+from src.models.coupled import CoupledNetwork
+from tests.networks import create_biosensor_network
+
+@pytest.mark.parametrize("biomarkers, expected", [
+    ([0.0, 0.0], 0),
+    ([5.0, 0.0], 1),
+    ([0.0, 4.0], 0),  # Without weights only the first biomarker drives the network
+    ([3.0, 3.0], 1),
+])
+def test_coupled_cancer_detection(biomarkers, expected):
+    assert create_biosensor_network().forward(biomarkers, mode="coupled") == [expected]
+
+def test_unweighted_coupled_matches_other_modes():
+    network = BiomolecularNeuralNetwork([[BiomolecularPerceptron(u=1, v=2, gamma=1, phi=0.5, threshold=0.8)]],
+                                        input_mode="u")
+    for inputs in ([0.0, 10.0], [10.0, 0.0]):
+        expected = network.forward(inputs)
+        assert network.forward(inputs, mode="coupled") == expected
+        assert network.forward(inputs, mode="fused") == expected
+
+class TestCoupledNetwork(unittest.TestCase):
+    def setUp(self):
+        self.coupled = CoupledNetwork.from_network(create_biosensor_network())
+
+    def test_structure(self):
+        self.assertEqual(self.coupled.n_nodes, 4)
+        self.assertEqual(self.coupled.layer_slice(1), slice(3, 4))
+        self.assertEqual(self.coupled.jac_sparsity.shape, (8, 8))
+
+    def test_jacobian(self):
+        z = np.random.default_rng(0).uniform(0, 2, size=8)
+        drive = self.coupled.input_drive([1.0, 2.0])
+        jac = self.coupled.jacobian(0, z, drive).toarray()
+        eps = 1e-6
+        numeric = np.column_stack([
+            (self.coupled.equations(0, z + eps * e, drive) - self.coupled.equations(0, z - eps * e, drive)) / (2 * eps)
+            for e in np.eye(8)
+        ])
+        np.testing.assert_allclose(jac, numeric, atol=1e-6)
+        self.assertFalse(np.any((jac != 0) & (self.coupled.jac_sparsity.toarray() == 0)))
+
+    def test_sparse_weights(self):
+        layers = [BiomolecularLayer([5, 5, 5], 3, 2, 0.5, 1.0), BiomolecularLayer([5, 5], 3, 2, 0.5, 1.0)]
+        weights = [sparse.identity(3, format="csr")[:, :2], sparse.csr_matrix([[1, 0, 0], [0, 0, 1]])]
+        coupled = CoupledNetwork(layers, weights=weights)
+        self.assertEqual(coupled.coupling.nnz, 2)
+        t, sol = coupled.solve([1.0, 0.0])
+        self.assertEqual(sol.shape[:2], (2, 5))
+        # The third input-layer node has no inputs, so neither does its downstream node
+        self.assertLess(sol[0, 2, -1], 1e-6)
+        self.assertLess(sol[0, 4, -1], 1e-6)
+
+    def test_weight_shape_checked(self):
+        layers = [BiomolecularLayer([5, 5], 3, 2, 0.5), BiomolecularLayer([5], 3, 2, 0.5)]
+        with self.assertRaises(ValueError):
+            CoupledNetwork(layers, weights=[None, np.ones((1, 3))])
+
+    def test_deep_network_single_solve(self):
+        layers = [BiomolecularLayer(np.full(5, 5.0), 3, 2, 0.5, 1.0) for _ in range(10)]
+        coupled = CoupledNetwork(layers)
+        output = coupled.forward([1.0, 1.0])
+        self.assertEqual(len(output), 5)
+        self.assertEqual(coupled.solver_stats["status"], 0)
+
+    def test_finite_difference_jacobian(self):
+        t, analytic = self.coupled.solve([3.0, 3.0])
+        t, estimated = self.coupled.solve([3.0, 3.0], analytic_jacobian=False)
+        np.testing.assert_allclose(analytic[:, :, -1], estimated[:, :, -1], rtol=1e-2)
+
+if __name__ == '__main__':
+    unittest.main()
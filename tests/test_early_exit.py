@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import pytest
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.steady_state import z1_bounds
+
+@pytest.mark.parametrize("u, v, gamma, phi, threshold", [
+    (0, 0, 1, 1, 0.5),
+    (100, 100, 1, 1, 0.5),
+    (2, 3, 20, 0.5, 5.0),
+    (10, 3, 0.1, 0.5, 1.5),
+    (5, 3, 2, 0.5, 4.3),   # Threshold close to the equilibrium
+])
+@pytest.mark.parametrize("z1_0", [0.0, 1.0, 5.0, -1.0])
+def test_decision_matches_full_solve(u, v, gamma, phi, threshold, z1_0):
+    perceptron = BiomolecularPerceptron(u, v, gamma, phi, threshold)
+    t, sol = perceptron.solve(z1_0=z1_0)
+    result = perceptron.decide(z1_0=z1_0)
+    assert result.decision == perceptron.activation(sol[0][-1])
+    assert result.t_stop <= 10
+
+class TestEarlyExit(unittest.TestCase):
+    def test_bounds_contain_trajectory(self):
+        """The interval from any point must contain the rest of the trajectory"""
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        t, sol = perceptron.solve(z1_0=3.0, t_span=(0, 20), t_eval=np.linspace(0, 20, 200))
+        for i in range(0, 200, 20):
+            lower, upper = z1_bounds(5, 3, 2, 0.5, sol[0][i], sol[1][i])
+            self.assertTrue(np.all(sol[0][i:] >= lower - 1e-3))
+            self.assertTrue(np.all(sol[0][i:] <= upper + 1e-3))
+
+    def test_stops_early(self):
+        perceptron = BiomolecularPerceptron(u=10, v=3, gamma=0.1, phi=0.5, threshold=1.5)
+        t, sol = perceptron.solve()
+        full_nfev = perceptron.solver_stats["nfev"]
+        result = perceptron.decide()
+        self.assertEqual(result.reason, "decided")
+        self.assertLess(result.t_stop, 1.0)
+        self.assertLess(result.nfev, full_nfev)
+
+    def test_decided_at_start(self):
+        perceptron = BiomolecularPerceptron(u=10, v=3, gamma=0.1, phi=0.5, threshold=1.5)
+        result = perceptron.decide(z1_0=5.0)
+        self.assertEqual(result, (1, 0, 0, "decided"))
+
+    def test_settled(self):
+        perceptron = BiomolecularPerceptron(u=0, v=0, gamma=1, phi=1, threshold=0.5)
+        self.assertEqual(perceptron.decide().reason, "settled")
+
+    def test_forward_early_mode(self):
+        layers = [
+            [BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0),
+             BiomolecularPerceptron(u=4, v=2, gamma=1.5, phi=0.4, threshold=0.8)],
+            [BiomolecularPerceptron(u=6, v=3, gamma=2, phi=0.5, threshold=1.2)],
+        ]
+        network = BiomolecularNeuralNetwork(layers=layers)
+        for inputs in ([0.0, 0.0], [1.0, 1.0], [-1.0, -1.0]):
+            self.assertEqual(network.forward(inputs, mode="early"), network.forward(inputs))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import warnings
+import numpy as np
+from scipy import sparse
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.steady_state import TransientWarning
+
+def create_panel_network(input_mode="u"):
+    """One detector per biomarker, OR-ed by the output perceptron"""
+    layer1 = [BiomolecularPerceptron(u=15, v=3, gamma=1.0, phi=0.3, threshold=1.8) for _ in range(3)]
+    layer2 = [BiomolecularPerceptron(u=12, v=3, gamma=1.0, phi=0.3, threshold=0.5)]
+    weights = [np.eye(3), np.ones((1, 3))]
+    return BiomolecularNeuralNetwork(layers=[layer1, layer2], weights=weights, input_mode=input_mode)
+
+class TestFanIn(unittest.TestCase):
+    def test_fan_in_single_matrix_op(self):
+        network = create_panel_network()
+        np.testing.assert_array_equal(network.fan_in(0, [1.0, 2.0, 3.0]), [1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(network.fan_in(1, [1, 0, 1]), [2.0])
+        batch = network.fan_in(0, np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]))
+        self.assertEqual(batch.shape, (2, 3))
+
+    def test_default_uses_first_input(self):
+        layers = [[BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0)] * 2]
+        legacy = BiomolecularNeuralNetwork(layers=layers)
+        np.testing.assert_array_equal(legacy.fan_in(0, [0.7, 9.0]), [0.7, 0.7])
+        weighted = BiomolecularNeuralNetwork(layers=layers, weights=[np.array([[1.0, 0.0], [1.0, 0.0]])])
+        self.assertEqual(legacy.forward([0.7, 9.0]), weighted.forward([0.7, 9.0]))
+
+    def test_production_mode_detects_each_biomarker(self):
+        network = create_panel_network()
+        for biomarkers, expected in [([0.0, 0.0, 0.0], 0), ([5.0, 0.0, 0.0], 1),
+                                     ([0.0, 4.0, 0.0], 1), ([0.0, 0.0, 3.0], 1)]:
+            self.assertEqual(network.classify_biosensor(biomarkers), expected, biomarkers)
+
+    def test_modes_agree(self):
+        network = create_panel_network()
+        inputs = np.array([[0.0, 0.0, 0.0], [5.0, 0.0, 0.0], [0.0, 0.0, 3.0]])
+        batch = network.forward_batch(inputs)
+        for row, output in zip(inputs, batch):
+            expected = network.forward(list(row))
+            self.assertEqual(output.tolist(), expected)
+            self.assertEqual(network.forward(list(row), mode="fused"), expected)
+            self.assertEqual(network.forward(list(row), mode="early"), expected)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", TransientWarning)
+                self.assertEqual(network.forward(list(row), mode="steady"), expected)
+
+    def test_sparse_weights(self):
+        dense = create_panel_network(input_mode="z1_0")
+        layers = dense.layers
+        sparse_network = BiomolecularNeuralNetwork(
+            layers=layers, weights=[sparse.identity(3, format="csr"), sparse.csr_matrix(np.ones((1, 3)))],
+            input_mode="z1_0",
+        )
+        for biomarkers in ([0.0, 0.0, 0.0], [5.0, 1.0, 0.0]):
+            self.assertEqual(sparse_network.forward(biomarkers), dense.forward(biomarkers))
+
+    def test_validation(self):
+        layers = [[BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)] * 2, [BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)]]
+        with self.assertRaises(ValueError):
+            BiomolecularNeuralNetwork(layers=layers, weights=[np.eye(2)])
+        with self.assertRaises(ValueError):
+            BiomolecularNeuralNetwork(layers=layers, weights=[np.eye(2), np.ones((1, 3))])
+        with self.assertRaises(ValueError):
+            BiomolecularNeuralNetwork(layers=layers, input_mode="bogus")
+
+if __name__ == '__main__':
+    unittest.main()
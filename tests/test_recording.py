@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import unittest
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron
+from src.models.visualization import plot_recording, render_recordings, render_scenarios
+from tests.networks import make_network
+
+class TestRecording(unittest.TestCase):
+    def test_forward_records_trajectories(self):
+        network = make_network((2, 1))
+        outputs = network.forward([1.0, 1.0], record=True, record_points=20)
+        recording = network.recording
+
+        self.assertEqual(outputs, recording.final_outputs)
+        self.assertEqual(recording.trajectories.shape, (3, 2, 20))
+        self.assertEqual(recording.trajectories.dtype, np.float32)
+        self.assertEqual(recording.times[0], 0)
+        self.assertEqual(recording.times[-1], 10)
+
+        t, sol = network.layers[0][1].solve(z1_0=1.0, z2_0=0)
+        np.testing.assert_allclose(recording.node(0, 1)[1][:, -1], sol[:, -1], rtol=1e-6)
+        # Without weights the second layer starts from the first output
+        self.assertEqual(recording.layer_inputs(1)[0], recording.layer_outputs(0)[0])
+
+    def test_fused_recording_matches(self):
+        network = make_network((2, 1))
+        network.forward([1.0, 0.0], mode="fused", record=True)
+        fused = network.recording
+        network.forward([1.0, 0.0], record=True)
+        np.testing.assert_allclose(fused.trajectories, network.recording.trajectories, rtol=1e-2, atol=1e-2)
+
+    def test_record_unsupported_mode(self):
+        with self.assertRaises(ValueError):
+            make_network((2, 1)).forward([1.0, 0.0], mode="early", record=True)
+
+    def test_render_without_resolving(self):
+        network = make_network((2, 1))
+        network.forward([1.0, 1.0], record=True)
+        figure = plot_recording(network.recording)
+        self.assertEqual(len(figure.axes), 3)
+
+        solves = []
+        solve = BiomolecularPerceptron.solve
+        BiomolecularPerceptron.solve = lambda self, *args, **kwargs: solves.append(1) or solve(self, *args, **kwargs)
+        try:
+            with tempfile.TemporaryDirectory() as path:
+                paths = render_recordings([network.recording], path, processes=0)
+                self.assertGreater(os.path.getsize(paths[0]), 0)
+        finally:
+            BiomolecularPerceptron.solve = solve
+        self.assertEqual(solves, [])
+
+    def test_render_scenarios_in_pool(self):
+        scenarios = [[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+        network = make_network((2, 1))
+        with tempfile.TemporaryDirectory() as path:
+            results = render_scenarios(network, scenarios, path, processes=2)
+            self.assertEqual(sorted(os.listdir(path)), [f"scenario_{i:04d}.png" for i in range(4)])
+        self.assertEqual([outputs for _, outputs in results], [network.forward(inputs) for inputs in scenarios])
+
+if __name__ == '__main__':
+    unittest.main()
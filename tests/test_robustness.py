@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import warnings
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.robustness import analyze_robustness, ensemble_forward, wilson_interval
+from tests.networks import make_weighted_network
+
+class TestRobustness(unittest.TestCase):
+    def test_wilson_interval(self):
+        low, high = wilson_interval(0, 100)
+        self.assertAlmostEqual(low, 0)
+        self.assertAlmostEqual(high, 0.037, places=3)
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(low + high, 1.0)
+
+    def test_ensemble_matches_individual_networks(self):
+        network = make_weighted_network()
+        rng = np.random.default_rng(0)
+        params = [{name: rng.uniform(0.5, 2, size=(6, len(layer))) * np.array([getattr(p, name) for p in layer])
+                   for name in ("u", "v", "gamma", "phi")} for layer in network.layers]
+        inputs = rng.uniform(0, 10, size=(6, 2))
+        outputs = ensemble_forward(network, params, inputs)
+
+        for i in range(6):
+            member = BiomolecularNeuralNetwork(
+                layers=[[BiomolecularPerceptron(*(params[l][name][i, j] for name in ("u", "v", "gamma", "phi")),
+                                                threshold=p.threshold) for j, p in enumerate(layer)]
+                        for l, layer in enumerate(network.layers)],
+                weights=network.weights, input_mode="u",
+            )
+            np.testing.assert_array_equal(outputs[i], member.forward_batch(inputs[i:i + 1])[0])
+
+    def test_no_uncertainty(self):
+        result = analyze_robustness(make_weighted_network(), [9.5, 0.25], parameter_cv=0.0, batch_size=64,
+                                    tolerance=0.02, seed=0)
+        self.assertEqual(result.rate, 0)
+        self.assertTrue(result.converged)
+        self.assertEqual(result.n_samples, 128)
+
+    def test_rate_and_sensitivity(self):
+        result = analyze_robustness(make_weighted_network(), [9.5, 0.25], parameter_cv=0.2, input_cv=0.1,
+                                    tolerance=0.02, seed=0)
+        self.assertTrue(result.converged)
+        self.assertGreater(result.rate, 0.1)
+        self.assertLessEqual(result.interval[1] - result.interval[0], 0.04)
+        self.assertEqual(set(result.total_order), {"u", "v", "gamma", "phi", "inputs"})
+        self.assertGreater(result.total_order["u"], result.total_order["phi"])
+
+        # Only the inputs vary, so they explain all of the variance
+        result = analyze_robustness(make_weighted_network(), [9.5, 0.25], parameter_cv=0.0, input_cv=0.2,
+                                    tolerance=0.02, sampler="lhs", seed=0)
+        self.assertGreater(result.rate, 0)
+        self.assertAlmostEqual(result.total_order["inputs"], 1.0, delta=0.05)
+        self.assertEqual(result.total_order["u"], 0.0)
+
+    def test_stops_at_max_samples(self):
+        result = analyze_robustness(make_weighted_network(), [9.5, 0.25], parameter_cv=0.2, tolerance=1e-4,
+                                    batch_size=64, max_samples=256, sensitivity=False, seed=0)
+        self.assertFalse(result.converged)
+        self.assertEqual(result.n_samples, 256)
+        self.assertEqual(result.first_order, {})
+
+    def test_sobol_draws_stay_balanced(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = analyze_robustness(make_weighted_network(), [9.5, 0.25], parameter_cv=0.2, tolerance=1e-4,
+                                        batch_size=16, max_samples=300, sensitivity=False, seed=0)
+        # Rounds of 16, 16, 32 and 64 points, each giving A and B samples; 128 more would exceed 300
+        self.assertEqual(result.n_samples, 256)
+        with self.assertRaises(ValueError):
+            analyze_robustness(make_weighted_network(), [9.5, 0.25], batch_size=100)
+
+    def test_unknown_sampler(self):
+        with self.assertRaises(ValueError):
+            analyze_robustness(make_weighted_network(), [1.0, 1.0], sampler="grid")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.server import InferenceServer
+
+def request(address, path, payload=None):
+    data = None if payload is None else json.dumps(payload).encode()
+    url = f"http://{address[0]}:{address[1]}{path}"
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+async def keep_alive_request(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    headers = {}
+    status = int((await reader.readline()).split()[1])
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+class TestInferenceServer(unittest.TestCase):
+    def setUp(self):
+        self.network = BiomolecularNeuralNetwork([
+            [BiomolecularPerceptron(u=1.0, v=0.5, gamma=1.0, phi=0.5, threshold=0.5),
+             BiomolecularPerceptron(u=0.5, v=1.0, gamma=1.0, phi=0.5, threshold=0.3)],
+            [BiomolecularPerceptron(u=1.0, v=0.8, gamma=1.0, phi=0.5, threshold=0.4)],
+        ], weights=[np.eye(2), np.array([[1.0, 1.0]])])
+        self.inputs = np.random.default_rng(1).uniform(0, 3, size=(24, 2))
+        self.expected = self.network.classify_biosensor_batch(self.inputs)
+
+    def test_concurrent_requests_share_batches(self):
+        async def run():
+            async with InferenceServer(self.network, max_batch_size=8, max_delay=0.05, workers=2) as server:
+                outputs = await asyncio.gather(*(server.classify(x) for x in self.inputs))
+                return outputs, server.metrics.snapshot()
+
+        outputs, metrics = asyncio.run(run())
+        np.testing.assert_array_equal([output[0, 0] for output in outputs], self.expected)
+        self.assertEqual(metrics["requests"], 24)
+        self.assertEqual(metrics["samples"], 24)
+        self.assertEqual(metrics["batches"], 3)
+        self.assertEqual(metrics["mean_batch_size"], 8)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["max_queue_depth"], 24)
+        self.assertGreater(metrics["latency"]["p50"], 0)
+
+    def test_http_classify_metrics_and_errors(self):
+        async def run():
+            async with InferenceServer(self.network, max_delay=0.01) as server:
+                loop = asyncio.get_running_loop()
+                calls = [loop.run_in_executor(None, request, server.address, "/classify", {"biomarkers": list(x)})
+                         for x in self.inputs[:6]]
+                calls.append(loop.run_in_executor(None, request, server.address, "/classify",
+                                                  {"biomarkers": self.inputs[6:].tolist()}))
+                responses = await asyncio.gather(*calls)
+                errors = await asyncio.gather(
+                    loop.run_in_executor(None, request, server.address, "/classify", {"biomarkers": [1, 2, 3]}),
+                    loop.run_in_executor(None, request, server.address, "/classify", {"values": [1, 2]}),
+                    loop.run_in_executor(None, request, server.address, "/missing"),
+                    loop.run_in_executor(None, request, server.address, "/classify"),
+                )
+                metrics = await loop.run_in_executor(None, request, server.address, "/metrics")
+                return responses, errors, metrics
+
+        responses, errors, (status, metrics) = asyncio.run(run())
+        for (status, body), expected in zip(responses[:6], self.expected[:6]):
+            self.assertEqual(status, 200)
+            self.assertEqual(body["label"], expected)
+        self.assertEqual(responses[6][1]["labels"], self.expected[6:].tolist())
+        self.assertEqual([status for status, _ in errors], [400, 400, 404, 405])
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics["samples"], 24)
+        self.assertLessEqual(metrics["batches"], 7)
+
+    def test_non_finite_request_does_not_fail_batch(self):
+        async def run():
+            async with InferenceServer(self.network, max_delay=0.05) as server:
+                loop = asyncio.get_running_loop()
+                responses = await asyncio.gather(
+                    loop.run_in_executor(None, request, server.address, "/classify", {"biomarkers": [1.0, 2.0]}),
+                    # json.dumps writes NaN and Infinity, which are not valid JSON
+                    loop.run_in_executor(None, request, server.address, "/classify", {"biomarkers": [np.nan, 1.0]}),
+                    loop.run_in_executor(None, request, server.address, "/classify", {"biomarkers": [1e999, 1.0]}),
+                )
+                with self.assertRaises(ValueError):
+                    await server.classify([np.nan, 1.0])
+                return responses, server.metrics.snapshot()
+
+        responses, metrics = asyncio.run(run())
+        self.assertEqual([status for status, _ in responses], [200, 400, 400])
+        self.assertEqual(responses[0][1]["label"], self.network.classify_biosensor_batch([[1.0, 2.0]])[0])
+        self.assertEqual(metrics["samples"], 1)
+        self.assertEqual(metrics["errors"], 0)
+
+    def test_stop_closes_idle_keep_alive_connection(self):
+        async def run():
+            server = await InferenceServer(self.network).start()
+            reader, writer = await asyncio.open_connection(*server.address)
+            response = await keep_alive_request(reader, writer, "/health")
+            # The client keeps the connection open while the server stops
+            await asyncio.wait_for(server.stop(), timeout=5)
+            closed = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return response, closed
+
+        response, closed = asyncio.run(run())
+        self.assertEqual(response, (200, {"status": "ok"}))
+        self.assertEqual(closed, b"")
+
+    def test_idle_timeout(self):
+        async def run():
+            async with InferenceServer(self.network, idle_timeout=0.1) as server:
+                reader, writer = await asyncio.open_connection(*server.address)
+                first = await keep_alive_request(reader, writer, "/health")
+                second = await keep_alive_request(reader, writer, "/health")
+                closed = await asyncio.wait_for(reader.read(), timeout=5)
+                writer.close()
+                return first, second, closed
+
+        first, second, closed = asyncio.run(run())
+        self.assertEqual(first, second)
+        self.assertEqual(closed, b"")
+
+    def test_process_pool(self):
+        async def run():
+            async with InferenceServer(self.network, max_delay=0.01, workers=1, executor="process") as server:
+                return await server.classify(self.inputs)
+
+        np.testing.assert_array_equal(asyncio.run(run())[:, 0], self.expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import warnings
+import pytest
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.steady_state import TransientWarning, steady_state, settled
+
+@pytest.mark.parametrize("u, v, gamma, phi", [
+    (5, 3, 2, 0.5),
+    (2, 3, 20, 0.5),     # Strong sequestration, v > u
+    (10, 3, 0.1, 0.5),   # Weak sequestration
+    (4, 4, 1.5, 0.4),    # Balanced production
+    (3, 1, 0, 0.5),      # No titration
+])
+def test_matches_long_integration(u, v, gamma, phi):
+    perceptron = BiomolecularPerceptron(u, v, gamma, phi)
+    t, sol = perceptron.solve(t_span=(0, 100), t_eval=[100])
+    z1, z2 = steady_state(u, v, gamma, phi)
+    np.testing.assert_allclose([z1, z2], sol[:, -1], rtol=5e-3, atol=1e-4)
+
+class TestSteadyState(unittest.TestCase):
+    def test_vectorized(self):
+        u = np.array([5, 2, 10])
+        z1, z2 = steady_state(u, 3, np.array([2, 20, 0.1]), 0.5)
+        self.assertEqual(z1.shape, (3,))
+        residual = u - np.array([2, 20, 0.1]) * z1 * z2 - 0.5 * z1
+        np.testing.assert_allclose(residual, 0, atol=1e-9)
+
+    def test_requires_decay(self):
+        with self.assertRaises(ValueError):
+            steady_state(5, 3, 2, 0)
+
+    def test_solve_steady_mode(self):
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.5)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            t, sol = perceptron.solve(t_span=(0, 50), mode="steady")
+        self.assertEqual(sol.shape, (2, 1))
+        self.assertEqual(t[-1], 50)
+        self.assertEqual(perceptron.activation(sol[0][-1]), 1)
+
+    def test_short_t_span_warns(self):
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        with self.assertWarns(TransientWarning):
+            perceptron.solve(t_span=(0, 1), mode="steady")
+        self.assertFalse(settled(5, 3, 2, 0.5, t_span=(0, 1)))
+        self.assertTrue(settled(5, 3, 2, 0.5, t_span=(0, 50)))
+
+    def test_forward_steady_mode(self):
+        layers = [
+            [BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0),
+             BiomolecularPerceptron(u=2, v=3, gamma=20, phi=0.5, threshold=5.0)],
+            [BiomolecularPerceptron(u=6, v=3, gamma=2, phi=0.5, threshold=1.2)],
+        ]
+        network = BiomolecularNeuralNetwork(layers=layers)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", TransientWarning)
+            output = network.forward([1.0, 1.0], mode="steady")
+        self.assertEqual(output, network.forward([1.0, 1.0]))
+
+if __name__ == '__main__':
+    unittest.main()
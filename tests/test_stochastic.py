@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.stochastic import StochasticSimulator, gillespie, tau_leap
+
+class TestStochastic(unittest.TestCase):
+    def setUp(self):
+        self.network = BiomolecularNeuralNetwork(layers=[
+            [BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=4.3),   # Threshold at the mean
+             BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5, threshold=1.0)],  # Clearly on
+            [BiomolecularPerceptron(u=6, v=3, gamma=2, phi=0.5, threshold=1.2)],
+        ])
+
+    def test_tau_leap_mean_matches_ode(self):
+        t, sol = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5).solve()
+        counts = tau_leap(5, 3, 2, 0.5, np.zeros((500, 1)), 0, volume=200, rng=0)
+        self.assertEqual(counts.shape, (500, 1, 2))
+        self.assertTrue(np.all(counts >= 0))
+        np.testing.assert_allclose(counts[:, 0, 0].mean() / 200, sol[0][-1], rtol=0.02)
+
+    def test_gillespie(self):
+        times, states = gillespie([5], [3], [2], [0.5], [0], [0], t_span=(0, 5), volume=10, rng=0)
+        self.assertEqual(states.shape, (len(times), 1, 2))
+        self.assertTrue(np.all(np.diff(times) > 0))
+        self.assertTrue(np.all(states >= 0))
+        # Every event changes the copy numbers by one reaction's stoichiometry
+        self.assertTrue(np.all(np.abs(np.diff(states, axis=0)).sum(axis=(1, 2)) <= 2))
+
+    def test_activation_probabilities(self):
+        simulator = StochasticSimulator(self.network, volume=20, n_cells=400)
+        probabilities = simulator.activation_probabilities([1.0, 1.0], seed=1)
+        self.assertEqual([p.shape for p in probabilities], [(2,), (1,)])
+        self.assertTrue(0.1 < probabilities[0][0] < 0.9)
+        self.assertEqual(probabilities[0][1], 1.0)
+        np.testing.assert_array_equal(simulator.output_probabilities([1.0, 1.0], seed=1), probabilities[-1])
+
+    def test_reproducible_streams(self):
+        for method, n_cells in (("tau", 200), ("ssa", 3)):
+            simulator = StochasticSimulator(self.network, volume=5, n_cells=n_cells, method=method, t_span=(0, 2))
+            first = simulator.simulate([1.0, 1.0], seed=7)
+            second = simulator.simulate([1.0, 1.0], seed=7)
+            for a, b in zip(first, second):
+                np.testing.assert_array_equal(a, b)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            StochasticSimulator(self.network, method="bogus")
+
+if __name__ == '__main__':
+    unittest.main()
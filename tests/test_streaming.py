@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import numpy as np
+from src.models.streaming import BiosensorStream, stream
+from tests.networks import create_biosensor_network
+
+class TestBiosensorStream(unittest.TestCase):
+    def test_time_series_response(self):
+        time_points = np.linspace(0, 5, 10)
+        responses = [out[0] for out in stream(create_biosensor_network(), [[t, t] for t in time_points],
+                                              times=time_points + 1.0)]
+        self.assertEqual(responses[0], 0, "Should start negative")
+        self.assertEqual(responses[-1], 1, "Should end positive")
+
+    def test_warm_start_matches_single_solve(self):
+        """Splitting a constant input into readings must follow the same trajectory"""
+        network = create_biosensor_network()
+        sensor = BiosensorStream(network)
+        for t in (2.5, 5.0, 7.5, 10.0):
+            sensor.push([0.5, 0.5], t=t)
+        t, sol = sensor.network.solve([0.5, 0.5], t_span=(0, 10), t_eval=[10])
+        np.testing.assert_allclose(sensor.z, sol[:, :, -1].ravel(), rtol=1e-2, atol=1e-4)
+
+    def test_state_carried_forward(self):
+        sensor = BiosensorStream(create_biosensor_network(), interval=2.0)
+        sensor.push([5.0, 0.0])
+        self.assertEqual(sensor.t, 2.0)
+        high = sensor.z1[0].copy()
+        sensor.push([0.0, 0.0])
+        # Z1 decays from where it was instead of restarting at zero
+        self.assertTrue(np.all(sensor.z1[0] > 0))
+        self.assertTrue(np.all(sensor.z1[0] < high))
+        self.assertEqual(len(sensor.z2), 2)
+
+    def test_out_of_order_reading(self):
+        sensor = BiosensorStream(create_biosensor_network())
+        sensor.push([1.0, 1.0], t=3.0)
+        with self.assertRaises(ValueError):
+            sensor.push([1.0, 1.0], t=2.0)
+
+    def test_reset(self):
+        sensor = BiosensorStream(create_biosensor_network())
+        sensor.push([5.0, 5.0])
+        sensor.reset()
+        self.assertEqual(sensor.t, 0.0)
+        self.assertTrue(np.all(sensor.z == 0))
+        self.assertEqual(sensor.outputs(), [0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import unittest
+import numpy as np
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.sweep import grid, sample, run_sweep
+
+calls = []
+
+def detector_network(u, threshold):
+    """Single-perceptron detector used as sweep template"""
+    calls.append((u, threshold))
+    return BiomolecularNeuralNetwork(layers=[[BiomolecularPerceptron(u=u, v=3, gamma=1.0, phi=0.3, threshold=threshold)]])
+
+def failing_network(u, threshold):
+    if u > 10:
+        raise RuntimeError("interrupted")
+    return detector_network(u, threshold)
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        calls.clear()
+        self.inputs = np.array([[0.0, 0.0], [5.0, 0.0], [1.0, 1.0]])
+
+    def test_grid(self):
+        designs = grid(u=[1, 2], threshold=[0.5, 1.0, 1.5])
+        self.assertEqual(len(designs), 6)
+        self.assertEqual(designs[0], {"u": 1, "threshold": 0.5})
+
+    def test_sample(self):
+        designs = sample({"u": (1, 20), "threshold": (0.5, 2.0)}, n=10, seed=0)
+        self.assertEqual(len(designs), 10)
+        self.assertTrue(all(1 <= d["u"] <= 20 for d in designs))
+        self.assertEqual(designs, sample({"u": (1, 20), "threshold": (0.5, 2.0)}, n=10, seed=0))
+
+    def test_serial_matches_classify(self):
+        designs = grid(u=[1, 15], threshold=[0.5, 50.0])
+        result = run_sweep(detector_network, designs, self.inputs, labels=[0, 1, 1], processes=0)
+        self.assertEqual(result.outputs.shape, (4, 3))
+        np.testing.assert_array_equal(result.params["u"], [1, 1, 15, 15])
+        for i, design in enumerate(designs):
+            expected = [detector_network(**design).classify_biosensor(x) for x in self.inputs]
+            np.testing.assert_array_equal(result.outputs[i], expected)
+        self.assertEqual(result.accuracy.shape, (4,))
+        self.assertEqual(result.best(1)[0], designs[int(np.argmax(result.accuracy))])
+
+    def test_process_pool(self):
+        designs = grid(u=[1, 5, 15], threshold=[0.5, 1.8])
+        serial = run_sweep(detector_network, designs, self.inputs, processes=0)
+        parallel = run_sweep(detector_network, designs, self.inputs, processes=2, chunk_size=2)
+        np.testing.assert_array_equal(serial.outputs, parallel.outputs)
+
+    def test_resume_from_checkpoint(self):
+        designs = grid(u=[1, 5, 15], threshold=[0.5, 1.8])
+        with tempfile.TemporaryDirectory() as path:
+            checkpoint = os.path.join(path, "sweep.npz")
+            with self.assertRaises(RuntimeError):
+                run_sweep(failing_network, designs, self.inputs, processes=0, chunk_size=2,
+                          checkpoint=checkpoint, checkpoint_interval=0)
+            calls.clear()
+            result = run_sweep(detector_network, designs, self.inputs, processes=0, chunk_size=2,
+                               checkpoint=checkpoint)
+        self.assertEqual(calls, [(15, 0.5), (15, 1.8)])
+        self.assertTrue(np.isin(result.outputs, [0, 1]).all())
+
+    def test_checkpoint_mismatch(self):
+        with tempfile.TemporaryDirectory() as path:
+            checkpoint = os.path.join(path, "sweep.npz")
+            run_sweep(detector_network, grid(u=[1], threshold=[0.5]), self.inputs, processes=0, checkpoint=checkpoint)
+            with self.assertRaises(ValueError):
+                run_sweep(detector_network, grid(u=[2], threshold=[0.5]), self.inputs, processes=0, checkpoint=checkpoint)
+
+    def test_resume_with_different_panel(self):
+        designs = grid(u=[1, 15], threshold=[0.5])
+        with tempfile.TemporaryDirectory() as path:
+            checkpoint = os.path.join(path, "sweep.npz")
+            run_sweep(detector_network, designs, self.inputs, processes=0, checkpoint=checkpoint)
+            for panel in (self.inputs[::-1], self.inputs[:2]):
+                with self.assertRaisesRegex(ValueError, "different sweep"):
+                    run_sweep(detector_network, designs, panel, processes=0, checkpoint=checkpoint)
+
+if __name__ == '__main__':
+    unittest.main()
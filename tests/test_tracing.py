@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import tempfile
+import unittest
+from src.models.biomolecular_perceptron import BiomolecularPerceptron
+from src.models.tracing import Tracer, rejected_steps
+from tests.networks import make_network
+
+class TestTracing(unittest.TestCase):
+    def test_forward_spans(self):
+        network = make_network()
+        tracer = Tracer()
+        self.assertEqual(network.forward([1.0, 1.0], tracer=tracer), network.forward([1.0, 1.0]))
+
+        names = [record["name"] for record in tracer.records]
+        self.assertEqual(names.count("perceptron 0"), 2)
+        self.assertEqual(names[-1], "forward")
+        perceptron = next(record for record in tracer.records if record["name"] == "perceptron 2")
+        self.assertEqual(perceptron["stack"], ("forward", "layer 0", "perceptron 2"))
+        self.assertEqual(perceptron["args"]["method"], "RK45")
+        self.assertGreater(perceptron["args"]["nfev"], 0)
+
+        layers = tracer.per_layer()
+        self.assertEqual(sorted(layers), [0, 1])
+        self.assertEqual(layers[0]["n_perceptrons"], 3)
+        self.assertEqual(layers[0]["methods"], {"RK45"})
+        self.assertGreater(layers[0]["wall_time"], layers[1]["wall_time"])
+
+    def test_solve_span(self):
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        tracer = Tracer()
+        perceptron.solve(z1_0=1e6, method="auto", tracer=tracer)
+        record, = tracer.records
+        self.assertEqual(record["name"], "solve")
+        self.assertEqual(record["args"]["method"], "LSODA")
+        self.assertNotIn("n_rejected", record["args"])
+
+    def test_rejected_steps(self):
+        perceptron = BiomolecularPerceptron(u=5, v=3, gamma=2, phi=0.5)
+        perceptron.solve(z1_0=1e3)
+        stats = perceptron.solver_stats
+        self.assertEqual(stats["n_rejected"], rejected_steps("RK45", stats["nfev"], stats["n_steps"]))
+        self.assertGreater(stats["n_rejected"], 0)
+        self.assertIsNone(rejected_steps("BDF", 100, 10))
+
+    def test_other_modes(self):
+        network = make_network()
+        for mode, expected in [("fused", "layer 1"), ("coupled", "coupled"), ("early", "perceptron 0")]:
+            tracer = Tracer()
+            network.forward([1.0, 1.0], mode=mode, tracer=tracer)
+            self.assertIn(expected, [record["name"] for record in tracer.records])
+
+    def test_exports(self):
+        tracer = Tracer()
+        make_network().forward([1.0, 1.0], tracer=tracer)
+        with tempfile.TemporaryDirectory() as path:
+            trace_path = os.path.join(path, "trace.json")
+            tracer.chrome_trace(trace_path)
+            with open(trace_path) as f:
+                events = json.load(f)["traceEvents"]
+            lines = tracer.collapsed_stacks(os.path.join(path, "stacks.txt"))
+
+        self.assertEqual(len(events), len(tracer.records))
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+        self.assertTrue(all("nfev" in event["args"] for event in events if event["name"].startswith("perceptron")))
+
+        stacks = dict(line.rsplit(" ", 1) for line in lines)
+        self.assertIn("forward;layer 0;perceptron 1", stacks)
+        total = next(record["duration"] for record in tracer.records if record["name"] == "forward")
+        self.assertAlmostEqual(sum(int(value) for value in stacks.values()), total, delta=len(stacks))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import numpy as np
+from src.models.biomolecular_layer import BiomolecularLayer
+from src.models.biomolecular_perceptron import BiomolecularPerceptron, BiomolecularNeuralNetwork
+from src.models.training import forward_sensitivities, loss_and_gradient, fit
+
+def two_layer_network(input_mode):
+    layers = [
+        [BiomolecularPerceptron(5, 3, 2, 0.5, 1.0), BiomolecularPerceptron(4, 2, 1.5, 0.4, 0.8)],
+        [BiomolecularPerceptron(6, 3, 2, 0.5, 1.2)],
+    ]
+    weights = [np.array([[1.0, 0.5], [0.2, 1.0]]), np.array([[0.7, 0.6]])]
+    return BiomolecularNeuralNetwork(layers, weights=weights, input_mode=input_mode)
+
+class TestTraining(unittest.TestCase):
+    def test_sensitivities_match_finite_differences(self):
+        layer = BiomolecularLayer(u=[5, 4], v=[3, 2], gamma=[2, 1.5], phi=[0.5, 0.4])
+        z1_0 = np.array([[0.5, 1.0], [2.0, 0.0]])
+        z1, sens = forward_sensitivities(layer, z1_0, rtol=1e-9, atol=1e-12)
+
+        h = 1e-6
+        for name in ("u", "v", "gamma", "phi"):
+            shifted = [BiomolecularLayer(**{**vars(layer), name: getattr(layer, name) + sign * h}) for sign in (1, -1)]
+            plus, minus = (forward_sensitivities(s, z1_0, rtol=1e-9, atol=1e-12)[0] for s in shifted)
+            np.testing.assert_allclose(sens[name], (plus - minus) / (2 * h), rtol=1e-4, atol=1e-7)
+        plus = forward_sensitivities(layer, z1_0 + h, rtol=1e-9, atol=1e-12)[0]
+        minus = forward_sensitivities(layer, z1_0 - h, rtol=1e-9, atol=1e-12)[0]
+        np.testing.assert_allclose(sens["z1_0"], (plus - minus) / (2 * h), rtol=1e-4, atol=1e-7)
+
+    def test_gradient_matches_finite_differences(self):
+        inputs = np.random.default_rng(0).uniform(0, 3, (20, 2))
+        labels = (inputs.sum(axis=1) > 3).astype(float)
+        for input_mode in ("z1_0", "u"):
+            network = two_layer_network(input_mode)
+            _, gradients = loss_and_gradient(network, inputs, labels, rtol=1e-8, atol=1e-10)
+            for l, name in [(0, "v"), (0, "gamma"), (1, "u"), (1, "phi"), (1, "threshold")]:
+                perceptron = network.layers[l][0]
+                value, h = getattr(perceptron, name), 1e-5
+                setattr(perceptron, name, value + h)
+                plus, _ = loss_and_gradient(network, inputs, labels, rtol=1e-8, atol=1e-10)
+                setattr(perceptron, name, value - h)
+                minus, _ = loss_and_gradient(network, inputs, labels, rtol=1e-8, atol=1e-10)
+                setattr(perceptron, name, value)
+                self.assertAlmostEqual(gradients[l][name][0], (plus - minus) / (2 * h), delta=1e-5)
+
+    def test_fit_learns_threshold_detector(self):
+        inputs = np.linspace(0, 4, 60)[:, np.newaxis]
+        labels = (inputs[:, 0] > 2).astype(float)
+        network = BiomolecularNeuralNetwork([[BiomolecularPerceptron(2, 3, 2, 0.5, 1.0)]], input_mode="u")
+
+        history = fit(network, inputs, labels, epochs=40, learning_rate=0.1)
+        self.assertEqual(len(history), 40)
+        self.assertLess(history[-1], 0.2 * history[0])
+        self.assertGreaterEqual(np.mean(network.classify_biosensor_batch(inputs) == labels), 0.95)
+        self.assertGreater(network.layers[0][0].phi, 0)
+
+if __name__ == '__main__':
+    unittest.main()